@@ -0,0 +1,310 @@
+from BNHaNa import (
+    LIMB_BASE,
+    LIMB_DIGITS,
+    MAX_SUPPORTED_MAGNITUDE,
+    MAX_TIER,
+    POS_INF,
+    NEG_INF,
+    format_mantissa,
+    format_tier,
+    from_limbs,
+    normalize_number,
+)
+
+# NumPy is optional: BNHaNa itself never needs it, only BigNumArray does
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if np is not None:
+    # 10^0 .. 10^9, for counting the digits of a limb by binary search
+    _POW10 = 10 ** np.arange(LIMB_DIGITS + 1, dtype=np.int64)
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("BigNumArray requires NumPy")
+
+def _pad(limbs, width):
+    # Widen a limb matrix with zero columns on the most significant side
+    if limbs.shape[1] == width:
+        return limbs
+    padded = np.zeros((limbs.shape[0], width), dtype=np.int64)
+    padded[:, :limbs.shape[1]] = limbs
+    return padded
+
+def _carry(columns):
+    # Bring every column of a limb matrix back into [0, B), in place. Each pass moves one
+    # carry (or borrow, for negative columns) up one limb in every row at once; the caller
+    # leaves a spare top column and guarantees non-negative totals, so nothing falls off.
+    while True:
+        carry = columns // LIMB_BASE
+        if not carry.any():
+            return columns
+        columns -= carry * LIMB_BASE
+        columns[:, 1:] += carry[:, :-1]
+
+def _compare_rows(a, b):
+    # -1, 0 or 1 per row for |a| against |b|: the sign of the difference at the most
+    # significant limb where the two rows differ
+    diff = np.sign(a - b)
+    differs = diff != 0
+    top = diff.shape[1] - 1 - np.argmax(differs[:, ::-1], axis=1)
+    return diff[np.arange(diff.shape[0]), top]
+
+class BigNumArray:
+    # N numbers held column-wise for vectorized arithmetic: `limbs` is an N x W int64 matrix
+    # of base-10^9 limbs (least significant first, dense: round numbers are not shifted),
+    # with `sign`, `magnitude` and `isInf` vectors beside it. Rows follow BigNum's rules:
+    # zero has sign 1 and magnitude 1, infinite rows have zero limbs and magnitude 0, and
+    # anything past MAX_SUPPORTED_MAGNITUDE saturates to infinity. Elementwise add, subtract,
+    # scalar multiply and compare each cost a handful of whole-matrix NumPy operations, and
+    # row i of a result always equals the scalar function applied to row i.
+    __slots__ = ('limbs', 'sign', 'magnitude', 'isInf')
+
+    def __init__(self, numbers=()):
+        _require_numpy()
+        numbers = [normalize_number(num) for num in numbers]
+        width = max((num.shift + len(num.significand) for num in numbers if not num.isInf), default=1)
+        limbs = np.zeros((len(numbers), width), dtype=np.int64)
+        sign = np.ones(len(numbers), dtype=np.int8)
+        isInf = np.zeros(len(numbers), dtype=bool)
+        for i, num in enumerate(numbers):
+            sign[i] = num.sign
+            if num.isInf:
+                isInf[i] = True
+            else:
+                limbs[i, num.shift:num.shift + len(num.significand)] = np.frombuffer(num.significand, dtype=np.uint32)
+        self._set(limbs, sign, isInf)
+
+    @classmethod
+    def _build(cls, limbs, sign, isInf):
+        result = cls.__new__(cls)
+        result._set(limbs, sign, isInf)
+        return result
+
+    def _set(self, limbs, sign, isInf):
+        # Normalize rows in place: magnitudes from the top limb, overflow to infinity,
+        # zeros to sign 1, and drop columns that are zero in every row
+        rows, width = limbs.shape
+        nonzero = limbs != 0
+        top = width - 1 - np.argmax(nonzero[:, ::-1], axis=1)
+        top_digits = np.searchsorted(_POW10, limbs[np.arange(rows), top], side='right')
+        magnitude = np.where(nonzero.any(axis=1), top * LIMB_DIGITS + top_digits, 1)
+        isInf = isInf | (magnitude > MAX_SUPPORTED_MAGNITUDE)
+        magnitude[isInf] = 0
+        limbs[isInf] = 0
+        sign = np.where((magnitude == 1) & (limbs[:, 0] == 0), 1, sign).astype(np.int8)
+        used = (magnitude.max(initial=1) - 1) // LIMB_DIGITS + 1
+        self.limbs = limbs[:, :max(used, 1)]
+        self.sign = sign
+        self.magnitude = magnitude
+        self.isInf = isInf
+
+    def _operand(self, other):
+        # Another BigNumArray of the same length, or any scalar broadcast as a single row
+        if isinstance(other, BigNumArray):
+            if len(other) != len(self):
+                raise ValueError("BigNumArray operands have different lengths")
+            return other
+        return BigNumArray((other,))
+
+    def __len__(self):
+        return self.limbs.shape[0]
+
+    def __getitem__(self, index):
+        # A BigNum for an int index; a BigNumArray of the selected rows (see take) for a
+        # slice, a list or array of indices, or a boolean mask
+        if isinstance(index, (slice, list, np.ndarray)):
+            return self.take(index)
+        if not isinstance(index, (int, np.integer)):
+            raise TypeError(f"BigNumArray indices must be integers, slices or index arrays, not {type(index).__name__}")
+        if self.isInf[index]:
+            return POS_INF if self.sign[index] > 0 else NEG_INF
+        used = (int(self.magnitude[index]) - 1) // LIMB_DIGITS + 1
+        return from_limbs(int(self.sign[index]), self.limbs[index, :used].astype(np.uint32).tobytes())
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def __repr__(self):
+        return f"BigNumArray({self.to_list()!r})"
+
+    def to_list(self):
+        return list(self)
+
+    def _signed_sum(self, other, other_sign, message):
+        # Row-wise self + other_sign * |other|: a column sum where the signs agree, otherwise
+        # the smaller magnitude taken from the larger, which keeps every total non-negative
+        width = max(self.limbs.shape[1], other.limbs.shape[1]) + 1
+        a = _pad(self.limbs, width)
+        b = _pad(other.limbs, width)
+        same = self.sign == other_sign
+        a_larger = (_compare_rows(a, b) >= 0)
+        wide = a_larger[:, None]
+        columns = np.where(same[:, None], a + b, np.where(wide, a, b) - np.where(wide, b, a))
+        sign = np.where(same | a_larger, self.sign, other_sign)
+        isInf = self.isInf | other.isInf
+        if isInf.any():
+            if (self.isInf & other.isInf & ~same).any():
+                raise ValueError(message)
+            sign = np.where(self.isInf, self.sign, np.where(other.isInf, other_sign, sign))
+        return BigNumArray._build(_carry(columns), sign, np.broadcast_to(isInf, sign.shape))
+
+    def add(self, other):
+        other = self._operand(other)
+        return self._signed_sum(other, other.sign, "Undefined: ∞ + -∞")
+
+    def subtract(self, other):
+        other = self._operand(other)
+        return self._signed_sum(other, -other.sign, "Undefined: ∞ - ∞")
+
+    def multiply(self, scalar):
+        # Every row times one number: one multiply-add of the whole matrix per limb of the
+        # scalar, each followed by a carry pass (a product below B^2 plus a carried column
+        # below B stays well inside int64)
+        scalar = normalize_number(scalar)
+        rows = len(self)
+        zero = ~self.isInf & (self.limbs == 0).all(axis=1)
+        if scalar.isInf or scalar.significand[-1] == 0:
+            if (zero if scalar.isInf else self.isInf).any():
+                raise ValueError("Undefined: 0 * ∞")
+            limbs = np.zeros((rows, 1), dtype=np.int64)
+            return BigNumArray._build(limbs, self.sign * scalar.sign, self.isInf | (scalar.isInf & ~zero))
+        factor = scalar.limbs
+        width = self.limbs.shape[1]
+        columns = np.zeros((rows, width + len(factor) + 1), dtype=np.int64)
+        for j, limb in enumerate(factor):
+            if limb:
+                columns[:, j:j + width] += self.limbs * limb
+                _carry(columns)
+        return BigNumArray._build(columns, self.sign * scalar.sign, self.isInf.copy())
+
+    def compare(self, other):
+        # compare() per row, as an int8 array of -1, 0 and 1
+        other = self._operand(other)
+        rank_a, rank_b = self._rank(), other._rank()
+        order = np.sign(rank_a - rank_b).astype(np.int8)
+        # Same sign, both finite and non-zero: the magnitudes decide, and the limbs only
+        # where the magnitudes tie as well
+        tie = (rank_a == rank_b) & (np.abs(rank_a) == 1)
+        a_magnitude, b_magnitude = np.broadcast_arrays(self.magnitude, other.magnitude)
+        order[tie] = np.sign(a_magnitude[tie] - b_magnitude[tie]) * self.sign[tie]
+        tie &= a_magnitude == b_magnitude
+        if tie.any():
+            a, b = self.limbs, other.limbs
+            width = max(a.shape[1], b.shape[1])
+            b_rows = b if len(b) == 1 else b[tie]
+            order[tie] = _compare_rows(_pad(a[tie], width), _pad(b_rows, width)) * self.sign[tie]
+        return order
+
+    def argsort(self, reverse=False):
+        # Row indices in ascending order of value (descending with reverse=True), stable
+        # like argsort_numbers. One int64 key per row carries the bucket (sign class and
+        # signed magnitude) and the signed nine leading digits, which orders almost every
+        # row with a single argsort; only rows tied on it go on to np.lexsort over their limb
+        # columns, which line up because equal buckets mean equal magnitudes.
+        sign = self.sign.astype(np.int64)
+        rank = self._rank().astype(np.int64)
+        bucket = np.where(self.isInf, rank * (MAX_SUPPORTED_MAGNITUDE + 1), self.magnitude * rank)
+        key = bucket * LIMB_BASE + self._leading_digits() * sign
+        direction = -1 if reverse else 1
+        key *= direction
+        order = np.argsort(key, kind='stable')
+        tied = key[order[1:]] == key[order[:-1]]
+        if tied.any():
+            in_run = np.zeros(len(order), dtype=bool)
+            in_run[1:] |= tied
+            in_run[:-1] |= tied
+            runs = np.flatnonzero(in_run)
+            tied_rows = order[runs]
+            limbs = self.limbs[tied_rows] * (sign[tied_rows] * direction)[:, None]
+            order[runs] = tied_rows[np.lexsort((*limbs.T, key[tied_rows]))]
+        return order
+
+    def take(self, indices):
+        # The rows at `indices`, in that order, as a new BigNumArray
+        return BigNumArray._build(self.limbs[indices], self.sign[indices], self.isInf[indices])
+
+    def sort(self, reverse=False):
+        return self.take(self.argsort(reverse))
+
+    def _rank(self):
+        # -2 for -∞, -1 negative, 0 zero, 1 positive, 2 for +∞
+        zero = ~self.isInf & (self.limbs == 0).all(axis=1)
+        return np.where(self.isInf, 2 * self.sign, np.where(zero, 0, self.sign)).astype(np.int8)
+
+    def _leading_digits(self):
+        # The nine leading digits of every row as an int (zero-padded on the right for
+        # shorter numbers): the top limb, topped up from the limb below it
+        rows = np.arange(len(self))
+        top = np.maximum(self.magnitude - 1, 0) // LIMB_DIGITS
+        high = self.limbs[rows, top]
+        low = np.where(top > 0, self.limbs[rows, np.maximum(top - 1, 0)], 0)
+        high_digits = np.searchsorted(_POW10, high, side='right')
+        return high * _POW10[LIMB_DIGITS - high_digits] + low // _POW10[high_digits]
+
+    def _leading_blocks(self):
+        # The top three base-1000 blocks of every row, as format_number reads them
+        leading = self._leading_digits()
+        head = (np.maximum(self.magnitude - 1, 0)) % 3 + 1
+        return (leading // _POW10[LIMB_DIGITS - head], leading // _POW10[6 - head] % 1000,
+                leading // _POW10[3 - head] % 1000)
+
+    def _format(self, finite):
+        # One string per row: `finite(i)` for finite non-zero rows, fixed text otherwise
+        zero = self._rank() == 0
+        strings = []
+        for i, (inf, is_zero, sign) in enumerate(zip(self.isInf.tolist(), zero.tolist(), self.sign.tolist())):
+            if inf:
+                strings.append("Infinity" if sign > 0 else "-Infinity")
+            elif is_zero:
+                strings.append("0")
+            else:
+                strings.append(finite(i, sign))
+        return strings
+
+    def format_number(self, decimals):
+        # format_number() of every row in one call: the leading blocks and tiers come from
+        # whole-array operations, leaving only the string formatting per row
+        most, next_, after_next = self._leading_blocks()
+        values = (most + (next_ / 1000) + (after_next / 1000000)).tolist()
+        tiers = ((self.magnitude - 1) // 3 + 1).tolist()
+
+        def finite(i, sign):
+            if tiers[i] > MAX_TIER:
+                return "Infinity" if sign > 0 else "-Infinity"
+            return format_tier(sign, values[i], tiers[i], decimals)
+        return self._format(finite)
+
+    def get_short(self):
+        return self.format_number(1)
+
+    def get_medium(self):
+        return self.format_number(2)
+
+    def get_detailed(self):
+        return self.format_number(3)
+
+    def get_scientific(self):
+        most, next_, _ = self._leading_blocks()
+        head = (np.maximum(self.magnitude - 1, 0)) % 3 + 1
+        mantissas = ((most + next_ / 1000) / _POW10[head - 1]).tolist()
+        exponents = (self.magnitude - 1).tolist()
+        return self._format(lambda i, sign: format_mantissa(sign, mantissas[i], exponents[i]))
+
+    def __add__(self, other):
+        return self.add(other)
+
+    def __sub__(self, other):
+        return self.subtract(other)
+
+    def __rsub__(self, other):
+        # A scalar minus every row; the single-row operand broadcasts against self
+        return self._operand(other)._signed_sum(self, -self.sign, "Undefined: ∞ - ∞")
+
+    def __mul__(self, scalar):
+        return self.multiply(scalar)
+
+    __radd__ = __add__
+    __rmul__ = __mul__
@@ -1,12 +1,194 @@
 import math
+import os
 import re
+import struct
+import sys
+from array import array
+from fractions import Fraction
+from operator import add as _int_add
+from operator import index as _index
 
 # Notation table for suffixes used in short notation
 from NotationModule import NOTATION
 # up to MAX_TIER suffixes for tiers up to 10^{3003}. Define or load the full list from the repository.
 
-POS_INF = {'sign': 1, 'blocks': [], 'magnitude': float('inf'), 'isInf': True}
-NEG_INF = {'sign': -1, 'blocks': [], 'magnitude': float('inf'), 'isInf': True}
+
+class BigNum:
+    # Immutable number value: sign (1 or -1), base-10^9 limbs in an array('I') (least
+    # significant first), cached decimal magnitude and infinity flag. Instances are shared
+    # freely between results, so nothing may mutate one after construction; build a new
+    # BigNum instead, or keep a running total in an Accumulator.
+    #
+    # Round values such as 1e3000 are stored sparsely: the value is significand * B^shift,
+    # with only the significant limbs kept. For shift == 0 `limbs` is the significand itself;
+    # otherwise reading `limbs` builds the full array, so code that works on the significand
+    # and shift never touches the zero limbs.
+    __slots__ = ('sign', 'significand', 'shift', 'magnitude', 'isInf', '_hash')
+
+    def __init__(self, sign, limbs, magnitude, isInf=False, shift=0):
+        self.sign = sign
+        self.significand = limbs
+        self.shift = shift
+        self.magnitude = magnitude
+        self.isInf = isInf
+        self._hash = None
+
+    @property
+    def limbs(self):
+        # All limbs including the shifted-out zeros; built on each read for a sparse number
+        if self.shift:
+            return array('I', [0]) * self.shift + self.significand
+        return self.significand
+
+    @property
+    def blocks(self):
+        # Base-1000 view of the limbs (least significant first), as the old representation stored them
+        if self.isInf:
+            return []
+        blocks = []
+        for limb in self.limbs:
+            blocks.append(limb % 1000)
+            blocks.append(limb // 1000 % 1000)
+            blocks.append(limb // 1000000)
+        while len(blocks) > 1 and blocks[-1] == 0:
+            blocks.pop()
+        return blocks
+
+    # Legacy dict-style access, so code written against the old dict representation
+    # (num['blocks'], num.get('sign')) keeps working unchanged.
+    def __getitem__(self, key):
+        if key in _FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in _FIELDS else default
+
+    def __setitem__(self, key, value):
+        raise TypeError("BigNum is immutable")
+
+    def __repr__(self):
+        return f"BigNum('{to_decimal_string(self)}')"
+
+    def __str__(self):
+        return to_decimal_string(self)
+
+    def __int__(self):
+        if self.isInf:
+            raise OverflowError("cannot convert infinite BigNum to integer")
+        return int(to_decimal_string(self))
+
+    def __bool__(self):
+        return self.isInf or self.significand[-1] != 0
+
+    def __hash__(self):
+        h = self._hash
+        if h is None:
+            # Equal to hash(int) for finite values so BigNum(5) and 5 share dict/set slots
+            h = hash(self.sign * float('inf')) if self.isInf else hash(int(self))
+            self._hash = h
+        return h
+
+    def __neg__(self):
+        return _negate(self)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return abs_(self)
+
+    def __add__(self, other):
+        other = _coerce_operand(other)
+        return NotImplemented if other is None else add(self, other)
+
+    def __radd__(self, other):
+        other = _coerce_operand(other)
+        return NotImplemented if other is None else add(other, self)
+
+    def __sub__(self, other):
+        other = _coerce_operand(other)
+        return NotImplemented if other is None else subtract(self, other)
+
+    def __rsub__(self, other):
+        other = _coerce_operand(other)
+        return NotImplemented if other is None else subtract(other, self)
+
+    def __mul__(self, other):
+        other = _coerce_operand(other)
+        return NotImplemented if other is None else multiply(self, other)
+
+    def __rmul__(self, other):
+        other = _coerce_operand(other)
+        return NotImplemented if other is None else multiply(other, self)
+
+    def __floordiv__(self, other):
+        other = _coerce_operand(other)
+        return NotImplemented if other is None else divide(self, other)
+
+    def __rfloordiv__(self, other):
+        other = _coerce_operand(other)
+        return NotImplemented if other is None else divide(other, self)
+
+    def __mod__(self, other):
+        other = _coerce_operand(other)
+        return NotImplemented if other is None else modulo(self, other)
+
+    def __rmod__(self, other):
+        other = _coerce_operand(other)
+        return NotImplemented if other is None else modulo(other, self)
+
+    def __divmod__(self, other):
+        other = _coerce_operand(other)
+        return NotImplemented if other is None else divmod_(self, other)
+
+    def __rdivmod__(self, other):
+        other = _coerce_operand(other)
+        return NotImplemented if other is None else divmod_(other, self)
+
+    def __pow__(self, other):
+        other = _coerce_operand(other)
+        return NotImplemented if other is None else power(self, other)
+
+    def __rpow__(self, other):
+        other = _coerce_operand(other)
+        return NotImplemented if other is None else power(other, self)
+
+    def __eq__(self, other):
+        other = _coerce_operand(other)
+        return NotImplemented if other is None else compare(self, other) == 0
+
+    def __ne__(self, other):
+        other = _coerce_operand(other)
+        return NotImplemented if other is None else compare(self, other) != 0
+
+    def __lt__(self, other):
+        other = _coerce_operand(other)
+        return NotImplemented if other is None else compare(self, other) < 0
+
+    def __le__(self, other):
+        other = _coerce_operand(other)
+        return NotImplemented if other is None else compare(self, other) <= 0
+
+    def __gt__(self, other):
+        other = _coerce_operand(other)
+        return NotImplemented if other is None else compare(self, other) > 0
+
+    def __ge__(self, other):
+        other = _coerce_operand(other)
+        return NotImplemented if other is None else compare(self, other) >= 0
+
+
+_FIELDS = frozenset(('sign', 'blocks', 'magnitude', 'isInf'))
+
+# Internal limb base: nine decimal digits per limb, so decimal I/O is a plain regrouping of digits
+LIMB_DIGITS = 9
+LIMB_BASE = 10 ** LIMB_DIGITS
+
+POS_INF = BigNum(1, array('I'), float('inf'), True)
+NEG_INF = BigNum(-1, array('I'), float('inf'), True)
+_ZERO = BigNum(1, array('I', [0]), 1)
+_ONE = BigNum(1, array('I', [1]), 1)
 
 # Base-90 character set (exactly 90 printable ASCII characters)
 CHARACTERS = [
@@ -18,14 +200,147 @@ CHARACTERS = [
 
 MAX_TIER = len(NOTATION)
 MAX_SUPPORTED_MAGNITUDE = 3003  # Maximum supported magnitude before infinity
+# Any int with more bits than this is at least 2^9977 > 10^3003, i.e. certainly infinite
+_MAX_SUPPORTED_BITS = math.ceil(MAX_SUPPORTED_MAGNITUDE * math.log2(10)) + 1
+# Operand size (in limbs) from which multiplication and squaring switch to Karatsuba.
+# Read at call time, so it can be retuned at runtime; see `python benchmark.py karatsuba`.
+KARATSUBA_THRESHOLD = 48
+# Divisor size (in limbs) from which Divisor objects precompute a Barrett reciprocal
+# instead of reusing Algorithm D; see `python benchmark.py divisor`.
+BARRETT_THRESHOLD = 12
+# Leading limbs that Lehmer's gcd runs Euclid on before applying the steps to the full
+# numbers; see `python benchmark.py gcd`.
+LEHMER_WINDOW = 8
+# Engine behind multiply, divide, power, sqrt, gcd and factorial: 'limbs' runs the base-10^9
+# kernels in this module, 'int' converts finite operands to Python ints and uses CPython's
+# own arithmetic, converting the result back. Results, infinities and errors are the same
+# either way. add and subtract stay on the limbs: they are linear already, and the two
+# conversions cost more than the whole addition. Read at call time; the default comes from
+# $BNHANA_BACKEND. See `python benchmark.py backend`.
+BACKEND = os.environ.get('BNHANA_BACKEND', 'limbs')
+if BACKEND not in ('limbs', 'int'):
+    raise ValueError(f"Unknown BNHANA_BACKEND {BACKEND!r}: expected 'limbs' or 'int'")
 
 # Performance optimizations: caching built-in functions for faster access (not necessary in Python, but kept for similarity)
 math_floor = math.floor
 math_abs = math.fabs
 math_log10 = math.log10
+_LN10 = math.log(10)
 
 base = len(CHARACTERS)  # Base-90 encoding
 
+def _make(sign, limbs, shift=0):
+    # Build a normalized BigNum from a limb array handed over by the caller (not copied),
+    # times B^shift; trailing zero limbs move into the shift
+    while len(limbs) > 1 and limbs[-1] == 0:
+        limbs.pop()
+    if not limbs or limbs[-1] == 0:
+        return _ZERO
+    magnitude = (len(limbs) - 1 + shift) * LIMB_DIGITS + len(str(limbs[-1]))
+    # Check if magnitude exceeds maximum supported range
+    if magnitude > MAX_SUPPORTED_MAGNITUDE:
+        return POS_INF if sign > 0 else NEG_INF
+    if limbs[0] == 0:
+        low = 1
+        while limbs[low] == 0:
+            low += 1
+        limbs = limbs[low:]
+        shift += low
+    return BigNum(sign, limbs, magnitude, False, shift)
+
+def from_limbs(sign, limbs):
+    # Normalized BigNum from a sign and base-10^9 limbs, least significant first (any
+    # iterable of ints, or the raw bytes of a uint32 array); the limbs are copied
+    return _make(sign, array('I', limbs))
+
+def _from_int(value):
+    # A plain int first: subclasses such as bool may not print as their digits
+    value = _index(value)
+    if value == 0:
+        return _ZERO
+    sign = 1
+    if value < 0:
+        sign = -1
+        value = -value
+    if value < LIMB_BASE:
+        return BigNum(sign, array('I', [value]), len(str(value)))
+    if value.bit_length() > _MAX_SUPPORTED_BITS:
+        return POS_INF if sign > 0 else NEG_INF
+    return _digits_to_number(str(value), sign)
+
+def _to_int(num):
+    # Exact Python int of a finite BigNum
+    value = 0
+    for limb in reversed(num.significand):
+        value = value * LIMB_BASE + limb
+    if num.shift:
+        value *= LIMB_BASE ** num.shift
+    return value if num.sign > 0 else -value
+
+def _from_legacy(num):
+    # Shim for the old dict representation {'sign', 'blocks', 'magnitude', 'isInf'} with base-1000 blocks
+    sign = num.get('sign', 1)
+    if num.get('isInf'):
+        return POS_INF if sign > 0 else NEG_INF
+    blocks = list(num.get('blocks', [])) + [0, 0]
+    limbs = array('I', [blocks[i] + blocks[i + 1] * 1000 + blocks[i + 2] * 1000000
+                        for i in range(0, len(blocks) - 2, 3)])
+    return _make(sign, limbs)
+
+def _coerce(num):
+    if type(num) is BigNum:
+        return num
+    if isinstance(num, dict):
+        return _from_legacy(num)
+    if isinstance(num, int):
+        return _from_int(num)
+    raise TypeError(f"Cannot convert {type(num).__name__} to BigNum")
+
+def _coerce_operand(other):
+    # Operator overloads accept BigNums, legacy dicts and ints; anything else is NotImplemented.
+    # Plain ints pass through untouched so add/multiply/divide can use their scalar kernels.
+    if type(other) is BigNum or type(other) is int:
+        return other
+    if isinstance(other, (dict, int)):
+        return _coerce(other)
+    return None
+
+def _int_limbs(value):
+    # Limbs of a non-negative int as a tuple, for handing small operands to the limb kernels
+    if value < LIMB_BASE:
+        return (value,)
+    limbs = []
+    while value:
+        value, limb = divmod(value, LIMB_BASE)
+        limbs.append(limb)
+    return tuple(limbs)
+
+def _negate(num):
+    if num.isInf:
+        return NEG_INF if num.sign > 0 else POS_INF
+    if num.significand[-1] == 0:
+        return num
+    return BigNum(-num.sign, num.significand, num.magnitude, False, num.shift)
+
+def _power_of_ten(exponent):
+    # 10^exponent as a BigNum, built directly as limbs
+    if exponent + 1 > MAX_SUPPORTED_MAGNITUDE:
+        return POS_INF
+    return BigNum(1, array('I', [10 ** (exponent % LIMB_DIGITS)]), exponent + 1, False, exponent // LIMB_DIGITS)
+
+def _leading_blocks(num, count):
+    # The top `count` base-1000 blocks of a finite non-zero number, most significant first,
+    # padded with zeros when the number has fewer blocks
+    limbs = num.significand
+    if len(limbs) == 1 and num.shift:
+        # The limb below the top is one of the shifted-out zeros
+        limbs = array('I', [0]) + limbs
+    top = len(limbs) - 1
+    digits = str(limbs[top]) + ''.join(f"{limbs[i]:09d}" for i in range(top - 1, max(top - 2, -1), -1))
+    head = (num.magnitude - 1) % 3 + 1
+    digits += '0' * (head + 3 * count - len(digits))
+    return [int(digits[0:head])] + [int(digits[head + 3 * i:head + 3 * i + 3]) for i in range(count - 1)]
+
 def to_number(num):
     str_ = to_decimal_string(num)
     try:
@@ -34,230 +349,1180 @@ def to_number(num):
         return 0
 
 def to_decimal_string(num):
-    if num['isInf']:
-        return "Infinity" if num['sign'] > 0 else "-Infinity"
-    if len(num['blocks']) == 0:
-        return "0"
-    parts = []
-    for i in range(len(num['blocks']) - 1, -1, -1):
-        if i == len(num['blocks']) - 1:
-            parts.append(str(num['blocks'][i]))
-        else:
-            parts.append(f"{num['blocks'][i]:03d}")
+    num = normalize_number(num)
+    if num.isInf:
+        return "Infinity" if num.sign > 0 else "-Infinity"
+    limbs = num.significand
+    parts = [str(limbs[-1])]
+    for i in range(len(limbs) - 2, -1, -1):
+        parts.append(f"{limbs[i]:09d}")
+    if num.shift:
+        parts.append('0' * (LIMB_DIGITS * num.shift))
     str_ = ''.join(parts)
-    str_ = re.sub(r'^0+', '', str_)
-    if str_ == '':
-        return "0"
-    if num['sign'] < 0 and str_ != "0":
+    if num.sign < 0 and str_ != "0":
         str_ = "-" + str_
     return str_
 
 def normalize_number(num):
-    blocks = list(num.get('blocks', []))  # Copy to avoid modifying original
-    sign = num.get('sign', 1)
-    magnitude = num.get('magnitude')
-    # Remove leading zeros
-    while len(blocks) > 1 and blocks[-1] == 0:
-        blocks.pop()
-    if magnitude is None:
-        first_non_zero = None
-        for i in range(len(blocks) - 1, -1, -1):
-            if blocks[i] != 0:
-                first_non_zero = i
-                break
-        if first_non_zero is None:
-            magnitude = 1  # Represents zero
-        else:
-            magnitude = first_non_zero * 3
-            abs_val = math_abs(blocks[first_non_zero])
-            magnitude += math_floor(math_log10(abs_val)) + 1
-    # Check if magnitude exceeds maximum supported range
-    if magnitude > MAX_SUPPORTED_MAGNITUDE:
-        return POS_INF if sign > 0 else NEG_INF
-    return {
-        'sign': sign,
-        'blocks': blocks,
-        'magnitude': magnitude,
-        'isInf': False
-    }
+    # BigNums are normalized on construction and immutable, so they pass straight through
+    if type(num) is BigNum:
+        return num
+    return _coerce(num)
 
-def compare(a, b):
-    if a['isInf'] or b['isInf']:
-        if a['isInf'] and b['isInf']:
-            return 0 if a['sign'] == b['sign'] else (1 if a['sign'] > b['sign'] else -1)
-        return (1 if a['sign'] > 0 else -1) if a['isInf'] else (-1 if b['sign'] > 0 else 1)
-    if a['sign'] != b['sign']:
-        return 1 if a['sign'] > b['sign'] else -1
-    # Compare magnitudes first for efficiency
-    if a['magnitude'] != b['magnitude']:
-        return (1 if a['magnitude'] > b['magnitude'] else -1) * a['sign']
-    len_a, len_b = len(a['blocks']), len(b['blocks'])
+def _trim(limbs):
+    # Drop most-significant zero limbs in place, keeping at least one limb
+    while len(limbs) > 1 and limbs[-1] == 0:
+        limbs.pop()
+    return limbs
+
+def _compare_limbs(a_limbs, b_limbs):
+    # Compare two trimmed limb arrays by absolute value
+    len_a, len_b = len(a_limbs), len(b_limbs)
     if len_a != len_b:
-        return (1 if len_a > len_b else -1) * a['sign']
+        return 1 if len_a > len_b else -1
     for i in range(len_a - 1, -1, -1):
-        if a['blocks'][i] != b['blocks'][i]:
-            return (1 if a['blocks'][i] > b['blocks'][i] else -1) * a['sign']
-    return 0  # They are equal.
+        if a_limbs[i] != b_limbs[i]:
+            return 1 if a_limbs[i] > b_limbs[i] else -1
+    return 0
+
+def compare(a, b):
+    if type(a) is not BigNum:
+        a = _coerce(a)
+    if type(b) is not BigNum:
+        b = _coerce(b)
+    if a.isInf or b.isInf:
+        if a.isInf and b.isInf:
+            return 0 if a.sign == b.sign else (1 if a.sign > b.sign else -1)
+        return (1 if a.sign > 0 else -1) if a.isInf else (-1 if b.sign > 0 else 1)
+    if a.sign != b.sign:
+        return 1 if a.sign > b.sign else -1
+    # Compare magnitudes first for efficiency
+    if a.magnitude != b.magnitude:
+        return (1 if a.magnitude > b.magnitude else -1) * a.sign
+    if a.shift == b.shift:
+        return _compare_limbs(a.significand, b.significand) * a.sign
+    return _compare_top_aligned(a.significand, b.significand) * a.sign
+
+def _compare_top_aligned(a_limbs, b_limbs):
+    # Compare significands of numbers with the same length in limbs (equal magnitudes) but
+    # different shifts, from the top down; the shorter one continues with zero limbs
+    n = min(len(a_limbs), len(b_limbs))
+    for i in range(1, n + 1):
+        if a_limbs[-i] != b_limbs[-i]:
+            return 1 if a_limbs[-i] > b_limbs[-i] else -1
+    if any(a_limbs[:len(a_limbs) - n]):
+        return 1
+    return -1 if any(b_limbs[:len(b_limbs) - n]) else 0
+
+def _add_limbs(a_limbs, b_limbs):
+    # |a| + |b| as a fresh limb array
+    if len(a_limbs) < len(b_limbs):
+        a_limbs, b_limbs = b_limbs, a_limbs
+    result = array('I', a_limbs)
+    carry = 0
+    for i in range(len(b_limbs)):
+        sum_ = result[i] + b_limbs[i] + carry
+        if sum_ >= LIMB_BASE:
+            result[i] = sum_ - LIMB_BASE
+            carry = 1
+        else:
+            result[i] = sum_
+            carry = 0
+    i = len(b_limbs)
+    while carry:
+        if i == len(result):
+            result.append(carry)
+            break
+        sum_ = result[i] + carry
+        if sum_ >= LIMB_BASE:
+            result[i] = sum_ - LIMB_BASE
+        else:
+            result[i] = sum_
+            carry = 0
+        i += 1
+    return result
+
+def _sub_limbs(a_limbs, b_limbs):
+    # |a| - |b| as a fresh limb array; requires |a| >= |b|
+    result = array('I', a_limbs)
+    borrow = 0
+    for i in range(len(b_limbs)):
+        diff = result[i] - b_limbs[i] - borrow
+        if diff < 0:
+            result[i] = diff + LIMB_BASE
+            borrow = 1
+        else:
+            result[i] = diff
+            borrow = 0
+    i = len(b_limbs)
+    while borrow:
+        diff = result[i] - 1
+        if diff < 0:
+            result[i] = diff + LIMB_BASE
+        else:
+            result[i] = diff
+            borrow = 0
+        i += 1
+    return result
+
+def _carry_columns(columns):
+    # Propagate carries through signed column sums; the represented value must be non-negative
+    carry = 0
+    for k in range(len(columns)):
+        total = columns[k] + carry
+        carry = total // LIMB_BASE
+        columns[k] = total - carry * LIMB_BASE
+    while carry:
+        carry, limb = divmod(carry, LIMB_BASE)
+        columns.append(limb)
+    return array('I', columns)
+
+def _mul_schoolbook(a_limbs, b_limbs):
+    # Schoolbook |a| * |b|: accumulate column sums as Python ints, then one carry pass
+    a_len = len(a_limbs)
+    b_len = len(b_limbs)
+    columns = [0] * (a_len + b_len)
+    for i in range(a_len):
+        a_val = a_limbs[i]
+        if a_val == 0:
+            continue
+        for j in range(b_len):
+            columns[i + j] += a_val * b_limbs[j]
+    return _carry_columns(columns)
+
+def _square_schoolbook(a_limbs):
+    # Schoolbook |a|^2 computing each cross product once and doubling it
+    a_len = len(a_limbs)
+    columns = [0] * (2 * a_len)
+    for i in range(a_len):
+        a_val = a_limbs[i]
+        if a_val == 0:
+            continue
+        columns[2 * i] += a_val * a_val
+        doubled = 2 * a_val
+        for j in range(i + 1, a_len):
+            columns[i + j] += doubled * a_limbs[j]
+    return _carry_columns(columns)
+
+def _karatsuba_combine(z0, z1, z2, half, size):
+    # z0 + (z1 - z0 - z2) * B^half + z2 * B^(2 * half), accumulated in one column pass
+    columns = [0] * max(size, len(z1) + half, len(z2) + 2 * half)
+    for i in range(len(z0)):
+        v = z0[i]
+        columns[i] += v
+        columns[i + half] -= v
+    for i in range(len(z2)):
+        v = z2[i]
+        columns[i + 2 * half] += v
+        columns[i + half] -= v
+    for i in range(len(z1)):
+        columns[i + half] += z1[i]
+    return _trim(_carry_columns(columns))
+
+def _mul_limbs(a_limbs, b_limbs):
+    # |a| * |b|, switching from schoolbook to Karatsuba once both operands reach KARATSUBA_THRESHOLD limbs
+    if a_limbs is b_limbs:
+        return _square_limbs(a_limbs)
+    if len(a_limbs) < len(b_limbs):
+        a_limbs, b_limbs = b_limbs, a_limbs
+    a_len = len(a_limbs)
+    b_len = len(b_limbs)
+    if b_len < KARATSUBA_THRESHOLD:
+        return _mul_schoolbook(a_limbs, b_limbs)
+    if 2 * b_len <= a_len:
+        # Unbalanced: multiply b by b-sized slices of a and add the partial products
+        columns = [0] * (a_len + b_len)
+        for start in range(0, a_len, b_len):
+            partial = _mul_limbs(a_limbs[start:start + b_len], b_limbs)
+            for i in range(len(partial)):
+                columns[start + i] += partial[i]
+        return _carry_columns(columns)
+    half = a_len // 2
+    a0, a1 = _trim(a_limbs[:half]), a_limbs[half:]
+    b0, b1 = _trim(b_limbs[:half]), b_limbs[half:]
+    z0 = _mul_limbs(a0, b0)
+    z2 = _mul_limbs(a1, b1)
+    z1 = _mul_limbs(_add_limbs(a0, a1), _add_limbs(b0, b1))
+    return _karatsuba_combine(z0, z1, z2, half, a_len + b_len)
+
+def _square_limbs(a_limbs):
+    # |a|^2 with the same Karatsuba split as _mul_limbs, but three half-size squarings
+    a_len = len(a_limbs)
+    if a_len < KARATSUBA_THRESHOLD:
+        return _square_schoolbook(a_limbs)
+    half = a_len // 2
+    a0, a1 = _trim(a_limbs[:half]), a_limbs[half:]
+    z0 = _square_limbs(a0)
+    z2 = _square_limbs(a1)
+    z1 = _square_limbs(_add_limbs(a0, a1))
+    return _karatsuba_combine(z0, z1, z2, half, 2 * a_len)
+
+def _mul_1(a_limbs, multiplier):
+    # |a| * m for an int multiplier m >= 0 in one pass, as a fresh limb array
+    result = array('I', a_limbs)
+    carry = 0
+    for i in range(len(result)):
+        product = result[i] * multiplier + carry
+        carry = product // LIMB_BASE
+        result[i] = product - carry * LIMB_BASE
+    while carry:
+        carry, limb = divmod(carry, LIMB_BASE)
+        result.append(limb)
+    return result
+
+def _divmod_1(a_limbs, divisor):
+    # |a| divmod d for an int divisor d > 0 in one pass: (quotient limbs, int remainder)
+    quotient = array('I', a_limbs)
+    remainder = 0
+    for i in range(len(quotient) - 1, -1, -1):
+        current = remainder * LIMB_BASE + quotient[i]
+        digit = current // divisor
+        remainder = current - digit * divisor
+        quotient[i] = digit
+    return _trim(quotient), remainder
+
+def _divmod_limbs(a_limbs, b_limbs):
+    # |a| divmod |b| for trimmed limb arrays with b non-zero, by Knuth's Algorithm D
+    # (TAOCP vol. 2, 4.3.1). Returns trimmed (quotient, remainder) limb arrays.
+    if _compare_limbs(a_limbs, b_limbs) < 0:
+        return array('I', [0]), array('I', a_limbs)
+    n = len(b_limbs)
+    if n == 1:
+        quotient, remainder = _divmod_1(a_limbs, b_limbs[0])
+        return quotient, array('I', [remainder])
+    # Normalize so the divisor's top limb is at least LIMB_BASE / 2; the quotient is unchanged
+    scale = LIMB_BASE // (b_limbs[-1] + 1)
+    return _divmod_knuth(a_limbs, _mul_1(b_limbs, scale), scale)
+
+def _divmod_knuth(a_limbs, v, scale):
+    # Algorithm D proper, for |a| >= |b| where v = |b| * scale has at least two limbs and a
+    # top limb of at least LIMB_BASE / 2
+    u = _mul_1(a_limbs, scale)
+    if len(u) == len(a_limbs):
+        u.append(0)
+    n = len(v)
+    v_top, v_next = v[-1], v[-2]
+    m = len(u) - n - 1
+    quotient = array('I', [0]) * (m + 1)
+    for j in range(m, -1, -1):
+        # Estimate the quotient limb from the top two limbs of the current remainder
+        top = u[j + n] * LIMB_BASE + u[j + n - 1]
+        q_hat = top // v_top
+        r_hat = top - q_hat * v_top
+        # At most two corrections make q_hat exact or one too large
+        while q_hat >= LIMB_BASE or q_hat * v_next > r_hat * LIMB_BASE + u[j + n - 2]:
+            q_hat -= 1
+            r_hat += v_top
+            if r_hat >= LIMB_BASE:
+                break
+        if q_hat == 0:
+            continue
+        # Multiply and subtract q_hat * v from u[j:j + n + 1] in place
+        carry = 0
+        borrow = 0
+        for i in range(n):
+            product = q_hat * v[i] + carry
+            carry = product // LIMB_BASE
+            diff = u[i + j] - (product - carry * LIMB_BASE) - borrow
+            if diff < 0:
+                u[i + j] = diff + LIMB_BASE
+                borrow = 1
+            else:
+                u[i + j] = diff
+                borrow = 0
+        diff = u[j + n] - carry - borrow
+        if diff < 0:
+            # q_hat was one too large (rare): add v back once
+            q_hat -= 1
+            carry = 0
+            for i in range(n):
+                total = u[i + j] + v[i] + carry
+                if total >= LIMB_BASE:
+                    u[i + j] = total - LIMB_BASE
+                    carry = 1
+                else:
+                    u[i + j] = total
+                    carry = 0
+            diff += carry
+        u[j + n] = diff
+        quotient[j] = q_hat
+    # Undo the normalization on the remainder
+    remainder, _ = _divmod_1(_trim(u[:n]), scale)
+    return _trim(quotient), remainder
+
+def _barrett_reduce(x, b_limbs, mu, k):
+    # One Barrett step for trimmed x < B^(2k), where b has k limbs and mu = floor(B^(2k) / b)
+    if _compare_limbs(x, b_limbs) < 0:
+        return array('I', [0]), x
+    quotient = _mul_limbs(x[k - 1:], mu)[k + 1:] or array('I', [0])
+    _trim(quotient)
+    remainder = _trim(_sub_limbs(x, _trim(_mul_limbs(quotient, b_limbs))))
+    # The estimate is at most two below the true quotient
+    while _compare_limbs(remainder, b_limbs) >= 0:
+        remainder = _trim(_sub_limbs(remainder, b_limbs))
+        quotient = _add_limbs(quotient, (1,))
+    return quotient, remainder
+
+def _divmod_barrett(a_limbs, b_limbs, mu):
+    # |a| divmod |b| using the precomputed reciprocal mu, consuming |a| in k-limb chunks from
+    # the top so every Barrett step sees a value below B^(2k)
+    k = len(b_limbs)
+    n = len(a_limbs)
+    remainder = array('I', [0])
+    pieces = []
+    end = n
+    while end > 0:
+        start = max(end - k, 0)
+        current = _trim(a_limbs[start:end] + remainder)
+        digit, remainder = _barrett_reduce(current, b_limbs, mu, k)
+        digit.extend(array('I', [0]) * (end - start - len(digit)))
+        pieces.append(digit)
+        end = start
+    quotient = array('I')
+    for digit in reversed(pieces):
+        quotient.extend(digit)
+    return _trim(quotient), remainder
+
+def _add_signed(a_sign, a_limbs, b_sign, b_limbs, shift=0):
+    # a + b for finite operands given as sign and magnitude limbs, both times B^shift
+    if a_sign == b_sign:
+        return _make(a_sign, _add_limbs(a_limbs, b_limbs), shift)
+    if _compare_limbs(a_limbs, b_limbs) < 0:
+        return _make(b_sign, _sub_limbs(b_limbs, a_limbs), shift)
+    return _make(a_sign, _sub_limbs(a_limbs, b_limbs), shift)
+
+def _add_sparse(a, b_sign, b):
+    # a + b_sign |b| when either operand is sparse: only limbs above the smaller shift are
+    # added, the other operand's significand padded with the zero limbs between the shifts
+    shift = min(a.shift, b.shift)
+    a_limbs, b_limbs = a.significand, b.significand
+    if a.shift > shift:
+        a_limbs = array('I', [0]) * (a.shift - shift) + a_limbs
+    if b.shift > shift:
+        b_limbs = array('I', [0]) * (b.shift - shift) + b_limbs
+    return _add_signed(a.sign, a_limbs, b_sign, b_limbs, shift)
 
 def add(a, b):
+    # Plain int operands take the single-pass scalar kernel
+    if type(b) is int:
+        return add_small(a, b)
+    if type(a) is int:
+        return add_small(b, a)
     # Ensure inputs are normalized
     a = normalize_number(a)
     b = normalize_number(b)
-    
-    if a['isInf'] or b['isInf']:
-        if a['isInf'] and b['isInf']:
-            if a['sign'] == b['sign']:
+
+    if a.isInf or b.isInf:
+        if a.isInf and b.isInf:
+            if a.sign == b.sign:
                 return a
             else:
                 raise ValueError("Undefined: ∞ + -∞")
-        return a if a['isInf'] else b
-    if a['sign'] != b['sign']:
-        b_neg = {'sign': -b['sign'], 'blocks': list(b['blocks']), 'isInf': False}
-        return subtract(a, b_neg)
-    result = []
-    carry = 0
-    max_len = max(len(a['blocks']), len(b['blocks']))
-    for i in range(max_len):
-        sum_ = (a['blocks'][i] if i < len(a['blocks']) else 0) + \
-               (b['blocks'][i] if i < len(b['blocks']) else 0) + carry
-        carry = math_floor(sum_ / 1000)
-        result.append(sum_ % 1000)
-    if carry > 0:
-        result.append(carry)
-    return normalize_number({'sign': a['sign'], 'blocks': result})
+        return a if a.isInf else b
+    if a.shift or b.shift:
+        return _add_sparse(a, b.sign, b)
+    return _add_signed(a.sign, a.significand, b.sign, b.significand)
 
 def subtract(a, b):
+    if type(b) is int:
+        return add_small(a, -b)
+    if type(a) is int:
+        return _negate(add_small(b, -a))
     # Ensure inputs are normalized
     a = normalize_number(a)
     b = normalize_number(b)
-    
-    if a['isInf'] or b['isInf']:
-        if a['isInf'] and b['isInf']:
-            if a['sign'] == b['sign']:
+
+    if a.isInf or b.isInf:
+        if a.isInf and b.isInf:
+            if a.sign == b.sign:
                 raise ValueError("Undefined: ∞ - ∞")
             else:
                 return a
-        return a if a['isInf'] else {'sign': -b['sign'], 'blocks': [], 'magnitude': float('inf'), 'isInf': True}
-    if a['sign'] != b['sign']:
-        b_neg = {'sign': -b['sign'], 'blocks': list(b['blocks']), 'isInf': False}
-        return add(a, b_neg)
-    abs_a = {'sign': 1, 'blocks': a['blocks'], 'magnitude': a['magnitude'], 'isInf': False}
-    abs_b = {'sign': 1, 'blocks': b['blocks'], 'magnitude': b['magnitude'], 'isInf': False}
-    abs_compare = compare(abs_a, abs_b)
-    if abs_compare < 0:
-        result = subtract(b, a)
-        result['sign'] = -result['sign']
-        return result
-    result = []
-    borrow = 0
-    for i in range(len(a['blocks'])):
-        a_val = a['blocks'][i]
-        b_val = b['blocks'][i] if i < len(b['blocks']) else 0
-        diff = a_val - b_val - borrow
-        if diff < 0:
-            diff += 1000
-            borrow = 1
-        else:
-            borrow = 0
-        result.append(diff)
-    return normalize_number({'sign': a['sign'], 'blocks': result})
+        return a if a.isInf else _negate(b)
+    if a.shift or b.shift:
+        return _add_sparse(a, -b.sign, b)
+    return _add_signed(a.sign, a.significand, -b.sign, b.significand)
 
 def multiply(a, b):
-    if a['isInf'] or b['isInf']:
-        a_is_zero = not a['isInf'] and len(a['blocks']) == 1 and a['blocks'][0] == 0
-        b_is_zero = not b['isInf'] and len(b['blocks']) == 1 and b['blocks'][0] == 0
+    if type(b) is int:
+        return mul_small(a, b)
+    if type(a) is int:
+        return mul_small(b, a)
+    a = normalize_number(a)
+    b = normalize_number(b)
+    if a.isInf or b.isInf:
+        a_is_zero = not a.isInf and a.significand[-1] == 0
+        b_is_zero = not b.isInf and b.significand[-1] == 0
         if a_is_zero or b_is_zero:
             raise ValueError("Undefined: 0 * ∞")
-        sign = a['sign'] * b['sign']
+        sign = a.sign * b.sign
         return POS_INF if sign > 0 else NEG_INF
-    if (len(a['blocks']) == 1 and a['blocks'][0] == 0) or (len(b['blocks']) == 1 and b['blocks'][0] == 0):
-        return normalize_number({'sign': 1, 'blocks': [0]})
-    a_len = len(a['blocks'])
-    b_len = len(b['blocks'])
-    result = [0] * (a_len + b_len)
-    for i in range(a_len):
-        for j in range(b_len):
-            index = i + j
-            result[index] += a['blocks'][i] * b['blocks'][j]
-    carry = 0
-    for k in range(len(result)):
-        total = result[k] + carry
-        result[k] = total % 1000
-        carry = math_floor(total / 1000)
-    while carry > 0:
-        result.append(carry % 1000)
-        carry = math_floor(carry / 1000)
-    sign = a['sign'] * b['sign']
-    return normalize_number({'sign': sign, 'blocks': result})
+    if a.significand[-1] == 0 or b.significand[-1] == 0:
+        return _ZERO
+    # Both factors below 10^m and 10^n bound the product below 10^(m+n); skip the work if it can't fit
+    if a.magnitude + b.magnitude - 1 > MAX_SUPPORTED_MAGNITUDE:
+        return POS_INF if a.sign * b.sign > 0 else NEG_INF
+    if BACKEND == 'int':
+        return _from_int(_to_int(a) * _to_int(b))
+    # Only the significands are multiplied; trailing zero limbs just add up
+    return _make(a.sign * b.sign, _mul_limbs(a.significand, b.significand), a.shift + b.shift)
 
 def divide(a, b):
+    a = normalize_number(a)
+    if type(b) is int:
+        if b == 0:
+            raise ValueError("Division by zero")
+        if a.isInf:
+            return POS_INF if a.sign * b > 0 else NEG_INF
+        return divmod_small(a, b)[0]
+    b = normalize_number(b)
     # Handle division by zero
-    if len(b['blocks']) == 1 and b['blocks'][0] == 0:
+    if not b.isInf and b.significand[-1] == 0:
         raise ValueError("Division by zero")
-    if b['isInf']:
-        return normalize_number({'sign': 1, 'blocks': [0]})
-    if a['isInf']:
-        sign = a['sign'] * b['sign']
+    if b.isInf:
+        return _ZERO
+    if a.isInf:
+        sign = a.sign * b.sign
         return POS_INF if sign > 0 else NEG_INF
     # Handle zero dividend
-    if len(a['blocks']) == 1 and a['blocks'][0] == 0:
-        return normalize_number({'sign': 1, 'blocks': [0]})
-    sign = a['sign'] * b['sign']
-    abs_a = {'sign': 1, 'blocks': a['blocks'], 'magnitude': a['magnitude'], 'isInf': False}
-    abs_b = {'sign': 1, 'blocks': b['blocks'], 'magnitude': b['magnitude'], 'isInf': False}
-    # Fast path for |a| < |b|
-    if is_lesser(abs_a, abs_b):
-        if sign == 1:
-            return normalize_number({'sign': 1, 'blocks': [0]})
+    if a.significand[-1] == 0:
+        return _ZERO
+    if BACKEND == 'int':
+        # Python's // rounds toward negative infinity as well
+        return _from_int(_to_int(a) // _to_int(b))
+    return _floor_divmod(a, b)[0]
+
+def _floor_divmod(a, b):
+    # Floor division of finite a by finite non-zero b, as (quotient, remainder); the
+    # remainder takes b's sign, matching divide's rounding toward negative infinity
+    if a.significand[-1] == 0:
+        return _ZERO, _ZERO
+    return _signed_floor_divmod(a, b, *_divmod_limbs(a.limbs, b.limbs))
+
+def _signed_floor_divmod(a, b, Q, R):
+    # Turn |a| divmod |b| = (Q, R) into the floor-rounded signed quotient and remainder
+    if a.sign == b.sign:
+        return _make(1, Q), _make(a.sign, R)
+    if R[-1] == 0:
+        return _make(-1, Q), _ZERO
+    return _make(-1, _add_limbs(Q, (1,))), _make(b.sign, _sub_limbs(b.limbs, R))
+
+def divmod_(a, b):
+    # Quotient and remainder in one pass: divmod_(a, b) == (divide(a, b), modulo(a, b))
+    a = normalize_number(a)
+    b = normalize_number(b)
+    if not b.isInf and b.significand[-1] == 0:
+        raise ValueError("Division by zero")
+    if b.isInf:
+        return _ZERO, a
+    if a.isInf:
+        raise ValueError("Undefined: ∞ mod finite")
+    return _floor_divmod(a, b)
+
+def add_small(a, n):
+    # a + n for a plain int n, in one carry/borrow pass over a's limbs
+    a = normalize_number(a)
+    if a.isInf or n == 0:
+        return a
+    if a.shift:
+        return add(a, _from_int(n))
+    if n > 0:
+        return _add_signed(a.sign, a.significand, 1, _int_limbs(n))
+    return _add_signed(a.sign, a.significand, -1, _int_limbs(-n))
+
+def mul_small(a, n):
+    # a * n for a plain int n, in one pass over a's limbs
+    a = normalize_number(a)
+    if a.isInf:
+        if n == 0:
+            raise ValueError("Undefined: 0 * ∞")
+        return a if n > 0 else _negate(a)
+    if n == 0 or a.significand[-1] == 0:
+        return _ZERO
+    sign = a.sign
+    if n < 0:
+        sign = -sign
+        n = -n
+    # Same early overflow test as multiply: the product has at least this many digits
+    if a.magnitude + len(str(n)) - 1 > MAX_SUPPORTED_MAGNITUDE:
+        return POS_INF if sign > 0 else NEG_INF
+    return _make(sign, _mul_1(a.significand, n), a.shift)
+
+def divmod_small(a, n):
+    # Floor divmod of a by a plain int n in one pass: (BigNum quotient, int remainder),
+    # rounded like divide() so the remainder takes n's sign
+    a = normalize_number(a)
+    if n == 0:
+        raise ValueError("Division by zero")
+    if a.isInf:
+        raise ValueError("Undefined: ∞ mod finite")
+    n_abs = n if n > 0 else -n
+    quotient, remainder = _divmod_1(a.limbs, n_abs)
+    if (a.sign > 0) == (n > 0):
+        return _make(1, quotient), remainder if a.sign > 0 else -remainder
+    if remainder == 0:
+        return _make(-1, quotient), 0
+    remainder = n_abs - remainder
+    return _make(-1, _add_limbs(quotient, (1,))), remainder if n > 0 else -remainder
+
+class Divisor:
+    # Divisor precomputed for repeated floor division by the same value. Single-limb divisors
+    # use a short division, small ones keep their Algorithm D normalization, and divisors of
+    # BARRETT_THRESHOLD limbs or more get a Barrett reciprocal floor(B^(2k) / |b|).
+    __slots__ = ('value', '_limbs', '_small', '_scale', '_normalized', '_mu')
+
+    def __init__(self, b):
+        b = normalize_number(b)
+        if not b.isInf and b.significand[-1] == 0:
+            raise ValueError("Division by zero")
+        self.value = b
+        self._limbs = b.limbs
+        self._small = None
+        self._scale = None
+        self._normalized = None
+        self._mu = None
+        if b.isInf:
+            return
+        k = len(b.limbs)
+        if k == 1:
+            self._small = b.limbs[0]
+        elif k < BARRETT_THRESHOLD:
+            self._scale = LIMB_BASE // (b.significand[-1] + 1)
+            self._normalized = _mul_1(b.limbs, self._scale)
+        else:
+            power = array('I', [0]) * (2 * k)
+            power.append(1)
+            self._mu = _divmod_limbs(power, b.limbs)[0]
+
+    def __repr__(self):
+        return f"Divisor({self.value!r})"
+
+    def _divmod_abs(self, a_limbs):
+        b_limbs = self._limbs
+        if self._small is not None:
+            quotient, remainder = _divmod_1(a_limbs, self._small)
+            return quotient, array('I', [remainder])
+        if _compare_limbs(a_limbs, b_limbs) < 0:
+            return array('I', [0]), array('I', a_limbs)
+        if self._mu is not None:
+            return _divmod_barrett(a_limbs, b_limbs, self._mu)
+        return _divmod_knuth(a_limbs, self._normalized, self._scale)
+
+    def _mod_abs(self, a_limbs):
+        # |a| mod |b|; below B^(2k), e.g. a product of two residues, one Barrett step is enough
+        if self._mu is not None and len(a_limbs) <= 2 * len(self._limbs):
+            return _barrett_reduce(a_limbs, self._limbs, self._mu, len(self._limbs))[1]
+        return self._divmod_abs(a_limbs)[1]
+
+    def divmod(self, a):
+        # Same results as divmod_(a, self.value)
+        a = normalize_number(a)
+        b = self.value
+        if b.isInf:
+            return _ZERO, a
+        if a.isInf:
+            raise ValueError("Undefined: ∞ mod finite")
+        if a.significand[-1] == 0:
+            return _ZERO, _ZERO
+        return _signed_floor_divmod(a, b, *self._divmod_abs(a.limbs))
+
+    def div(self, a):
+        # Same results as divide(a, self.value)
+        a = normalize_number(a)
+        if a.isInf and not self.value.isInf:
+            return POS_INF if a.sign * self.value.sign > 0 else NEG_INF
+        return self.divmod(a)[0]
+
+    def mod(self, a):
+        # Same results as modulo(a, self.value)
+        return self.divmod(a)[1]
+
+class ModContext:
+    # Arithmetic modulo a fixed m. Operands are reduced on entry and every sum or product
+    # (below m^2, so never more than twice m's limbs) is reduced straight away through m's
+    # Divisor, which holds a Barrett reciprocal for multi-limb moduli. Results match
+    # modulo(): in [0, m) for positive m and in (m, 0] for negative m.
+    __slots__ = ('modulus', '_divisor', '_limbs')
+
+    def __init__(self, m):
+        m = normalize_number(m)
+        if m.isInf:
+            raise ValueError("Modulus must be finite")
+        self._divisor = Divisor(m)
+        self.modulus = m
+        self._limbs = m.limbs
+
+    def __repr__(self):
+        return f"ModContext({self.modulus!r})"
+
+    def _residue(self, a):
+        # a mod |m| as limbs in [0, |m|)
+        a = normalize_number(a)
+        if a.isInf:
+            raise ValueError("Undefined: ∞ mod finite")
+        residue = self._divisor._mod_abs(a.limbs)
+        if a.sign < 0 and residue[-1] != 0:
+            residue = _trim(_sub_limbs(self._limbs, residue))
+        return residue
+
+    def _result(self, residue):
+        if self.modulus.sign < 0 and residue[-1] != 0:
+            return _make(-1, _trim(_sub_limbs(self._limbs, residue)))
+        return _make(1, array('I', residue))
+
+    def _reduce_product(self, limbs):
+        return self._divisor._mod_abs(_trim(limbs))
+
+    def reduce(self, a):
+        return self._result(self._residue(a))
+
+    def add(self, a, b):
+        total = _add_limbs(self._residue(a), self._residue(b))
+        if _compare_limbs(total, self._limbs) >= 0:
+            total = _trim(_sub_limbs(total, self._limbs))
+        return self._result(total)
+
+    def mul(self, a, b):
+        return self._result(self._reduce_product(_mul_limbs(self._residue(a), self._residue(b))))
+
+    def inverse(self, a):
+        # x with a x = 1 mod m, from the cofactor of a in xgcd(a, m)
+        g, s, _ = xgcd(self.reduce(a), self.modulus)
+        if g.limbs != _ONE.limbs:
+            raise ValueError("Not invertible: gcd with the modulus is not 1")
+        return self.reduce(s)
+
+    def pow(self, a, e):
+        # a^e mod m; a negative exponent raises the inverse of a to -e, as pow(a, e, m) does
+        e = normalize_number(e)
+        if e.isInf:
+            raise ValueError("Undefined: modular power with infinite exponent")
+        if e.sign < 0 and e.significand[-1] != 0:
+            a, e = self.inverse(a), _make(1, e.limbs)
+        residue = self._residue(a)
+        if e.significand[-1] == 0:
+            return self.reduce(_ONE)
+        if residue[-1] == 0:
+            return _ZERO
+        return self._result(_power_limbs(residue, int(e), self._reduce_product))
+
+def pow_mod(base_, exponent, modulus):
+    # base^exponent mod modulus without ever building the full power; same results as
+    # Python's pow(base, exponent, modulus), including modular inverses for negative exponents
+    return ModContext(modulus).pow(base_, exponent)
+
+# Limb index and value at which an Accumulator's buffer reaches 10^MAX_SUPPORTED_MAGNITUDE
+_INF_LIMB, _INF_TOP = MAX_SUPPORTED_MAGNITUDE // LIMB_DIGITS, 10 ** (MAX_SUPPORTED_MAGNITUDE % LIMB_DIGITS)
+
+class Accumulator:
+    # Mutable running total for hot loops: `acc.iadd(income)` updates one limb buffer in place
+    # where `balance = add(balance, income)` builds a new BigNum per step. The buffer may keep
+    # zero limbs above the top digit and only ever grows (array appends over-allocate, so growth
+    # is amortized); trimming and the BigNum itself are produced on read by value(), which
+    # caches the result until the next update. A sequence of updates gives the same value as
+    # the matching fold over add/subtract/mul_small, saturating to infinity the same way.
+    __slots__ = ('_sign', '_limbs', '_inf', '_scratch', '_value')
+
+    def __init__(self, value=0):
+        self._scratch = array('I', [0])
+        self.set(value)
+
+    def set(self, value):
+        value = normalize_number(value)
+        self._sign = value.sign
+        self._inf = value.sign if value.isInf else 0
+        self._limbs = array('I', value.limbs or (0,))
+        self._value = value
+        return self
+
+    def value(self):
+        value = self._value
+        if value is None:
+            if self._inf:
+                value = POS_INF if self._inf > 0 else NEG_INF
+            else:
+                limbs = self._limbs
+                top = len(limbs)
+                while top > 1 and limbs[top - 1] == 0:
+                    top -= 1
+                value = _make(self._sign, limbs[:top])
+            self._value = value
+        return value
+
+    def __repr__(self):
+        return f"Accumulator({to_decimal_string(self.value())!r})"
+
+    def iadd(self, x):
+        self._update(x, 1)
+        return self
+
+    def isub(self, x):
+        self._update(x, -1)
+        return self
+
+    def imul_small(self, n):
+        # Multiply in place by a plain int, like mul_small
+        if self._inf:
+            if n == 0:
+                raise ValueError("Undefined: 0 * ∞")
+            if n < 0:
+                self._inf = self._sign = -self._inf
+                self._value = None
+            return self
+        self._value = None
+        if n < 0:
+            n = -n
+            self._sign = -self._sign
+        limbs = self._limbs
+        carry = 0
+        for i in range(len(limbs)):
+            product = limbs[i] * n + carry
+            carry = product // LIMB_BASE
+            limbs[i] = product - carry * LIMB_BASE
+        while carry:
+            carry, limb = divmod(carry, LIMB_BASE)
+            limbs.append(limb)
+        if len(limbs) > _INF_LIMB:
+            self._check_overflow()
+        return self
+
+    __iadd__ = iadd
+    __isub__ = isub
+    __imul__ = imul_small
+
+    def _update(self, x, direction):
+        if type(x) is int:
+            if x == 0:
+                return
+            if x < 0:
+                x = -x
+                direction = -direction
+            if x < LIMB_BASE:
+                # Reuse a one-limb scratch array so small operands allocate nothing
+                b = self._scratch
+                b[0] = x
+            else:
+                b = _int_limbs(x)
         else:
-            if not is_equal(a, normalize_number({'sign': 1, 'blocks': [0]})):
-                return normalize_number({'sign': -1, 'blocks': [1]})  # -1
+            x = normalize_number(x)
+            if x.isInf:
+                if self._inf and self._inf != x.sign * direction:
+                    raise ValueError("Undefined: ∞ + -∞" if direction > 0 else "Undefined: ∞ - ∞")
+                self._inf = self._sign = x.sign * direction
+                self._value = None
+                return
+            b = x.limbs
+            direction *= x.sign
+        if self._inf:
+            return
+        self._value = None
+        limbs = self._limbs
+        b_len = len(b)
+        while len(limbs) < b_len:
+            limbs.append(0)
+        size = len(limbs)
+        if direction == self._sign:
+            carry = 0
+            for i in range(b_len):
+                total = limbs[i] + b[i] + carry
+                if total >= LIMB_BASE:
+                    limbs[i] = total - LIMB_BASE
+                    carry = 1
+                else:
+                    limbs[i] = total
+                    carry = 0
+            i = b_len
+            while carry:
+                if i == size:
+                    limbs.append(1)
+                    break
+                if limbs[i] == LIMB_BASE - 1:
+                    limbs[i] = 0
+                else:
+                    limbs[i] += 1
+                    carry = 0
+                i += 1
+            if len(limbs) > _INF_LIMB:
+                self._check_overflow()
+            return
+        borrow = 0
+        for i in range(b_len):
+            diff = limbs[i] - b[i] - borrow
+            if diff < 0:
+                limbs[i] = diff + LIMB_BASE
+                borrow = 1
+            else:
+                limbs[i] = diff
+                borrow = 0
+        i = b_len
+        while borrow and i < size:
+            if limbs[i] == 0:
+                limbs[i] = LIMB_BASE - 1
             else:
-                return normalize_number({'sign': 1, 'blocks': [0]})
-    # Convert to most-significant-first order
-    A = [abs_a['blocks'][i] for i in range(len(abs_a['blocks']) - 1, -1, -1)]
-    R = normalize_number({'sign': 1, 'blocks': [0]})  # Remainder
-    Q = []  # Quotient digits (most-significant first)
-    for i in range(len(A)):
-        # Multiply remainder by 1000 and add next digit
-        R = multiply(R, normalize_number({'sign': 1, 'blocks': [1000]}))
-        R = add(R, normalize_number({'sign': 1, 'blocks': [A[i]]}))
-        if is_greater_than_or_equal(R, abs_b):
-            # Binary search for quotient digit (0-999)
-            low, high = 0, 999
-            while low < high:
-                mid = math_floor((low + high + 1) / 2)
-                mid_bn = normalize_number({'sign': 1, 'blocks': [mid]})
-                test = multiply(abs_b, mid_bn)
-                if is_greater(test, R):
-                    high = mid - 1
+                limbs[i] -= 1
+                borrow = 0
+            i += 1
+        if borrow:
+            # |x| was larger: the buffer holds B^size - (|x| - |acc|), so negate it in place
+            carry = 1
+            for i in range(size):
+                total = LIMB_BASE - 1 - limbs[i] + carry
+                if total == LIMB_BASE:
+                    limbs[i] = 0
                 else:
-                    low = mid
-            q = low
-            q_bn = normalize_number({'sign': 1, 'blocks': [q]})
-            product = multiply(abs_b, q_bn)
-            R = subtract(R, product)
-            Q.append(q)
+                    limbs[i] = total
+                    carry = 0
+            self._sign = direction
+            if size > _INF_LIMB:
+                self._check_overflow()
+
+    def _check_overflow(self):
+        limbs = self._limbs
+        for i in range(len(limbs) - 1, _INF_LIMB, -1):
+            if limbs[i]:
+                break
         else:
-            Q.append(0)
-    # Convert to least-significant-first blocks
-    quotient_blocks = [Q[i] for i in range(len(Q) - 1, -1, -1)]
-    # Trim trailing zeros (most-significant end)
-    while len(quotient_blocks) > 1 and quotient_blocks[-1] == 0:
-        quotient_blocks.pop()
-    abs_q = normalize_number({'sign': 1, 'blocks': quotient_blocks})
-    # Apply sign and adjust for negative division
-    if sign == 1:
-        return abs_q
-    else:
-        zero = normalize_number({'sign': 1, 'blocks': [0]})
-        if is_equal(R, zero):
-            return normalize_number({'sign': -1, 'blocks': abs_q['blocks']})
+            if limbs[_INF_LIMB] < _INF_TOP:
+                return
+        self._inf = self._sign
+
+# Digits of float precision; an addend this many decades smaller than the other is lost
+_APPROX_DIGITS = 17
+_LOG10_2 = math.log10(2)
+_INFINITIES = (math.inf, -math.inf)
+_HASH_MODULUS = sys.hash_info.modulus
+# Decimal exponents of non-zero finite floats, subnormals included
+_FLOAT_EXPONENTS = (-324, 308)
+
+class ApproxNum:
+    # Approximate value mantissa * 10^exponent for simulation: a float mantissa with
+    # 1 <= |mantissa| < 10 (0 for zero, ±inf for infinity) and an unbounded int exponent, so
+    # the range goes far past MAX_SUPPORTED_MAGNITUDE and every operation is a few float
+    # operations regardless of size. Results carry float precision (about 16 significant
+    # digits); settle exact amounts with BigNums via to_approx()/from_approx().
+    __slots__ = ('mantissa', 'exponent')
+
+    def __init__(self, mantissa, exponent=0):
+        mantissa = float(mantissa)
+        if mantissa != mantissa:
+            raise ValueError("Undefined: indeterminate approximate result")
+        if type(exponent) is not int:
+            if not float(exponent).is_integer():
+                raise ValueError("ApproxNum exponent must be an integer")
+            exponent = int(exponent)
+        if mantissa == 0 or mantissa in _INFINITIES:
+            self.mantissa = mantissa
+            self.exponent = 0
+            return
+        shift = math_floor(math_log10(abs(mantissa)))
+        if shift > 0:
+            mantissa /= 10.0 ** shift
+        elif shift < -300:
+            # 10^-shift itself would overflow for subnormal mantissas
+            mantissa = mantissa * 1e300 * 10.0 ** (-shift - 300)
+        elif shift < 0:
+            mantissa *= 10.0 ** -shift
+        # log10 may round across a power of ten
+        if abs(mantissa) >= 10:
+            mantissa /= 10
+            shift += 1
+        elif abs(mantissa) < 1:
+            mantissa *= 10
+            shift -= 1
+        self.mantissa = mantissa
+        self.exponent = exponent + shift
+
+    def __repr__(self):
+        return f"ApproxNum({self.mantissa!r}, {self.exponent})"
+
+    def __str__(self):
+        return get_scientific(self)
+
+    def __float__(self):
+        if self.exponent > 308:
+            return math.copysign(math.inf, self.mantissa)
+        if self.exponent < -308:
+            return 0.0
+        return self.mantissa * 10.0 ** self.exponent
+
+    def __bool__(self):
+        return self.mantissa != 0
+
+    def __hash__(self):
+        # Python's numeric hash of _exact(), so a value equal to an int, float or BigNum
+        # hashes like it; past the float range it is worked modulo the hash modulus, so a
+        # huge exponent costs one modular power
+        mantissa = self.mantissa
+        if mantissa == 0 or mantissa in _INFINITIES:
+            return hash(mantissa)
+        if _FLOAT_EXPONENTS[0] <= self.exponent <= _FLOAT_EXPONENTS[1]:
+            return hash(self._exact())
+        numerator, denominator = abs(mantissa).as_integer_ratio()
+        h = numerator * pow(denominator, -1, _HASH_MODULUS) * pow(10, self.exponent, _HASH_MODULUS) % _HASH_MODULUS
+        if mantissa < 0:
+            h = -h
+        return -2 if h == -1 else h
+
+    def _exact(self):
+        # The exact value == and __hash__ use against ints, floats and BigNums, for a finite
+        # non-zero ApproxNum: a float within two ulps of mantissa * 10^exponent that converts
+        # back to this mantissa and exponent (so ApproxNum(0.1) == 0.1), otherwise
+        # mantissa * 10^exponent taking the mantissa's binary value exactly
+        value = Fraction(self.mantissa) * Fraction(10) ** self.exponent
+        if not _FLOAT_EXPONENTS[0] <= self.exponent <= _FLOAT_EXPONENTS[1]:
+            return value
+        try:
+            nearest = float(value)
+        except OverflowError:
+            return value
+        candidates = [nearest]
+        below = above = nearest
+        for _ in range(2):
+            below, above = math.nextafter(below, -math.inf), math.nextafter(above, math.inf)
+            candidates += (below, above)
+        matches = []
+        for candidate in candidates:
+            approx = ApproxNum(candidate)
+            if approx.mantissa == self.mantissa and approx.exponent == self.exponent:
+                matches.append(candidate)
+        if not matches:
+            return value
+        # Neighbouring floats can share one mantissa: the shortest written one wins
+        return Fraction(min(matches, key=lambda candidate: len(repr(candidate))))
+
+    def _decimal(self):
+        # |value| as digits * 10^scale, from the shortest decimal form of the mantissa: the
+        # digits from_approx() gives, which the suffix and scientific formats read
+        whole, _, fraction = repr(abs(self.mantissa)).partition('.')
+        return int(whole + fraction), self.exponent - len(fraction)
+
+    def add(self, other):
+        other = to_approx(other)
+        if other.mantissa == 0:
+            return self
+        if self.mantissa == 0:
+            return other
+        if self.mantissa in _INFINITIES or other.mantissa in _INFINITIES:
+            # ∞ + -∞ gives NaN, which the constructor rejects
+            return ApproxNum(self.mantissa + other.mantissa)
+        gap = self.exponent - other.exponent
+        if gap > _APPROX_DIGITS:
+            return self
+        if gap < -_APPROX_DIGITS:
+            return other
+        if gap >= 0:
+            return ApproxNum(self.mantissa + other.mantissa / 10.0 ** gap, self.exponent)
+        return ApproxNum(self.mantissa / 10.0 ** -gap + other.mantissa, other.exponent)
+
+    def sub(self, other):
+        other = to_approx(other)
+        return self.add(ApproxNum(-other.mantissa, other.exponent))
+
+    def mul(self, other):
+        other = to_approx(other)
+        return ApproxNum(self.mantissa * other.mantissa, self.exponent + other.exponent)
+
+    def div(self, other):
+        # True (not floor) division
+        other = to_approx(other)
+        if other.mantissa == 0:
+            raise ValueError("Division by zero")
+        return ApproxNum(self.mantissa / other.mantissa, self.exponent - other.exponent)
+
+    def pow(self, p):
+        # self^p for an int or float power; a negative base needs an int power
+        if isinstance(p, ApproxNum):
+            p = float(p)
+        if self.mantissa == 0:
+            if p < 0:
+                raise ValueError("Division by zero in 0^(-n)")
+            return self if p else ApproxNum(1)
+        if self.mantissa < 0 and not (isinstance(p, int) or float(p).is_integer()):
+            raise ValueError("Undefined: fractional power of a negative number")
+        sign = -1.0 if self.mantissa < 0 and int(p) & 1 else 1.0
+        if self.mantissa in _INFINITIES:
+            return ApproxNum(sign * math.inf if p > 0 else 0.0) if p else ApproxNum(1)
+        # log10 of the result is p * exponent + p * log10|mantissa|. For int powers both terms
+        # are worked in exact ints (the float log10 as a ratio), so p never meets a float that
+        # could overflow. The float log10 itself is off by up to about 2e-16, which p scales:
+        # the result is off by a relative |p| * 5e-16 or so, and past |p| ~ 10^15 by whole
+        # decades, leaving only the leading digits of the exponent meaningful.
+        if isinstance(p, int):
+            numerator, denominator = math_log10(abs(self.mantissa)).as_integer_ratio()
+            carry, remainder = divmod(p * numerator, denominator)
+            return ApproxNum(sign * 10.0 ** (remainder / denominator), self.exponent * p + carry)
         else:
-            one = normalize_number({'sign': 1, 'blocks': [1]})
-            q_value = add(abs_q, one)
-            q_value['sign'] = -1
-            return q_value
+            fraction = p * (self.exponent + math_log10(abs(self.mantissa)))
+        if fraction in _INFINITIES:
+            return ApproxNum(sign * math.inf if fraction > 0 else 0.0)
+        shift = math_floor(fraction)
+        return ApproxNum(sign * 10.0 ** (fraction - shift), shift)
+
+    def log10(self):
+        # log10 of a positive value, as a float
+        if self.mantissa <= 0:
+            raise ValueError("Undefined: logarithm of a non-positive number")
+        return self.exponent + math_log10(self.mantissa)
+
+    def log(self, base=math.e):
+        return self.log10() / math_log10(base)
+
+    def compare(self, other):
+        other = to_approx(other)
+        a, b = self.mantissa, other.mantissa
+        if (a > 0) != (b > 0) or a == 0 or b == 0 or a in _INFINITIES or b in _INFINITIES \
+                or self.exponent == other.exponent:
+            return (a > b) - (a < b)
+        # Same sign, both finite and non-zero: the larger exponent has the larger magnitude
+        return (1 if self.exponent > other.exponent else -1) * (1 if a > 0 else -1)
+
+    def __neg__(self):
+        return ApproxNum(-self.mantissa, self.exponent)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return self if self.mantissa >= 0 else ApproxNum(-self.mantissa, self.exponent)
+
+    def _order(self, other):
+        # compare() for the ordering operators, NotImplemented for types to_approx() doesn't
+        # take as numbers
+        approx = _approx_operand(other)
+        return NotImplemented if approx is None else self.compare(approx)
+
+    def _equals(self, other):
+        # Exact equality, so == agrees with __hash__: against an int, float or BigNum, a tie
+        # in compare() is settled on _exact(). A float or large int that only rounds to this
+        # ApproxNum (neighbouring floats can share one mantissa) is neither less nor greater
+        # but not equal.
+        approx = _approx_operand(other)
+        if approx is None:
+            return NotImplemented
+        if self.compare(approx):
+            return False
+        if approx is other or self.mantissa == 0 or self.mantissa in _INFINITIES:
+            return True
+        return self._exact() == Fraction(other if isinstance(other, (int, float)) else int(normalize_number(other)))
+
+    def __add__(self, other):
+        other = _approx_operand(other)
+        return NotImplemented if other is None else self.add(other)
+
+    def __radd__(self, other):
+        other = _approx_operand(other)
+        return NotImplemented if other is None else other.add(self)
+
+    def __sub__(self, other):
+        other = _approx_operand(other)
+        return NotImplemented if other is None else self.sub(other)
+
+    def __rsub__(self, other):
+        other = _approx_operand(other)
+        return NotImplemented if other is None else other.sub(self)
+
+    def __mul__(self, other):
+        other = _approx_operand(other)
+        return NotImplemented if other is None else self.mul(other)
+
+    def __rmul__(self, other):
+        other = _approx_operand(other)
+        return NotImplemented if other is None else other.mul(self)
+
+    def __truediv__(self, other):
+        other = _approx_operand(other)
+        return NotImplemented if other is None else self.div(other)
+
+    def __rtruediv__(self, other):
+        other = _approx_operand(other)
+        return NotImplemented if other is None else other.div(self)
+
+    def __pow__(self, other):
+        return self.pow(other)
+
+    def __eq__(self, other):
+        return self._equals(other)
+
+    def __ne__(self, other):
+        equal = self._equals(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __lt__(self, other):
+        order = self._order(other)
+        return order if order is NotImplemented else order < 0
+
+    def __le__(self, other):
+        order = self._order(other)
+        return order if order is NotImplemented else order <= 0
+
+    def __gt__(self, other):
+        order = self._order(other)
+        return order if order is NotImplemented else order > 0
+
+    def __ge__(self, other):
+        order = self._order(other)
+        return order if order is NotImplemented else order >= 0
+
+def _approx_operand(other):
+    # Operator overloads take ApproxNums, BigNums, legacy dicts, ints and floats (as
+    # _coerce_operand() does for BigNum); anything else is NotImplemented
+    if isinstance(other, (ApproxNum, BigNum, dict, int, float)):
+        return to_approx(other)
+    return None
+
+_APPROX_PATTERN = re.compile(r'^([+-]?(?:\d+\.?\d*|\.\d+))(?:[eE]([+-]?\d+))?$')
+
+def to_approx(num):
+    # ApproxNum from a BigNum, int, float, decimal/scientific string (any exponent) or ApproxNum
+    if type(num) is ApproxNum:
+        return num
+    if isinstance(num, float):
+        return ApproxNum(num)
+    if isinstance(num, int):
+        if abs(num).bit_length() <= 1000:
+            return ApproxNum(float(num))
+        # float(num) would overflow: keep the leading 18 or so decimal digits instead
+        drop = int(abs(num).bit_length() * _LOG10_2) - 18
+        top = abs(num) // 10 ** drop
+        digits = len(str(top)) - 1
+        return ApproxNum((-top if num < 0 else top) / 10.0 ** digits, drop + digits)
+    if isinstance(num, str):
+        match = _APPROX_PATTERN.match(re.sub(r'[\s,]', '', num))
+        if match is None:
+            return to_approx(string_to_number(num))
+        return ApproxNum(float(match.group(1)), int(match.group(2) or 0))
+    num = normalize_number(num)
+    if num.isInf:
+        return ApproxNum(math.inf if num.sign > 0 else -math.inf)
+    limbs = num.significand
+    top = limbs[-1]
+    if len(limbs) > 1:
+        top = top * LIMB_BASE + limbs[-2]
+    elif num.shift:
+        top *= LIMB_BASE
+    # top holds the leading (up to 18) digits; scale it to [1, 10)
+    return ApproxNum(num.sign * top / 10.0 ** (len(str(top)) - 1), num.magnitude - 1)
+
+def from_approx(approx):
+    # Exact BigNum from the shortest decimal form of the mantissa, truncated like
+    # string_to_number() below 1 and infinite past MAX_SUPPORTED_MAGNITUDE
+    approx = to_approx(approx)
+    if approx.mantissa in _INFINITIES:
+        return POS_INF if approx.mantissa > 0 else NEG_INF
+    return string_to_number(f"{approx.mantissa!r}e{approx.exponent}")
+
+def _digits_to_number(s, sgn, shift=0):
+    # Convert a plain digit string, times B^shift, to a normalized number
+    s = s.lstrip('0')
+    if s == '':
+        return _ZERO
+    # Check if the string length exceeds our maximum supported magnitude
+    if len(s) + LIMB_DIGITS * shift > MAX_SUPPORTED_MAGNITUDE:
+        return POS_INF if sgn > 0 else NEG_INF
+    limbs = array('I', [int(s[max(i - LIMB_DIGITS, 0):i]) for i in range(len(s), 0, -LIMB_DIGITS)])
+    if limbs[0] == 0:
+        return _make(sgn, limbs, shift)
+    return BigNum(sgn, limbs, len(s) + LIMB_DIGITS * shift, False, shift)
 
 def string_to_number(str_):
     str_ = re.sub(r'[\s,]', '', str_)
@@ -268,60 +1533,47 @@ def string_to_number(str_):
     # Handle infinity explicitly
     if str_.lower() == 'inf' or str_.lower() == 'infinity':
         return POS_INF if sign > 0 else NEG_INF
-    # Helper function to convert a digit string to normalized number
-    def digits_string_to_normalized(s, sgn):
-        s = re.sub(r'^0+', '', s)
-        if s == '':
-            return normalize_number({'sign': 1, 'blocks': [0]})
-        # Check if the string length exceeds our maximum supported magnitude
-        if len(s) > MAX_SUPPORTED_MAGNITUDE:
-            return POS_INF if sgn > 0 else NEG_INF
-        padded = s[::-1]
-        padded += '0' * ((3 - len(padded) % 3) % 3)
-        blocks = []
-        for i in range(0, len(padded), 3):
-            chunk = padded[i:i+3][::-1]
-            blocks.append(int(chunk))
-        return normalize_number({'sign': sgn, 'blocks': blocks})
     # Check for scientific notation (e or E)
     e_match = re.search(r'[eE]', str_)
     if e_match:
         e_index = e_match.start()
         base_part = str_[0:e_index]
         exp_part = str_[e_index + 1:]
-        
+
         match = re.match(r'^(\d*)\.?(\d*)$', base_part)
         if match:
             whole, fractional = match.groups()
         else:
             whole, fractional = '', ''
-            
+
         whole = whole or ''
         fractional = fractional or ''
         combined = whole + fractional
         fractional_digits = len(fractional)
-        
+
         try:
             exponent_value = int(exp_part)
         except ValueError:
             exponent_value = 0
-            
+
         total_exponent = exponent_value - fractional_digits
 
         # FIX: Handle negative exponents by truncating instead of crashing
         if total_exponent < 0:
             trim_amount = -total_exponent
             if trim_amount >= len(combined):
-                return normalize_number({'sign': 1, 'blocks': [0]})
+                return _ZERO
             total_str = combined[:-trim_amount]
         else:
             # Check magnitude limit
             result_magnitude = len(combined) + total_exponent
             if result_magnitude > MAX_SUPPORTED_MAGNITUDE:
                 return POS_INF if sign > 0 else NEG_INF
-            total_str = combined + '0' * total_exponent
-            
-        return digits_string_to_normalized(total_str, sign)
+            # Whole zero limbs become the shift; only the rest is written out as digits
+            whole_limbs, rest = divmod(total_exponent, LIMB_DIGITS)
+            return _digits_to_number(combined + '0' * rest, sign, whole_limbs)
+
+        return _digits_to_number(total_str, sign)
     else:
         # Non-scientific notation
         match = re.match(r'^(\d*)\.?(\d*)$', str_)
@@ -332,7 +1584,7 @@ def string_to_number(str_):
         whole = whole or ''
         fractional = fractional or ''
         combined = whole + fractional
-        return digits_string_to_normalized(combined, sign)
+        return _digits_to_number(combined, sign)
 
 def notation_to_string(str_):
     str_ = re.sub(r'[\s,]', '', str_)
@@ -392,44 +1644,80 @@ def get_suffix(block_count):
     return NOTATION[tier - 1] if tier > 0 else ''  # Adjust for 0-index
 
 def format_number(num, decimals):
-    if num['isInf']:
-        return "Infinity" if num['sign'] > 0 else "-Infinity"
-    if len(num['blocks']) == 0 or (num['blocks'][0] == 0 and len(num['blocks']) == 1):
+    if type(num) is ApproxNum:
+        return _format_approx(num, decimals)
+    num = normalize_number(num)
+    if num.isInf:
+        return "Infinity" if num.sign > 0 else "-Infinity"
+    if num.significand[-1] == 0:
         return "0"
     
-    tier = math_floor((num['magnitude'] - 1) / 3) + 1
+    tier = math_floor((num.magnitude - 1) / 3) + 1
     if tier > MAX_TIER:
-        return "Infinity" if num['sign'] > 0 else "-Infinity"
+        return "Infinity" if num.sign > 0 else "-Infinity"
     
     # Improved precision: Use up to 3 blocks for calculation
-    blocks = num['blocks']
-    most = blocks[-1]
-    next_ = blocks[-2] if len(blocks) >= 2 else 0
-    after_next = blocks[-3] if len(blocks) >= 3 else 0
+    most, next_, after_next = _leading_blocks(num, 3)
     
     # Combine blocks into a single float for rounding
     value = most + (next_ / 1000) + (after_next / 1000000)
-    
+    return format_tier(num.sign, value, tier, decimals)
+
+def format_tier(sign, value, tier, decimals):
+    # The format_number() string for a finite non-zero number given as its sign, its
+    # leading blocks combined into `value` (most + next / 1000 + after_next / 1e6, so
+    # 1 <= value < 1000) and its tier (1 for units, 2 for K, ...); for callers that
+    # already hold those, such as a whole array of numbers
     if value >= 1000 and tier < MAX_TIER:
         tier += 1
         value /= 1000
         if tier > MAX_TIER:
-            return "Infinity" if num['sign'] > 0 else "-Infinity"
+            return "Infinity" if sign > 0 else "-Infinity"
 
     suffix = NOTATION[tier - 1]
     formatted = f"{value:.{decimals}f}"
     formatted = re.sub(r'\.?0+$', '', formatted)
     formatted = re.sub(r'\.$', '', formatted) 
-    return ("-" if num['sign'] < 0 else "") + formatted + (suffix or "")
+    return ("-" if sign < 0 else "") + formatted + (suffix or "")
+
+def _format_approx(num, decimals):
+    # format_number() for an ApproxNum: same tiers and suffixes, and scientific notation
+    # past the last NOTATION tier, where a BigNum would already be infinite
+    mantissa = num.mantissa
+    if mantissa in _INFINITIES:
+        return "Infinity" if mantissa > 0 else "-Infinity"
+    if mantissa == 0 or num.exponent < 0:
+        return "0"
+    tier = num.exponent // 3 + 1
+    if tier > MAX_TIER:
+        return get_scientific(num)
+    most, next_, after_next = _approx_leading_blocks(num, 3)
+    return format_tier(mantissa, most + next_ / 1000 + after_next / 1000000, tier, decimals)
+
+def _approx_leading_blocks(num, count):
+    # _leading_blocks() for a finite non-zero ApproxNum, read from the digits of _decimal()
+    # so it formats exactly like the BigNum from_approx() would give
+    digits = str(num._decimal()[0])
+    head = num.exponent % 3 + 1
+    digits += '0' * (head + 3 * count - len(digits))
+    return [int(digits[0:head])] + [int(digits[head + 3 * i:head + 3 * i + 3]) for i in range(count - 1)]
 
 def get_scientific(num):
-    if num['isInf']:
-        return "Infinity" if num['sign'] > 0 else "-Infinity"
-    if len(num['blocks']) == 0 or (num['blocks'][0] == 0 and len(num['blocks']) == 1):
+    if type(num) is ApproxNum:
+        if num.mantissa in _INFINITIES:
+            return "Infinity" if num.mantissa > 0 else "-Infinity"
+        if num.mantissa == 0:
+            return "0"
+        most, next_ = _approx_leading_blocks(num, 2)
+        leading_value = most + next_ / 1000
+        return format_mantissa(num.mantissa, leading_value / 10 ** (len(str(most)) - 1), num.exponent)
+    num = normalize_number(num)
+    if num.isInf:
+        return "Infinity" if num.sign > 0 else "-Infinity"
+    if num.significand[-1] == 0:
         return "0"
-    magnitude = num['magnitude']
-    most_significant_block = num['blocks'][-1] if num['blocks'] else 0
-    next_block = num['blocks'][-2] if len(num['blocks']) >= 2 else 0
+    magnitude = num.magnitude
+    most_significant_block, next_block = _leading_blocks(num, 2)
     # Calculate the leading digits
     leading_value = most_significant_block
     if next_block > 0:
@@ -439,8 +1727,12 @@ def get_scientific(num):
     exponent = magnitude - 1
     # Format the mantissa
     mantissa = leading_value / (10 ** (leading_digits - 1))
-    # Format the result
-    sign_str = "-" if num['sign'] < 0 else ""
+    return format_mantissa(num.sign, mantissa, exponent)
+
+def format_mantissa(sign, mantissa, exponent):
+    # The get_scientific() string for a finite non-zero number given as its sign, its
+    # leading digits as 1 <= mantissa < 10 and its decimal exponent
+    sign_str = "-" if sign < 0 else ""
     formatted = f"{mantissa:.3f}"
     formatted = re.sub(r'\.?0+$', '', formatted)
     formatted = re.sub(r'\.$', '', formatted)
@@ -461,39 +1753,25 @@ def get_detailed(num):
 def encode_number(value):
     num = string_to_number(value)
     # Handle special cases
-    if num['isInf']:
-        return "∞" if num['sign'] > 0 else "-∞"
-    if len(num['blocks']) == 0 or (num['blocks'][0] == 0 and len(num['blocks']) == 1):
+    if num.isInf:
+        return "∞" if num.sign > 0 else "-∞"
+    if num.significand[-1] == 0:
         return "0"
-    # Pre-allocate result list for better performance
     chars = []
-    current = list(num['blocks'])
-    # Optimized division by base using cached calculations
-    base_cache = {i: {'quotient': math_floor(i / base), 'remainder': i % base} for i in range(1000)}
-    while len(current) > 0 and not (len(current) == 1 and current[0] == 0):
-        remainder = 0
-        new_blocks = []
-        has_non_zero = False
-        # Process from most significant to least significant
-        for i in range(len(current) - 1, -1, -1):
-            val = current[i] + remainder * 1000
-            if val < 1000 and val in base_cache:
-                # Use cached division for small values
-                quotient = base_cache[val]['quotient']
-                new_remainder = base_cache[val]['remainder']
-            else:
-                quotient = math_floor(val / base)
-                new_remainder = val % base
-            remainder = new_remainder
-            if quotient > 0 or has_non_zero:
-                new_blocks.append(quotient)
-                has_non_zero = True
-        # Reverse new_blocks to maintain correct order (least to most significant)
-        current = new_blocks[::-1]
-        chars.append(CHARACTERS[remainder])
+    current = num.limbs
+    # Peel off four base-90 digits per short division (90^4 fits in one limb)
+    chunk = base ** 4
+    while len(current) > 1 or current[0] != 0:
+        current, remainder = _divmod_1(current, chunk)
+        for _ in range(4):
+            remainder, digit = divmod(remainder, base)
+            chars.append(CHARACTERS[digit])
+    # The last chunk may leave leading zero digits
+    while chars[-1] == CHARACTERS[0]:
+        chars.pop()
     # Reverse chars to get correct order
     result = chars[::-1]
-    return ("-" if num['sign'] < 0 else "") + ''.join(result)
+    return ("-" if num.sign < 0 else "") + ''.join(result)
 
 def decode_number(encoded_str):
     if encoded_str == "0":
@@ -512,127 +1790,181 @@ def decode_number(encoded_str):
             return "0"
     # Pre-compute character lookup dict for O(1) access
     char_lookup = {ch: i for i, ch in enumerate(CHARACTERS)}
-    blocks = [0]
-    str_len = len(str_)
-    for i in range(str_len):
-        c = str_[i:i+1]
+    limbs = array('I', [0])
+    for c in str_:
         value = char_lookup.get(c)
         if value is None:
             raise ValueError(f"Invalid character in encoded string: {c}")
-        # Multiply existing blocks by base
-        carry = 0
-        for j in range(len(blocks)):
-            product = blocks[j] * base + carry
-            blocks[j] = product % 1000
-            carry = math_floor(product / 1000)
-        # Add remaining carry
-        while carry > 0:
-            blocks.append(carry % 1000)
-            carry = math_floor(carry / 1000)
-        # Add the current digit value
+        # Multiply existing limbs by base and add the current digit value in one pass
         carry = value
-        j = 0
-        while carry > 0 and j < len(blocks):
-            sum_ = blocks[j] + carry
-            blocks[j] = sum_ % 1000
-            carry = math_floor(sum_ / 1000)
-            j += 1
+        for j in range(len(limbs)):
+            product = limbs[j] * base + carry
+            carry = product // LIMB_BASE
+            limbs[j] = product - carry * LIMB_BASE
         if carry > 0:
-            blocks.append(carry)
-    # Convert blocks to string representation
-    parts = []
-    for i in range(len(blocks) - 1, -1, -1):
-        if i == len(blocks) - 1:
-            parts.append(str(blocks[i]))
-        else:
-            parts.append(f"{blocks[i]:03d}")
-    number_str = ''.join(parts)
-    number_str = re.sub(r'^0+', '', number_str)
-    if number_str == "":
-        number_str = "0"
+            limbs.append(carry)
+    # Convert limbs to string representation
+    _trim(limbs)
+    number_str = str(limbs[-1]) + ''.join(f"{limbs[i]:09d}" for i in range(len(limbs) - 2, -1, -1))
     return ("-" if sign == -1 and number_str != "0" else "") + number_str
 
+# Leading byte of a sort key, one per class in numeric order
+_KEY_NEG_INF, _KEY_NEGATIVE, _KEY_ZERO, _KEY_POSITIVE, _KEY_POS_INF = b'\x00', b'\x01', b'\x02', b'\x03', b'\x04'
+# Added to every limb before packing: a biased limb's first byte is 0x01-0x3C, so once
+# inverted it is at most 0xFE and sorts below the 0xFF that closes a negative key
+_KEY_BIAS = 1 << 24
+_INVERT = bytes(range(255, -1, -1))
+
+def to_sort_key(num):
+    # Bytes whose memcmp order is numeric order, for database indexes, bisect and
+    # sorted(key=to_sort_key): the class byte, then for finite non-zero numbers the magnitude
+    # (2 bytes) and the significand's limbs from the top (4 bytes each, biased), all
+    # big-endian. Trailing zero limbs are left out: equal magnitudes align the limbs, and a
+    # key that is a prefix of another belongs to the smaller number. Negative numbers
+    # bit-invert that body and append 0xFF, which reverses both rules.
+    num = normalize_number(num)
+    if num.isInf:
+        return _KEY_POS_INF if num.sign > 0 else _KEY_NEG_INF
+    limbs = num.significand
+    if limbs[-1] == 0:
+        return _KEY_ZERO
+    body = struct.pack(f'>H{len(limbs)}I', num.magnitude, *[limb + _KEY_BIAS for limb in reversed(limbs)])
+    if num.sign > 0:
+        return _KEY_POSITIVE + body
+    return _KEY_NEGATIVE + body.translate(_INVERT) + b'\xff'
+
+def from_sort_key(key):
+    # The BigNum a to_sort_key() key was made from
+    key = bytes(key)
+    head, body = key[:1], key[1:]
+    if head in (_KEY_NEG_INF, _KEY_ZERO, _KEY_POS_INF) and not body:
+        return NEG_INF if head == _KEY_NEG_INF else (POS_INF if head == _KEY_POS_INF else _ZERO)
+    if head == _KEY_NEGATIVE and body[-1:] == b'\xff':
+        sign, body = -1, body[:-1].translate(_INVERT)
+    elif head == _KEY_POSITIVE:
+        sign = 1
+    else:
+        raise ValueError("Invalid sort key")
+    count = (len(body) - 2) // 4
+    if count < 1 or len(body) != 2 + 4 * count:
+        raise ValueError("Invalid sort key")
+    magnitude, *biased = struct.unpack(f'>H{count}I', body)
+    limbs = array('I', [value - _KEY_BIAS for value in reversed(biased)])
+    shift = (magnitude - 1) // LIMB_DIGITS + 1 - count
+    if shift < 0 or not 0 < limbs[-1] < LIMB_BASE or magnitude > MAX_SUPPORTED_MAGNITUDE:
+        raise ValueError("Invalid sort key")
+    num = _make(sign, limbs, shift)
+    if num.magnitude != magnitude:
+        raise ValueError("Invalid sort key")
+    return num
+
 def power(base_, exponent):
-    base_num = string_to_number(base_) if isinstance(base_, str) else base_
-    exp_num = string_to_number(exponent) if isinstance(exponent, str) else exponent
+    base_num = string_to_number(base_) if isinstance(base_, str) else normalize_number(base_)
+    exp_num = string_to_number(exponent) if isinstance(exponent, str) else normalize_number(exponent)
     # Handle special cases
-    if base_num['isInf']:
-        if exp_num['isInf']:
+    if base_num.isInf:
+        if exp_num.isInf:
             raise ValueError("Undefined: ∞^∞")
-        is_exp_zero = len(exp_num['blocks']) == 1 and exp_num['blocks'][0] == 0
+        is_exp_zero = exp_num.significand[-1] == 0
         if is_exp_zero:
             raise ValueError("Undefined: ∞^0")
-        return base_num if exp_num['sign'] > 0 else normalize_number({'sign': 1, 'blocks': [0]})
-    if exp_num['isInf']:
-        is_base_zero = len(base_num['blocks']) == 1 and base_num['blocks'][0] == 0
-        is_base_one = len(base_num['blocks']) == 1 and base_num['blocks'][0] == 1 and base_num['sign'] == 1
+        return base_num if exp_num.sign > 0 else _ZERO
+    if exp_num.isInf:
+        is_base_zero = base_num.significand[-1] == 0
+        is_base_one = len(base_num.limbs) == 1 and base_num.limbs[0] == 1 and base_num.sign == 1
         if is_base_zero:
-            return base_num if exp_num['sign'] > 0 else POS_INF
+            return base_num if exp_num.sign > 0 else POS_INF
         elif is_base_one:
             raise ValueError("Undefined: 1^∞")
         else:
-            return POS_INF if exp_num['sign'] > 0 else normalize_number({'sign': 1, 'blocks': [0]})
+            return POS_INF if exp_num.sign > 0 else _ZERO
     # Handle zero exponent
-    if len(exp_num['blocks']) == 1 and exp_num['blocks'][0] == 0:
-        return normalize_number({'sign': 1, 'blocks': [1]})
+    if exp_num.significand[-1] == 0:
+        return _ONE
     # Handle zero base
-    if len(base_num['blocks']) == 1 and base_num['blocks'][0] == 0:
-        if exp_num['sign'] > 0:
+    if base_num.significand[-1] == 0:
+        if exp_num.sign > 0:
             return base_num
         else:
             raise ValueError("Division by zero in 0^(-n)")
     # Handle negative exponent (not supported for integers)
-    if exp_num['sign'] < 0:
+    if exp_num.sign < 0:
         raise ValueError("Negative exponents not supported for integer arithmetic")
-    # Convert exponent to regular number for iteration
-    exp_str = to_decimal_string(exp_num)
-    try:
-        exp_val = int(exp_str)
-    except ValueError:
-        exp_val = None
-    # For very large exponents, return infinity
-    if exp_val is None or exp_val > 10000:
-        return POS_INF
-    # Fast exponentiation by squaring
-    result = normalize_number({'sign': 1, 'blocks': [1]})
-    current_base = base_num
-    while exp_val > 0:
-        if exp_val % 2 == 1:
-            result = multiply(result, current_base)
-            if result['isInf']:
-                return result
-        current_base = multiply(current_base, current_base)
-        if current_base['isInf']:
-            return current_base
-        exp_val = math_floor(exp_val / 2)
-    return result
+    exp_val = int(exp_num)
+    if exp_val == 1:
+        return base_num
+    sign = base_num.sign if exp_val & 1 else 1
+    limbs = base_num.significand
+    shift = base_num.shift
+    if len(limbs) == 1 and limbs[0] == 1 and not shift:
+        return _ONE if sign > 0 else _negate(_ONE)
+    # |base| >= 2 from here, so |base|^e >= 2^e: decide overflow from the magnitude alone
+    if exp_val > _MAX_SUPPORTED_BITS or (_log10_bounds(limbs)[0] + LIMB_DIGITS * shift) * exp_val > MAX_SUPPORTED_MAGNITUDE + 1e-6:
+        return POS_INF if sign > 0 else NEG_INF
+    # A power of ten is a shift: (10^t)^e = 10^(t * e)
+    top = limbs[-1]
+    if top == 10 ** (len(str(top)) - 1) and not any(limbs[i] for i in range(len(limbs) - 1)):
+        result = _power_of_ten((base_num.magnitude - 1) * exp_val)
+        return result if sign > 0 else _negate(result)
+    if BACKEND == 'int':
+        return _from_int(_to_int(base_num) ** exp_val)
+    # (s B^k)^e = s^e B^(k e): only the significand is raised
+    return _make(sign, _power_limbs(limbs, exp_val), shift * exp_val)
+
+def _power_limbs(b_limbs, exponent, reduce=_trim):
+    # |b|^e for e >= 1 by left-to-right sliding-window exponentiation: the odd powers
+    # b, b^3, ..., b^(2^w - 1) are precomputed, runs of zero bits cost one squaring each and
+    # every w-bit window ending in a one costs one multiplication. Every intermediate passes
+    # through reduce (trimming by default; ModContext reduces modulo m)
+    bits = exponent.bit_length()
+    width = 1 if bits <= 8 else 2 if bits <= 16 else 3 if bits <= 64 else 4 if bits <= 512 else 5
+    odd_powers = [b_limbs]
+    if width > 1:
+        square = reduce(_square_limbs(b_limbs))
+        for _ in range((1 << (width - 1)) - 1):
+            odd_powers.append(reduce(_mul_limbs(odd_powers[-1], square)))
+    result = None
+    i = bits - 1
+    while i >= 0:
+        if not (exponent >> i) & 1:
+            result = reduce(_square_limbs(result))
+            i -= 1
+            continue
+        # The longest window of at most `width` bits starting at bit i and ending in a one
+        j = max(i - width + 1, 0)
+        while not (exponent >> j) & 1:
+            j += 1
+        window = (exponent >> j) & ((1 << (i - j + 1)) - 1)
+        if result is None:
+            result = odd_powers[window >> 1]
+        else:
+            for _ in range(i - j + 1):
+                result = reduce(_square_limbs(result))
+            result = reduce(_mul_limbs(result, odd_powers[window >> 1]))
+        i = j - 1
+    return array('I', result)
 
 def modulo(a, b):
-    if b['isInf']:
-        return a if a['isInf'] else a  # Note: Lua errors on ∞ mod ∞, but simplified here
-    if a['isInf']:
+    a = normalize_number(a)
+    if type(b) is int and b != 0 and not a.isInf:
+        return _from_int(divmod_small(a, b)[1])
+    b = normalize_number(b)
+    if b.isInf:
+        return a if a.isInf else a  # Note: Lua errors on ∞ mod ∞, but simplified here
+    if a.isInf:
         raise ValueError("Undefined: ∞ mod finite")
     # Handle zero divisor
-    if len(b['blocks']) == 1 and b['blocks'][0] == 0:
+    if b.significand[-1] == 0:
         raise ValueError("Modulo by zero")
-    # Handle zero dividend
-    if len(a['blocks']) == 1 and a['blocks'][0] == 0:
-        return a
-    quotient = divide(a, b)
-    product = multiply(quotient, b)
-    return subtract(a, product)
+    return _floor_divmod(a, b)[1]
 
 def abs_(num):
-    if num['isInf']:
-        return {'sign': 1, 'blocks': [], 'magnitude': float('inf'), 'isInf': True}
-    if num['sign'] >= 0:
+    num = normalize_number(num)
+    if num.isInf:
+        return POS_INF
+    if num.sign >= 0:
         return num
-    return {
-        'sign': 1,
-        'blocks': num['blocks'],
-        'magnitude': num['magnitude'],
-        'isInf': False
-    }
+    return BigNum(1, num.significand, num.magnitude, False, num.shift)
 
 def is_greater(a, b):
     return compare(a, b) == 1
@@ -649,82 +1981,337 @@ def is_greater_than_or_equal(a, b):
 def is_lesser_than_or_equal(a, b):
     return compare(a, b) <= 0
 
+def sort_numbers(numbers, reverse=False):
+    # The numbers as BigNums in ascending order (descending with reverse=True); equal values
+    # keep their input order. One sort on to_sort_key replaces cmp_to_key(compare): the keys
+    # lead with the bucket (sign class, then magnitude) and compare with memcmp, so no
+    # comparison calls back into Python.
+    return sorted(map(normalize_number, numbers), key=to_sort_key, reverse=reverse)
+
+def argsort_numbers(numbers, reverse=False):
+    # Indices that would sort the numbers, stable like sort_numbers
+    keys = [to_sort_key(num) for num in numbers]
+    return sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse)
+
+def _isqrt_small(value):
+    # floor(sqrt(value)) for an int below 10^36: a float seed, one Newton step, then fix-ups
+    if value < 2:
+        return value
+    root = int(math.sqrt(value))
+    root = (root + value // root) // 2
+    while root * root > value:
+        root -= 1
+    while (root + 1) * (root + 1) <= value:
+        root += 1
+    return root
+
+def _sqrt_rem_normalized(a_limbs):
+    # Zimmermann's recursive square root (Brent & Zimmermann, Modern Computer Arithmetic,
+    # Algorithm 1.12) for a trimmed limb array whose top limb is at least LIMB_BASE / 4:
+    # the root of the top half seeds one division that yields the low half of the root
+    n = len(a_limbs)
+    l = (n - 1) // 4
+    if l == 0:
+        value = 0
+        for i in range(n - 1, -1, -1):
+            value = value * LIMB_BASE + a_limbs[i]
+        root = _isqrt_small(value)
+        return array('I', _int_limbs(root)), array('I', _int_limbs(value - root * root))
+    root, remainder = _sqrt_rem_normalized(a_limbs[2 * l:])
+    q, u = _divmod_limbs(_trim(a_limbs[l:2 * l] + remainder), _mul_1(root, 2))
+    root = _add_limbs(array('I', [0]) * l + root, q)
+    # remainder = u * B^l + a0 - q^2, which the normalization keeps above -2 * root
+    positive = _trim(a_limbs[:l] + u)
+    q_square = _trim(_square_limbs(q))
+    if _compare_limbs(positive, q_square) >= 0:
+        return root, _trim(_sub_limbs(positive, q_square))
+    deficit = _trim(_sub_limbs(q_square, positive))
+    remainder = _trim(_sub_limbs(_sub_limbs(_mul_1(root, 2), (1,)), deficit))
+    return _trim(_sub_limbs(root, (1,))), remainder
+
+def _isqrt_rem_limbs(limbs):
+    # (floor(sqrt(a)), a - root^2) for a trimmed non-zero limb array. a is scaled by c^2 so
+    # its top limb lands in [LIMB_BASE / 4, LIMB_BASE) without growing, and the root of the
+    # scaled value divided by c is the root of a.
+    c = math.isqrt(LIMB_BASE // (limbs[-1] + 1))
+    if c == 1:
+        return _sqrt_rem_normalized(limbs)
+    root, _ = _sqrt_rem_normalized(_mul_1(limbs, c * c))
+    root, _ = _divmod_1(root, c)
+    return root, _trim(_sub_limbs(limbs, _trim(_square_limbs(root))))
+
+def isqrt_rem(num):
+    # floor(sqrt(num)) and the remainder num - root^2, as BigNums
+    num = normalize_number(num)
+    if num.sign < 0:
+        raise ValueError("Square root of negative number")
+    if num.isInf:
+        raise ValueError("Undefined: remainder of √∞")
+    if num.significand[-1] == 0:
+        return _ZERO, _ZERO
+    root, remainder = _isqrt_rem_limbs(num.limbs)
+    return _make(1, root), _make(1, remainder)
+
 def sqrt(num):
-    if num['isInf']:
-        if num['sign'] > 0:
+    num = normalize_number(num)
+    if num.isInf:
+        if num.sign > 0:
             return num
         else:
             raise ValueError("Square root of negative infinity")
-    if num['sign'] < 0:
+    if num.sign < 0:
         raise ValueError("Square root of negative number")
-    if len(num['blocks']) == 1 and num['blocks'][0] == 0:
+    if num.significand[-1] == 0:
         return num
-    # Newton's method for integer square root
-    x = num
-    one = normalize_number({'sign': 1, 'blocks': [1]})
-    two = normalize_number({'sign': 1, 'blocks': [2]})
-    # Initial guess - use magnitude to get closer
-    guess_magnitude = math.ceil(num['magnitude'] / 2)
-    initial_guess = normalize_number({
-        'sign': 1,
-        'blocks': [1, 0, 0]  # Start with 1000 and adjust
-    })
-    # Adjust initial guess based on magnitude
-    initial_guess_blocks = initial_guess['blocks']
-    for i in range(4, guess_magnitude + 1):
-        if len(initial_guess_blocks) < i:
-            initial_guess_blocks += [0] * (i - len(initial_guess_blocks))
-        initial_guess_blocks[i - 1] = 0
-    if len(initial_guess_blocks) < guess_magnitude:
-        initial_guess_blocks += [0] * (guess_magnitude - len(initial_guess_blocks))
-    initial_guess_blocks[guess_magnitude - 1] = 1
-    initial_guess = normalize_number({'sign': 1, 'blocks': initial_guess_blocks})
-    x = initial_guess
-    for _ in range(100):  # Limit iterations
-        quotient = divide(num, x)
-        sum_ = add(x, quotient)
-        new_x = divide(sum_, two)
-        if is_equal(new_x, x):
-            break
-        x = new_x
-    return x
+    if BACKEND == 'int':
+        return _from_int(math.isqrt(_to_int(num)))
+    return _make(1, _isqrt_rem_limbs(num.limbs)[0])
+
+def _iroot_limbs(limbs, k):
+    # floor(a^(1/k)) for a trimmed non-zero limb array and k >= 2, by Newton's iteration
+    # x <- ((k - 1) x + a // x^(k - 1)) // k. The float seed from the top limbs sits just above
+    # the root, so the iterates fall monotonically onto it, gaining double the digits each time.
+    estimate = _log10_bounds(limbs)[1] / k + 1e-12
+    shift = max(int(estimate) - 14, 0)
+    seed = _mul_1(_power_of_ten(shift).limbs, int(10 ** (estimate - shift)) + 2)
+    x = _trim(seed)
+    while True:
+        quotient = _divmod_limbs(limbs, _power_limbs(x, k - 1))[0]
+        y, _ = _divmod_1(_add_limbs(_mul_1(x, k - 1), quotient), k)
+        if _compare_limbs(y, x) >= 0:
+            return x
+        x = y
+
+def iroot(num, k):
+    # Integer k-th root rounded toward negative infinity, like divide(); negative numbers
+    # only have odd roots
+    num = normalize_number(num)
+    k = normalize_number(k)
+    if k.isInf or k.sign < 0 or k.significand[-1] == 0:
+        raise ValueError("Root degree must be a positive integer")
+    k = int(k)
+    if num.sign < 0 and k % 2 == 0:
+        raise ValueError("Even root of negative number")
+    if num.isInf or k == 1 or num.significand[-1] == 0:
+        return num
+    if k > num.magnitude * 4:
+        # |num| < 10^magnitude < 2^k, so the root is 1
+        root = array('I', [1])
+    elif k == 2:
+        root = _isqrt_rem_limbs(num.limbs)[0]
+    else:
+        root = _iroot_limbs(num.limbs, k)
+    if num.sign > 0:
+        return _make(1, root)
+    # Odd root of a negative number: round the magnitude up unless the root is exact
+    if _compare_limbs(_trim(_power_limbs(root, k)), num.limbs) != 0:
+        root = _add_limbs(root, (1,))
+    return _make(-1, root)
+
+# 0! through 20!, every factorial that fits in a 64-bit word
+_SMALL_FACTORIALS = tuple(_from_int(math.factorial(i)) for i in range(21))
+
+def _range_product_limbs(low, high):
+    # Product of the integers low..high-1 (low >= 1) as trimmed limbs, by binary splitting:
+    # runs of consecutive factors are packed into single limbs, then product_tree pairs them
+    leaves = []
+    run = 1
+    for i in range(low, high):
+        if run * i >= LIMB_BASE and run > 1:
+            leaves.append(array('I', _int_limbs(run)))
+            run = i
+        else:
+            run *= i
+    leaves.append(array('I', _int_limbs(run)))
+    return product_tree(leaves, _mul_trimmed)
+
+def _log10_factorial(n):
+    # log10(n!) from log-gamma; good to about 1e-9 for every n whose factorial can fit
+    return math.lgamma(n + 1) / _LN10
 
 def factorial(num):
-    if num['isInf']:
+    num = normalize_number(num)
+    if num.isInf:
         return POS_INF
-    if num['sign'] < 0:
+    if num.sign < 0:
         raise ValueError("Factorial of negative number")
-    n_str = to_decimal_string(num)
-    try:
-        n = int(n_str)
-    except ValueError:
-        n = None
-    if n is None or n > 1000:  # Prevent excessive computation
+    n = int(num)
+    if n < len(_SMALL_FACTORIALS):
+        return _SMALL_FACTORIALS[n]
+    # n >= LIMB_BASE also keeps lgamma's float argument in range; near the cutoff the
+    # exact product decides
+    if n >= LIMB_BASE or _log10_factorial(n) > MAX_SUPPORTED_MAGNITUDE + 1e-6:
         return POS_INF
-    if n == 0 or n == 1:
-        return normalize_number({'sign': 1, 'blocks': [1]})
-    result = normalize_number({'sign': 1, 'blocks': [1]})
-    current = normalize_number({'sign': 1, 'blocks': [2]})
-    for i in range(2, n + 1):
-        result = multiply(result, current)
-        if result['isInf']:
-            return result
-        current = add(current, normalize_number({'sign': 1, 'blocks': [1]}))
-    return result
+    if BACKEND == 'int':
+        return _from_int(math.factorial(n))
+    return _make(1, _range_product_limbs(2, n + 1))
+
+def binomial(n, k):
+    # Number of ways to choose k of n items; 0 when k > n
+    n = normalize_number(n)
+    k = normalize_number(k)
+    if n.sign < 0 or k.sign < 0:
+        raise ValueError("Binomial of negative number")
+    if k.isInf:
+        if n.isInf:
+            raise ValueError("Undefined: C(∞, ∞)")
+        return _ZERO
+    if n.isInf:
+        return _ONE if k.significand[-1] == 0 else POS_INF
+    n = int(n)
+    k = int(k)
+    if k > n:
+        return _ZERO
+    k = min(k, n - k)
+    if k == 0:
+        return _ONE
+    # Skip the work when the result certainly overflows: log-gamma while its cancellation
+    # error stays small, otherwise the bound C(n, k) >= (n / k)^k
+    if n < LIMB_BASE:
+        estimate = _log10_factorial(n) - _log10_factorial(k) - _log10_factorial(n - k)
+    else:
+        estimate = k * (math.log10(n) - math.log10(k))
+    if estimate > MAX_SUPPORTED_MAGNITUDE + 1e-3:
+        return POS_INF
+    numerator = _range_product_limbs(n - k + 1, n + 1)
+    if k < len(_SMALL_FACTORIALS):
+        denominator = _SMALL_FACTORIALS[k].limbs
+    else:
+        denominator = _range_product_limbs(2, k + 1)
+    return _make(1, _divmod_limbs(numerator, denominator)[0])
+
+def _leading_words(x, y):
+    # x and y without their low limbs, keeping the top LEHMER_WINDOW limbs of x and the same
+    # positions of y, as ints; for len(x) >= len(y)
+    x_hat = y_hat = 0
+    for i in range(len(x) - 1, max(len(x) - LEHMER_WINDOW, 0) - 1, -1):
+        x_hat = x_hat * LIMB_BASE + x[i]
+        y_hat = y_hat * LIMB_BASE + (y[i] if i < len(y) else 0)
+    return x_hat, y_hat
+
+def _lehmer_cosequence(x_hat, y_hat):
+    # Knuth's Algorithm L (TAOCP vol. 2, 4.5.2): run Euclid on the leading words while both
+    # bracketing quotients agree, so the steps are exactly those of Euclid on the full numbers.
+    # Returns (A, B, C, D) with the new pair (A x + B y, C x + D y); B == 0 means no progress.
+    A, B, C, D = 1, 0, 0, 1
+    while y_hat + C != 0 and y_hat + D != 0:
+        q = (x_hat + A) // (y_hat + C)
+        if q != (x_hat + B) // (y_hat + D):
+            break
+        A, C = C, A - q * C
+        B, D = D, B - q * D
+        x_hat, y_hat = y_hat, x_hat - q * y_hat
+    return A, B, C, D
+
+def _lehmer_step(x, y, A, B, C, D):
+    # (A x + B y, C x + D y) in one pass; both results are non-negative and at most x
+    first = [0] * len(x)
+    second = [0] * len(x)
+    for i in range(len(y)):
+        x_i, y_i = x[i], y[i]
+        first[i] = A * x_i + B * y_i
+        second[i] = C * x_i + D * y_i
+    for i in range(len(y), len(x)):
+        first[i] = A * x[i]
+        second[i] = C * x[i]
+    return _trim(_carry_signed(first)), _trim(_carry_signed(second))
+
+def _carry_signed(columns):
+    # Propagate carries through column sums of either sign; the represented value must be
+    # non-negative and fit in len(columns) limbs
+    carry = 0
+    for k in range(len(columns)):
+        total = columns[k] + carry
+        carry = total // LIMB_BASE
+        columns[k] = total - carry * LIMB_BASE
+    return array('I', columns)
+
+def _signed_add(a_sign, a_limbs, b_sign, b_limbs):
+    # Signed a + b as (sign, trimmed limbs), with no magnitude limit
+    if a_sign == b_sign:
+        return a_sign, _add_limbs(a_limbs, b_limbs)
+    if _compare_limbs(a_limbs, b_limbs) < 0:
+        return b_sign, _trim(_sub_limbs(b_limbs, a_limbs))
+    return a_sign, _trim(_sub_limbs(a_limbs, b_limbs))
+
+def _cofactor_step(s0, s1, A, B):
+    # A s0 + B s1 for signed (sign, limbs) cofactors and int coefficients
+    a_sign = s0[0] if A >= 0 else -s0[0]
+    b_sign = s1[0] if B >= 0 else -s1[0]
+    return _signed_add(a_sign, _trim(_mul_1(s0[1], abs(A))), b_sign, _trim(_mul_1(s1[1], abs(B))))
+
+def _gcd_limbs(x, y, cofactor=False):
+    # gcd of trimmed limb arrays x >= y by Lehmer's algorithm: each pass turns the leading
+    # words into a cosequence worth several Euclid steps and applies it to the full numbers
+    # in one linear pass, falling back to a division when the words can't decide a step. With
+    # cofactor=True also returns (sign, limbs) of s with s x = gcd (mod y).
+    s0, s1 = (1, array('I', [1])), (1, array('I', [0]))
+    while y[-1] != 0:
+        if len(y) <= 2 and not cofactor:
+            # Both fit in machine words: finish with plain Euclid
+            u = y[1] * LIMB_BASE + y[0] if len(y) == 2 else y[0]
+            v = _divmod_1(x, u)[1]
+            while v:
+                u, v = v, u % v
+            return array('I', _int_limbs(u)), None
+        A, B, C, D = _lehmer_cosequence(*_leading_words(x, y))
+        if B == 0:
+            q, r = _divmod_limbs(x, y)
+            x, y = y, r
+            if cofactor:
+                product = _trim(_mul_limbs(q, s1[1]))
+                s0, s1 = s1, _signed_add(s0[0], s0[1], -s1[0], product)
+            continue
+        x, y = _lehmer_step(x, y, A, B, C, D)
+        if cofactor:
+            s0, s1 = _cofactor_step(s0, s1, A, B), _cofactor_step(s0, s1, C, D)
+    return x, s0
 
 def gcd(a, b):
     abs_a = abs_(a)
     abs_b = abs_(b)
-    while not (abs_b['isInf'] or (len(abs_b['blocks']) == 1 and abs_b['blocks'][0] == 0)):
-        temp = abs_b
-        abs_b = modulo(abs_a, abs_b)
-        abs_a = temp
-    return abs_a
+    if abs_b.isInf or abs_b.significand[-1] == 0:
+        return abs_a
+    if abs_a.isInf:
+        raise ValueError("Undefined: ∞ mod finite")
+    if BACKEND == 'int':
+        return _from_int(math.gcd(_to_int(abs_a), _to_int(abs_b)))
+    x, y = abs_a.limbs, abs_b.limbs
+    if _compare_limbs(x, y) < 0:
+        x, y = y, x
+    return _make(1, array('I', _gcd_limbs(x, y)[0]))
+
+def xgcd(a, b):
+    # (g, s, t) with g = gcd(a, b) = s a + t b, from Lehmer's algorithm with the cofactor of
+    # the larger operand carried along; the other cofactor is (g - s x) / y, exactly
+    a = normalize_number(a)
+    b = normalize_number(b)
+    if a.isInf or b.isInf:
+        raise ValueError("Undefined: ∞ mod finite")
+    swapped = _compare_limbs(a.limbs, b.limbs) < 0
+    x, y = (b, a) if swapped else (a, b)
+    if y.significand[-1] == 0:
+        if x.significand[-1] == 0:
+            return _ZERO, _ZERO, _ZERO
+        g, s, t = abs_(x), _make(x.sign, array('I', [1])), _ZERO
+    else:
+        g, (s_sign, s_limbs) = _gcd_limbs(x.limbs, y.limbs, cofactor=True)
+        # t y = g - s x, where |s x| < x y stays within twice the operands' size
+        t_sign, numerator = _signed_add(1, g, -s_sign, _trim(_mul_limbs(s_limbs, x.limbs)))
+        s = _make(s_sign * x.sign, s_limbs)
+        t = _make(t_sign * y.sign, _divmod_limbs(numerator, y.limbs)[0])
+        g = _make(1, array('I', g))
+    return (g, t, s) if swapped else (g, s, t)
 
 def lcm(a, b):
     gcd_val = gcd(a, b)
-    product = multiply(abs_(a), abs_(b))
-    return divide(product, gcd_val)
+    abs_a = abs_(a)
+    abs_b = abs_(b)
+    if abs_a.isInf or abs_b.isInf or gcd_val.isInf or gcd_val.significand[-1] == 0:
+        product = multiply(abs_a, abs_b)
+        return divide(product, gcd_val)
+    # Divide before multiplying: |a| / gcd is exact and keeps the product small
+    return multiply(_make(1, _divmod_limbs(abs_a.limbs, gcd_val.limbs)[0]), abs_b)
 
 def is_valid_number(str_):
     if not isinstance(str_, str):
@@ -760,22 +2347,416 @@ def is_valid_number(str_):
         # Regular decimal notation
         return re.match(r'^\d*\.?\d*$', str_) is not None and str_ != '' and str_ != '.'
 
+def _add_columns(columns, limbs):
+    # Add limbs into a list of uncarried column sums, widening the list as needed
+    n = len(limbs)
+    if n > len(columns):
+        columns.extend([0] * (n - len(columns)))
+    columns[:n] = map(_int_add, columns, limbs)
+
+def _column_terms_cap(width):
+    # Sums of fewer than this many terms, each below B^width, stay below 10^MAX_SUPPORTED_MAGNITUDE
+    digits = MAX_SUPPORTED_MAGNITUDE - LIMB_DIGITS * width
+    return 10 ** digits if digits > 0 else 0
+
+def _settle_columns(positive, negative):
+    return _add_signed(1, _trim(_carry_columns(positive)), -1, _trim(_carry_columns(negative)))
+
 def batch_add(numbers):
-    if not numbers or len(numbers) == 0:
-        return normalize_number({'sign': 1, 'blocks': [0]})
-    result = numbers[0]
-    for i in range(1, len(numbers)):
-        result = add(result, numbers[i])
-        if result['isInf']:
-            return result
-    return result
+    # Sum of any iterable, with the same result as folding add() left to right: a single
+    # element comes back as-is, and the first infinite partial sum is returned immediately.
+    # Limbs go into separate positive and negative column sums that are carried once at the
+    # end. A running bound (terms x widest operand) proves no partial sum can overflow; when
+    # it can't, the columns are settled and that element is added exactly instead.
+    items = iter(() if numbers is None else numbers)
+    for result in items:
+        break
+    else:
+        return _ZERO
+    for second in items:
+        break
+    else:
+        return result
+    result = add(result, second)
+    if result.isInf:
+        return result
+    positive, negative = [0], [0]
+    _add_columns(positive if result.sign > 0 else negative, result.limbs)
+    terms = 1
+    width = len(result.limbs)
+    cap = _column_terms_cap(width)
+    for num in items:
+        if type(num) is int:
+            sign = 1 if num >= 0 else -1
+            limbs = _int_limbs(num * sign)
+        else:
+            num = normalize_number(num)
+            if num.isInf:
+                return num
+            sign = num.sign
+            limbs = num.limbs
+        terms += 1
+        if len(limbs) > width:
+            width = len(limbs)
+            cap = _column_terms_cap(width)
+        if terms >= cap:
+            # The bound no longer rules out overflow: settle the columns into an exact sum
+            result = _settle_columns(positive, negative)
+            if _column_terms_cap(max(len(result.limbs), len(limbs))) <= 2:
+                # Close to the limit: take this step exactly, as the fold would
+                result = _add_signed(result.sign, result.limbs, sign, limbs)
+                if result.isInf:
+                    return result
+                limbs = ()
+            positive, negative = [0], [0]
+            _add_columns(positive if result.sign > 0 else negative, result.limbs)
+            terms = 2
+            width = max(len(result.limbs), len(limbs))
+            cap = _column_terms_cap(width)
+        _add_columns(positive if sign > 0 else negative, limbs)
+    return _settle_columns(positive, negative)
+
+def product_tree(values, combine=None):
+    # Balanced binary reduction of a non-empty sequence: neighbours are combined pairwise,
+    # level by level ((a*b)*(c*d) rather than ((a*b)*c)*d), so operands of similar size meet
+    # and Karatsuba gets balanced inputs. combine defaults to multiply; any associative
+    # binary function works, e.g. _mul_limbs on raw limb arrays.
+    if combine is None:
+        combine = multiply
+    level = list(values)
+    if not level:
+        raise ValueError("product_tree of an empty sequence")
+    while len(level) > 1:
+        paired = [combine(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0]
+
+def _log10_bounds(limbs):
+    # Bounds on log10 of a trimmed non-zero limb array from its top two limbs
+    if len(limbs) == 1:
+        top = limbs[0]
+        exponent = 0
+    else:
+        top = limbs[-1] * LIMB_BASE + limbs[-2]
+        exponent = LIMB_DIGITS * (len(limbs) - 2)
+    return exponent + math_log10(top), exponent + math_log10(top + 1)
+
+def _mul_trimmed(a_limbs, b_limbs):
+    return _trim(_mul_limbs(a_limbs, b_limbs))
 
 def batch_multiply(numbers):
-    if not numbers or len(numbers) == 0:
-        return normalize_number({'sign': 1, 'blocks': [1]})
-    result = numbers[0]
-    for i in range(1, len(numbers)):
-        result = multiply(result, numbers[i])
-        if result['isInf']:
+    # Product of any iterable, with the same result as folding multiply() left to right: a
+    # single element comes back as-is, the first infinite partial product is returned
+    # immediately, and 0 * ∞ raises only if the fold would reach it. Finite factors are only
+    # collected while bounds on log10 of the running product (from each factor's top limb)
+    # prove it fits; the limbs are then multiplied once by product_tree. A product that is
+    # certainly too large returns infinity without being computed, and one that is too close
+    # to call is settled exactly before going on.
+    items = iter(() if numbers is None else numbers)
+    for result in items:
+        break
+    else:
+        return _ONE
+    for second in items:
+        break
+    else:
+        return result
+    result = multiply(result, second)
+    if result.isInf:
+        return result
+    is_zero = result.significand[-1] == 0
+    sign = result.sign
+    # Only significands are collected; the zero limbs of sparse factors add up in `shift`
+    factors = [result.significand]
+    shift = result.shift
+    low, high = (0.0, 0.0) if is_zero else _log10_bounds(result.significand)
+    low += LIMB_DIGITS * shift
+    high += LIMB_DIGITS * shift
+    limit = MAX_SUPPORTED_MAGNITUDE
+    for num in items:
+        if type(num) is int:
+            factor_sign = 1 if num >= 0 else -1
+            limbs = _int_limbs(num * factor_sign)
+            factor_shift = 0
+        else:
+            num = normalize_number(num)
+            factor_sign = num.sign
+            if num.isInf:
+                if is_zero:
+                    raise ValueError("Undefined: 0 * ∞")
+                return POS_INF if sign * factor_sign > 0 else NEG_INF
+            limbs = num.significand
+            factor_shift = num.shift
+        if is_zero or limbs[-1] == 0:
+            is_zero = True
+            continue
+        sign *= factor_sign
+        shift += factor_shift
+        if len(limbs) == 1 and limbs[0] == 1 and not factor_shift:
+            continue
+        factors.append(limbs)
+        factor_low, factor_high = _log10_bounds(limbs)
+        low += factor_low + LIMB_DIGITS * factor_shift
+        high += factor_high + LIMB_DIGITS * factor_shift
+        if high < limit - 1e-6:
+            continue
+        if low > limit + 1e-6:
+            # Every earlier partial product fitted, so the fold would overflow right here
+            return POS_INF if sign > 0 else NEG_INF
+        result = _make(sign, product_tree(factors, _mul_trimmed), shift)
+        if result.isInf:
             return result
-    return result
\ No newline at end of file
+        factors = [result.significand]
+        shift = result.shift
+        low, high = _log10_bounds(result.significand)
+        low += LIMB_DIGITS * shift
+        high += LIMB_DIGITS * shift
+    if is_zero:
+        return _ZERO
+    return _make(sign, product_tree(factors, _mul_trimmed), shift)
+
+def _split_operand(num):
+    # (sign, limbs, isInf) of a BigNum or plain int; ints skip the BigNum conversion
+    if type(num) is int:
+        return (1, _int_limbs(num), False) if num >= 0 else (-1, _int_limbs(-num), False)
+    num = normalize_number(num)
+    return num.sign, num.limbs, num.isInf
+
+def _mul_into_columns(columns, a_limbs, b_limbs, sign):
+    # columns += sign * |a| * |b| without carrying: one row per limb of the shorter operand,
+    # with the Karatsuba product added in instead once both operands are large
+    if len(a_limbs) > len(b_limbs):
+        a_limbs, b_limbs = b_limbs, a_limbs
+    size = len(a_limbs) + len(b_limbs)
+    if size > len(columns):
+        columns.extend([0] * (size - len(columns)))
+    if len(a_limbs) >= KARATSUBA_THRESHOLD:
+        # Int operands arrive as tuples; Karatsuba slices need arrays
+        product = _mul_limbs(array('I', a_limbs), array('I', b_limbs))
+        if sign < 0:
+            product = [-limb for limb in product]
+        _add_columns(columns, product)
+        return
+    n = len(b_limbs)
+    for i in range(len(a_limbs)):
+        a_val = a_limbs[i] * sign
+        if a_val:
+            columns[i:i + n] = map(_int_add, columns[i:i + n], map(a_val.__mul__, b_limbs))
+
+def _carry_any_sign(columns):
+    # One carry pass over column sums of either sign, giving (sign, trimmed limbs). A negative
+    # total leaves a borrow above the top column and the columns holding B^n minus its
+    # magnitude's low part, which is complemented back.
+    carry = 0
+    for k in range(len(columns)):
+        total = columns[k] + carry
+        carry = total // LIMB_BASE
+        columns[k] = total - carry * LIMB_BASE
+    sign = 1
+    if carry < 0:
+        sign = -1
+        carry = -carry
+        low = 0
+        while low < len(columns) and columns[low] == 0:
+            low += 1
+        if low < len(columns):
+            carry -= 1
+            columns[low] = LIMB_BASE - columns[low]
+            for k in range(low + 1, len(columns)):
+                columns[k] = LIMB_BASE - 1 - columns[k]
+    while carry:
+        carry, limb = divmod(carry, LIMB_BASE)
+        columns.append(limb)
+    return sign, _trim(array('I', columns or (0,)))
+
+def dot(xs, ys, acc=None):
+    # acc + Σ xs[i] * ys[i] for two equally long iterables, e.g. balance + Σ rate * count for
+    # one income tick. Every partial product is added straight into one list of uncarried
+    # column sums, which is carried and normalized once at the end, so only the result is
+    # allocated. Infinite operands behave as in multiply() and add(): 0 * ∞ and ∞ + -∞ raise,
+    # otherwise any infinite term makes the result that infinity. Finite terms are summed
+    # exactly, like a fused multiply-add: the result overflows only if the total does, not
+    # when a single product would on its own.
+    columns = [0]
+    inf_sign = 0
+    if acc is not None:
+        acc_sign, acc_limbs, acc_inf = _split_operand(acc)
+        if acc_inf:
+            inf_sign = acc_sign
+        else:
+            _add_columns(columns, acc_limbs if acc_sign > 0 else [-limb for limb in acc_limbs])
+    ys = iter(ys)
+    for x in xs:
+        for y in ys:
+            break
+        else:
+            raise ValueError("dot of sequences with different lengths")
+        x_sign, x_limbs, x_inf = _split_operand(x)
+        y_sign, y_limbs, y_inf = _split_operand(y)
+        if x_inf or y_inf:
+            if (not x_inf and x_limbs[-1] == 0) or (not y_inf and y_limbs[-1] == 0):
+                raise ValueError("Undefined: 0 * ∞")
+            if inf_sign and inf_sign != x_sign * y_sign:
+                raise ValueError("Undefined: ∞ + -∞")
+            inf_sign = x_sign * y_sign
+        elif not inf_sign and x_limbs[-1] != 0 and y_limbs[-1] != 0:
+            _mul_into_columns(columns, x_limbs, y_limbs, x_sign * y_sign)
+    for _ in ys:
+        raise ValueError("dot of sequences with different lengths")
+    if inf_sign:
+        return POS_INF if inf_sign > 0 else NEG_INF
+    return _make(*_carry_any_sign(columns))
+
+def fma(a, b, c):
+    # a * b + c with a single carry pass and normalization; see dot() for infinities
+    a_sign, a_limbs, a_inf = _split_operand(a)
+    b_sign, b_limbs, b_inf = _split_operand(b)
+    c_sign, c_limbs, c_inf = _split_operand(c)
+    if a_inf or b_inf or c_inf:
+        return dot((a,), (b,), c)
+    columns = list(c_limbs) if c_sign > 0 else [-limb for limb in c_limbs]
+    if a_limbs[-1] != 0 and b_limbs[-1] != 0:
+        _mul_into_columns(columns, a_limbs, b_limbs, a_sign * b_sign)
+    return _make(*_carry_any_sign(columns))
+
+def _signed_mul(a_sign, a_limbs, b_sign, b_limbs):
+    # Signed a * b as (sign, trimmed limbs), with no magnitude limit
+    return a_sign * b_sign, _trim(_mul_limbs(a_limbs, b_limbs))
+
+def offline_progress(x0, rate, income, ticks):
+    # x_n after n ticks of x = x * rate + income, i.e. x0 r^n + c (r^n - 1) / (r - 1), in
+    # O(log n) limb operations instead of n multiply/add steps. With K = x0 (r - 1) + c this is
+    # (K r^n - c) / (r - 1), an exact division; K == 0 is the fixed point x_n = x0. Intermediates
+    # use the unbounded limb kernels and only the result is normalized, so it is infinity exactly
+    # when x_n itself is past MAX_SUPPORTED_MAGNITUDE; a lower bound on log10 |x_n| from the top
+    # limbs returns infinity first when r^n alone would be far too large to build.
+    n = normalize_number(ticks)
+    if n.isInf or (n.sign < 0 and n.significand[-1] != 0):
+        raise ValueError("Number of ticks must be a finite non-negative integer")
+    n = int(n)
+    x0, r, c = normalize_number(x0), normalize_number(rate), normalize_number(income)
+    if n == 0:
+        return x0
+    if x0.isInf or r.isInf or c.isInf:
+        # From the first tick on the value is infinite and its sign repeats with period 2,
+        # so replaying up to three ticks gives the same result (or error) as all n
+        result = x0
+        for _ in range(n if n <= 3 else 2 + n % 2):
+            result = add(multiply(result, r), c)
+        return result
+    one = array('I', [1])
+    if r.limbs == one and r.sign > 0:
+        # No growth: x0 + c n
+        return _make(*_signed_add(x0.sign, x0.limbs, c.sign, _trim(_mul_limbs(c.limbs, _int_limbs(n)))))
+    r_minus_one = _signed_add(r.sign, r.limbs, -1, one)
+    k_sign, k_limbs = _signed_add(*_signed_mul(x0.sign, x0.limbs, *r_minus_one), c.sign, c.limbs)
+    if k_limbs[-1] == 0:
+        return x0
+    r_sign = r.sign if n & 1 else 1
+    if len(r.limbs) > 1 or r.limbs[0] > 1:
+        # |x_n| >= (|K| |r|^n - |c|) / |r - 1|; past 10^(MAX + 1) the |c| term can't bring it back
+        steps = min(n, 3 * _MAX_SUPPORTED_BITS)
+        low = _log10_bounds(k_limbs)[0] + steps * _log10_bounds(r.limbs)[0] - _log10_bounds(r_minus_one[1])[1]
+        if low > MAX_SUPPORTED_MAGNITUDE + 1:
+            return POS_INF if k_sign * r_sign * r_minus_one[0] > 0 else NEG_INF
+        power_limbs = _power_limbs(r.limbs, n)
+    else:
+        power_limbs = array('I', [r.limbs[0]])
+    numerator = _signed_add(*_signed_mul(k_sign, k_limbs, r_sign, power_limbs), -c.sign, c.limbs)
+    return _make(numerator[0] * r_minus_one[0], _divmod_limbs(numerator[1], r_minus_one[1])[0])
+
+def _buy_max_fraction(balance, price, rate, owned):
+    # buy_max() for a positive balance and a non-integer rate p/q > 1, in Python ints. The
+    # first k purchases cost price p^owned q (p^k - q^k) / (q^(owned + k) (p - q)), so with
+    # A = price p^owned q and C = balance q^owned (p - q), k is the largest with
+    # A p^k <= (A + C) q^k: estimated from log10, then corrected one step at a time.
+    p, q = rate.numerator, rate.denominator
+    log_rate = math_log10(p) - math_log10(q)
+    # The next price alone can be far past the balance without building p^owned
+    if math_log10(price) + owned * log_rate > math_log10(balance) + 1:
+        return _ZERO, _ZERO
+    a = price * p ** owned * q
+    c = balance * q ** owned * (p - q)
+    count = max(int((math_log10(a + c) - math_log10(a)) / log_rate), 0)
+    p_k, q_k = p ** count, q ** count
+    while count and a * p_k > (a + c) * q_k:
+        count -= 1
+        p_k //= p
+        q_k //= q
+    while a * p_k * p <= (a + c) * q_k * q:
+        count += 1
+        p_k *= p
+        q_k *= q
+    total = a * (p_k - q_k) // (q ** owned * q_k * (p - q))
+    return _from_int(count), _from_int(total)
+
+def buy_max(balance, base_price, rate, owned=0):
+    # The largest k with Σ_{i<k} base * r^(owned + i) <= balance, as (k, total cost of those
+    # k). With F = base * r^owned the cost of k is F (r^k - 1) / (r - 1), so k is the largest
+    # power of r with r^k <= floor(balance (r - 1) / F) + 1: estimated from log10 of the top
+    # limbs, then corrected by exact multiplications or divisions by r (at most one or two).
+    # Prices grow by a factor r >= 1; r == 1 gives k = balance // base. A float or Fraction
+    # rate such as 1.07 is taken as an exact fraction (a float by its shortest decimal form,
+    # so 1.07 is 107/100) and solved by _buy_max_fraction, with the total cost truncated.
+    balance = normalize_number(balance)
+    price = normalize_number(base_price)
+    if isinstance(rate, float):
+        if not math.isfinite(rate):
+            raise ValueError("Price growth rate must be a finite number")
+        rate = Fraction(repr(rate))
+    if isinstance(rate, Fraction):
+        if rate < 1:
+            raise ValueError("Price growth rate must be at least 1")
+        if rate.denominator == 1:
+            rate = rate.numerator
+    r = rate if isinstance(rate, Fraction) else normalize_number(rate)
+    owned = normalize_number(owned)
+    if price.sign < 0 or (not price.isInf and price.significand[-1] == 0):
+        raise ValueError("Price must be positive")
+    if type(r) is BigNum and (r.sign < 0 or (not r.isInf and r.significand[-1] == 0)):
+        raise ValueError("Price growth rate must be at least 1")
+    if owned.isInf or (owned.sign < 0 and owned.significand[-1] != 0):
+        raise ValueError("Owned count must be a finite non-negative integer")
+    owned = int(owned)
+    if balance.sign < 0 or price.isInf or (not balance.isInf and balance.significand[-1] == 0):
+        return _ZERO, _ZERO
+    if balance.isInf:
+        # Every finite total is affordable
+        return POS_INF, POS_INF
+    if type(r) is Fraction:
+        return _buy_max_fraction(_to_int(balance), _to_int(price), r, owned)
+    one = array('I', [1])
+    if r.isInf:
+        # Only a first purchase at the base price is finite
+        if owned == 0 and _compare_limbs(price.limbs, balance.limbs) <= 0:
+            return _ONE, price
+        return _ZERO, _ZERO
+    if r.limbs == one:
+        count = _divmod_limbs(balance.limbs, price.limbs)[0]
+        return _make(1, array('I', count)), _make(1, _trim(_mul_limbs(count, price.limbs)))
+    r_low = _log10_bounds(r.limbs)[0]
+    if owned:
+        # The next purchase alone can be far past the balance without building r^owned
+        if _log10_bounds(price.limbs)[0] + min(owned, 3 * _MAX_SUPPORTED_BITS) * r_low > _log10_bounds(balance.limbs)[1]:
+            return _ZERO, _ZERO
+        first = _trim(_mul_limbs(price.limbs, _power_limbs(r.limbs, owned)))
+    else:
+        first = price.limbs
+    r_minus_one = _trim(_sub_limbs(r.limbs, one))
+    bound = _add_limbs(_divmod_limbs(_trim(_mul_limbs(balance.limbs, r_minus_one)), first)[0], one)
+    # The lower bounds are log10 of the top two limbs, within a rounding error for small r
+    count = int(_log10_bounds(bound)[0] / r_low)
+    power_k = _power_limbs(r.limbs, count) if count else one
+    while _compare_limbs(power_k, bound) > 0:
+        count -= 1
+        power_k = _divmod_limbs(power_k, r.limbs)[0]
+    while True:
+        next_power = _trim(_mul_limbs(power_k, r.limbs))
+        if _compare_limbs(next_power, bound) > 0:
+            break
+        count += 1
+        power_k = next_power
+    total = _divmod_limbs(_trim(_mul_limbs(first, _trim(_sub_limbs(power_k, one)))), r_minus_one)[0]
+    return _from_int(count), _make(1, total)
@@ -0,0 +1,163 @@
+from bisect import bisect_left, insort
+from operator import itemgetter
+
+from BNHaNa import normalize_number, to_sort_key
+
+# Target bucket size: buckets split at twice this and merge below half of it
+LEADERBOARD_LOAD = 1000
+
+class Leaderboard:
+    # Players ranked by BigNum score, highest first, in the order compare() gives (POS_INF on
+    # top, NEG_INF at the bottom); equal scores rank by who reached them first. Entries are
+    # (to_sort_key(score), -seq, player, score) tuples in ascending order, kept in a list of
+    # sorted buckets: a bisect over the bucket maxima finds the bucket, a bisect inside it
+    # the slot, so an update costs two O(log n) searches plus one list insert of at most
+    # 2 * LEADERBOARD_LOAD entries. A Fenwick tree over the bucket sizes turns a position
+    # inside a bucket into a rank in O(log n). Bucket splits and merges rebuild the tree,
+    # which amortizes to O(1) per update.
+    __slots__ = ('_buckets', '_maxes', '_tree', '_entries', '_seq', '_load')
+
+    def __init__(self, scores=(), load=LEADERBOARD_LOAD):
+        # Bulk load from a mapping or (player, score) pairs, sorted up front instead of
+        # inserted one by one; a player listed twice keeps the later score, and ties rank in
+        # input order
+        if hasattr(scores, 'items'):
+            scores = scores.items()
+        self._load = load
+        entries = {}
+        seq = 0
+        for player, score in scores:
+            score = normalize_number(score)
+            seq += 1
+            entries[player] = (to_sort_key(score), -seq, player, score)
+        self._entries = entries
+        self._seq = seq
+        # Same order as sorting the tuples, but each pass compares a single field: by -seq
+        # (already one descending run unless a player repeats), then stably by key
+        entries = sorted(sorted(entries.values(), key=itemgetter(1)), key=itemgetter(0))
+        self._buckets = [entries[i:i + load] for i in range(0, len(entries), load)]
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        self._rebuild()
+
+    def _rebuild(self):
+        # Fenwick tree over the bucket sizes, built in O(number of buckets)
+        tree = [0] + [len(bucket) for bucket in self._buckets]
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _resize(self, i, delta):
+        tree = self._tree
+        i += 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def _before(self, i):
+        # Entries in the buckets before bucket i
+        tree = self._tree
+        total = 0
+        while i:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def _insert(self, entry):
+        buckets, maxes = self._buckets, self._maxes
+        if not buckets:
+            buckets.append([entry])
+            maxes.append(entry)
+            self._rebuild()
+            return
+        i = min(bisect_left(maxes, entry), len(maxes) - 1)
+        bucket = buckets[i]
+        insort(bucket, entry)
+        maxes[i] = bucket[-1]
+        if len(bucket) > 2 * self._load:
+            buckets[i:i + 1] = [bucket[:self._load], bucket[self._load:]]
+            maxes[i:i + 1] = [buckets[i][-1], buckets[i + 1][-1]]
+            self._rebuild()
+        else:
+            self._resize(i, 1)
+
+    def _delete(self, entry):
+        buckets, maxes = self._buckets, self._maxes
+        i = bisect_left(maxes, entry)
+        bucket = buckets[i]
+        del bucket[bisect_left(bucket, entry)]
+        if len(bucket) >= self._load // 2 or len(buckets) == 1:
+            if bucket:
+                maxes[i] = bucket[-1]
+                self._resize(i, -1)
+            else:
+                del buckets[i], maxes[i]
+                self._rebuild()
+            return
+        # Merge a small bucket into its neighbour, splitting again if that grows too large
+        j = i - 1 if i == len(buckets) - 1 else i
+        merged = buckets[j] + buckets[j + 1]
+        if len(merged) > 2 * self._load:
+            half = len(merged) // 2
+            buckets[j:j + 2] = [merged[:half], merged[half:]]
+            maxes[j:j + 2] = [merged[half - 1], merged[-1]]
+        else:
+            buckets[j:j + 2] = [merged]
+            maxes[j:j + 2] = [merged[-1]]
+        self._rebuild()
+
+    def insert(self, player, score):
+        if player in self._entries:
+            raise ValueError("Player is already on the leaderboard")
+        self.update(player, score)
+
+    def update(self, player, score):
+        # Set a player's score, adding the player if needed; a changed score ranks behind
+        # players who already hold the same score
+        old = self._entries.get(player)
+        score = normalize_number(score)
+        key = to_sort_key(score)
+        if old is not None:
+            if old[0] == key:
+                return
+            self._delete(old)
+        self._seq += 1
+        entry = (key, -self._seq, player, score)
+        self._entries[player] = entry
+        self._insert(entry)
+
+    def remove(self, player):
+        self._delete(self._entries.pop(player))
+
+    def score(self, player):
+        return self._entries[player][3]
+
+    def rank(self, player):
+        # 1 for the top player
+        entry = self._entries[player]
+        i = bisect_left(self._maxes, entry)
+        below = self._before(i) + bisect_left(self._buckets[i], entry)
+        return len(self._entries) - below
+
+    def top(self, k):
+        # The k highest (player, score) pairs, best first
+        result = []
+        for bucket in reversed(self._buckets):
+            for entry in reversed(bucket):
+                if len(result) == k:
+                    return result
+                result.append((entry[2], entry[3]))
+        return result
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, player):
+        return player in self._entries
+
+    def __iter__(self):
+        # (player, score) pairs, best first
+        for bucket in reversed(self._buckets):
+            for entry in reversed(bucket):
+                yield entry[2], entry[3]
@@ -0,0 +1,613 @@
+import bisect
+import functools
+import math
+import random
+import sys
+import timeit
+import tracemalloc
+from array import array
+
+import ArrayModule
+import BNHaNa
+from LeaderboardModule import Leaderboard
+from BNHaNa import (
+    string_to_number,
+    to_decimal_string,
+    add,
+    subtract,
+    multiply,
+    divide,
+    power,
+    compare,
+    gcd,
+    xgcd,
+    Divisor,
+    factorial,
+    binomial,
+    sqrt,
+    iroot,
+    Accumulator,
+    batch_add,
+    batch_multiply,
+    modulo,
+    pow_mod,
+    dot,
+    fma,
+    offline_progress,
+    buy_max,
+    is_greater,
+    BigNum,
+    get_short,
+    sort_numbers,
+    argsort_numbers,
+    to_sort_key,
+    from_sort_key,
+    ApproxNum,
+    to_approx,
+    format_number,
+)
+
+# Micro-benchmarks for the BNHaNA Python port.
+# Usage: python benchmark.py [section ...]   (no arguments runs every section)
+
+REPEAT = 5
+
+def bench(label, fn, number, repeat=REPEAT):
+    # Best-of-repeat wall time per call, in microseconds
+    per_op = min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+    print(f"  {label:<44} {per_op * 1e6:12.2f} µs/op")
+    return per_op
+
+def transient_bytes(fn, number=1000):
+    # Mean peak traced memory above the starting level during one call, in bytes
+    fn()
+    tracemalloc.start()
+    total = 0
+    for _ in range(number):
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        fn()
+        total += tracemalloc.get_traced_memory()[1] - start
+    tracemalloc.stop()
+    return total / number
+
+def random_digits(rng, digits):
+    return str(rng.randint(1, 9)) + ''.join(str(rng.randint(0, 9)) for _ in range(digits - 1))
+
+def random_limbs(rng, count):
+    # Raw limb array (may exceed MAX_SUPPORTED_MAGNITUDE; for kernel benchmarks only)
+    return array('I', [rng.randrange(BNHaNa.LIMB_BASE) for _ in range(count - 1)] + [rng.randrange(1, BNHaNa.LIMB_BASE)])
+
+# The dict representation BigNum replaced ({'sign', 'blocks', 'magnitude', 'isInf'} with
+# base-1000 blocks), copied from the original add/subtract/multiply/compare so the
+# representation section measures both side by side. Finite operands only.
+
+def _legacy_normalize(num):
+    blocks = list(num.get('blocks', []))
+    while len(blocks) > 1 and blocks[-1] == 0:
+        blocks.pop()
+    magnitude = num.get('magnitude')
+    if magnitude is None:
+        top = next((i for i in range(len(blocks) - 1, -1, -1) if blocks[i] != 0), None)
+        magnitude = 1 if top is None else top * 3 + math.floor(math.log10(math.fabs(blocks[top]))) + 1
+    return {'sign': num.get('sign', 1), 'blocks': blocks, 'magnitude': magnitude, 'isInf': False}
+
+def _legacy_number(digits):
+    padded = digits[::-1] + '0' * ((3 - len(digits) % 3) % 3)
+    return _legacy_normalize({'sign': 1, 'blocks': [int(padded[i:i + 3][::-1]) for i in range(0, len(padded), 3)]})
+
+def _legacy_compare(a, b):
+    if a['sign'] != b['sign']:
+        return 1 if a['sign'] > b['sign'] else -1
+    if a['magnitude'] != b['magnitude']:
+        return (1 if a['magnitude'] > b['magnitude'] else -1) * a['sign']
+    len_a, len_b = len(a['blocks']), len(b['blocks'])
+    if len_a != len_b:
+        return (1 if len_a > len_b else -1) * a['sign']
+    for i in range(len_a - 1, -1, -1):
+        if a['blocks'][i] != b['blocks'][i]:
+            return (1 if a['blocks'][i] > b['blocks'][i] else -1) * a['sign']
+    return 0
+
+def _legacy_add(a, b):
+    a = _legacy_normalize(a)
+    b = _legacy_normalize(b)
+    if a['sign'] != b['sign']:
+        return _legacy_subtract(a, {'sign': -b['sign'], 'blocks': list(b['blocks']), 'isInf': False})
+    result = []
+    carry = 0
+    for i in range(max(len(a['blocks']), len(b['blocks']))):
+        sum_ = (a['blocks'][i] if i < len(a['blocks']) else 0) + (b['blocks'][i] if i < len(b['blocks']) else 0) + carry
+        carry = math.floor(sum_ / 1000)
+        result.append(sum_ % 1000)
+    if carry > 0:
+        result.append(carry)
+    return _legacy_normalize({'sign': a['sign'], 'blocks': result})
+
+def _legacy_subtract(a, b):
+    a = _legacy_normalize(a)
+    b = _legacy_normalize(b)
+    if a['sign'] != b['sign']:
+        return _legacy_add(a, {'sign': -b['sign'], 'blocks': list(b['blocks']), 'isInf': False})
+    abs_a = {'sign': 1, 'blocks': a['blocks'], 'magnitude': a['magnitude'], 'isInf': False}
+    abs_b = {'sign': 1, 'blocks': b['blocks'], 'magnitude': b['magnitude'], 'isInf': False}
+    if _legacy_compare(abs_a, abs_b) < 0:
+        result = _legacy_subtract(b, a)
+        result['sign'] = -result['sign']
+        return result
+    result = []
+    borrow = 0
+    for i in range(len(a['blocks'])):
+        diff = a['blocks'][i] - (b['blocks'][i] if i < len(b['blocks']) else 0) - borrow
+        borrow = 1 if diff < 0 else 0
+        result.append(diff + 1000 * borrow)
+    return _legacy_normalize({'sign': a['sign'], 'blocks': result})
+
+def _legacy_multiply(a, b):
+    result = [0] * (len(a['blocks']) + len(b['blocks']))
+    for i in range(len(a['blocks'])):
+        for j in range(len(b['blocks'])):
+            result[i + j] += a['blocks'][i] * b['blocks'][j]
+    carry = 0
+    for k in range(len(result)):
+        total = result[k] + carry
+        result[k] = total % 1000
+        carry = math.floor(total / 1000)
+    while carry > 0:
+        result.append(carry % 1000)
+        carry = math.floor(carry / 1000)
+    return _legacy_normalize({'sign': a['sign'] * b['sign'], 'blocks': result})
+
+def held_bytes(make, values):
+    # Mean traced memory per object kept alive by make(value) over `values`
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = [make(value) for value in values]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(held)
+
+def bench_representation():
+    print("\n== Number representation: legacy dicts vs BigNum, per-op latency and per-object memory ==")
+    rng = random.Random(1)
+    for digits in (12, 300):
+        a_digits, b_digits = random_digits(rng, digits), random_digits(rng, digits)
+        a, b = string_to_number(a_digits), string_to_number(b_digits)
+        old_a, old_b = _legacy_number(a_digits), _legacy_number(b_digits)
+        n = 20000 if digits < 100 else 2000
+        for op, legacy, fn, number in (("add", _legacy_add, add, n), ("subtract", _legacy_subtract, subtract, n),
+                                       ("multiply", _legacy_multiply, multiply, n // 10), ("compare", _legacy_compare, compare, n)):
+            print(f" {op}, {digits}-digit operands")
+            slow = bench("dict", lambda: legacy(old_a, old_b), number)
+            fast = bench("BigNum", lambda: fn(a, b), number)
+            print(f"  {'':<44} {slow / fast:12.2f}x")
+    # Memory held by a population of player balances
+    balances = [random_digits(rng, rng.randint(4, 30)) for _ in range(100000)]
+    print(" memory per balance (4-30 digits)")
+    for label, make in (("dict", _legacy_number), ("BigNum", string_to_number)):
+        print(f"  {label:<44} {held_bytes(make, balances):12.1f} bytes")
+
+def bench_limbs():
+    print("\n== Limb arithmetic: results of 100, 1000 and 3003 digits ==")
+    rng = random.Random(2)
+    for digits in (100, 1000, 3003):
+        half_a = string_to_number(random_digits(rng, digits // 2))
+        half_b = string_to_number(random_digits(rng, digits - digits // 2))
+        full = string_to_number(random_digits(rng, digits))
+        base_ = string_to_number("1234567")
+        exponent = string_to_number(str(digits // 7))
+        number = max(1, 20000 // (digits * 4))
+        print(f" {digits} digits")
+        bench(f"multiply {digits // 2} x {digits - digits // 2} digits", lambda: multiply(half_a, half_b), number, 3)
+        bench(f"divide {digits} / {digits // 2} digits", lambda: divide(full, half_a), 1, 1)
+        bench(f"power 1234567 ^ {digits // 7}", lambda: power(base_, exponent), number, 3)
+
+def bench_karatsuba():
+    print("\n== Karatsuba crossover: one Karatsuba level vs schoolbook, per operand size ==")
+    rng = random.Random(3)
+    saved = BNHaNa.KARATSUBA_THRESHOLD
+    try:
+        for limbs in (16, 24, 32, 48, 64, 80, 96, 128, 167, 256, 334):
+            a = random_limbs(rng, limbs)
+            b = random_limbs(rng, limbs)
+            number = max(2, 200000 // (limbs * limbs))
+            BNHaNa.KARATSUBA_THRESHOLD = 10 ** 9
+            school = min(timeit.repeat(lambda: BNHaNa._mul_limbs(a, b), number=number, repeat=3)) / number
+            school_sq = min(timeit.repeat(lambda: BNHaNa._square_limbs(a), number=number, repeat=5)) / number
+            BNHaNa.KARATSUBA_THRESHOLD = limbs
+            kara = min(timeit.repeat(lambda: BNHaNa._mul_limbs(a, b), number=number, repeat=5)) / number
+            kara_sq = min(timeit.repeat(lambda: BNHaNa._square_limbs(a), number=number, repeat=5)) / number
+            print(f"  {limbs:4d} limbs  multiply {school * 1e6:9.1f} -> {kara * 1e6:9.1f} µs ({school / kara:4.2f}x)"
+                  f"   square {school_sq * 1e6:9.1f} -> {kara_sq * 1e6:9.1f} µs ({school_sq / kara_sq:4.2f}x)")
+    finally:
+        BNHaNa.KARATSUBA_THRESHOLD = saved
+
+def _euclid_gcd(a, b):
+    # gcd as it was before divmod_: Euclid with each remainder rebuilt from divide,
+    # multiply and subtract, the way modulo() used to compute it
+    a, b = abs(a), abs(b)
+    while b:
+        a, b = b, subtract(a, multiply(divide(a, b), b))
+    return a
+
+def bench_gcd():
+    print("\n== gcd and xgcd (Lehmer) ==")
+    rng = random.Random(4)
+    common = string_to_number(random_digits(rng, 200))
+    a = multiply(common, string_to_number(random_digits(rng, 800)))
+    b = multiply(common, string_to_number(random_digits(rng, 800)))
+    print(" 1000 x 1000 digits, 200-digit common factor")
+    slow = bench("Euclid on divide/multiply/subtract", lambda: _euclid_gcd(a, b), 1, 3)
+    fast = bench("gcd", lambda: gcd(a, b), 1, 3)
+    print(f"  {'':<44} {slow / fast:12.2f}x")
+    int_a, int_b = BNHaNa._to_int(a), BNHaNa._to_int(b)
+    bench("math.gcd on Python ints (reference)", lambda: math.gcd(int_a, int_b), 1, 3)
+    # Random pairs are almost always coprime: the full remainder sequence runs
+    for digits in (500, 1500, 3003):
+        a = string_to_number(random_digits(rng, digits))
+        b = string_to_number(random_digits(rng, digits))
+        bench(f"gcd  {digits} x {digits} digits", lambda: gcd(a, b), 1, 3)
+        bench(f"xgcd {digits} x {digits} digits", lambda: xgcd(a, b), 1, 3)
+    # LEHMER_WINDOW sweep on the largest pair
+    saved = BNHaNa.LEHMER_WINDOW
+    try:
+        for window in (1, 2, 4, 8, 12):
+            BNHaNa.LEHMER_WINDOW = window
+            bench(f"gcd 3003 digits, LEHMER_WINDOW={window}", lambda: gcd(a, b), 1, 3)
+    finally:
+        BNHaNa.LEHMER_WINDOW = saved
+
+def bench_divisor():
+    print("\n== Repeated division by one value: divide() vs a precomputed Divisor ==")
+    rng = random.Random(5)
+    for dividend_digits, divisor_digits in ((30, 6), (300, 40), (3003, 100), (3003, 301), (3003, 1500)):
+        a = string_to_number(random_digits(rng, dividend_digits))
+        b = string_to_number(random_digits(rng, divisor_digits))
+        d = Divisor(b)
+        number = max(1, 200000 // (dividend_digits * 10))
+        label = f"{dividend_digits} / {divisor_digits} digits"
+        plain = bench(f"divide   {label}", lambda: divide(a, b), number, 3)
+        reused = bench(f"Divisor  {label}", lambda: d.div(a), number, 3)
+        print(f"  {'':<44} {plain / reused:12.2f}x")
+
+def bench_scalar():
+    print("\n== Machine-sized int operands ==")
+    rng = random.Random(6)
+    for digits in (20, 1000):
+        a = string_to_number(random_digits(rng, digits))
+        one = string_to_number("1")
+        price = string_to_number("12345")
+        number = 20000 if digits < 100 else 2000
+        print(f" {digits}-digit operand")
+        bench("add(a, BigNum 1)", lambda: add(a, one), number)
+        bench("add(a, 1)", lambda: add(a, 1), number)
+        bench("multiply(a, BigNum 12345)", lambda: multiply(a, price), number)
+        bench("multiply(a, 12345)", lambda: multiply(a, 12345), number)
+        bench("divide(a, BigNum 12345)", lambda: divide(a, price), number)
+        bench("divide(a, 12345)", lambda: divide(a, 12345), number)
+    n = string_to_number("1000")
+    bench("factorial(1000)", lambda: factorial(n), 3, 3)
+    bench("binomial(3000, 1500)", lambda: binomial(3000, 1500), 3, 3)
+    root = string_to_number(random_digits(rng, 200))
+    bench("sqrt(200 digits)", lambda: sqrt(root), 3, 3)
+    big_root = string_to_number(random_digits(rng, 3000))
+    bench("sqrt(3000 digits)", lambda: sqrt(big_root), 3, 3)
+    bench("iroot(3000 digits, 3)", lambda: iroot(big_root, 3), 3, 3)
+
+def bench_accumulator():
+    print("\n== Tick loop: balance = add(balance, income) vs Accumulator.iadd ==")
+    rng = random.Random(7)
+    for digits in (30, 1000):
+        balance = string_to_number(random_digits(rng, digits))
+        income = string_to_number("98765")
+        state = [balance]
+        acc = Accumulator(balance)
+
+        def fold():
+            state[0] = add(state[0], income)
+
+        print(f" {digits}-digit balance")
+        for label, fn in (("add(balance, income)", fold),
+                          ("acc.iadd(income)", lambda: acc.iadd(income)),
+                          ("acc.iadd(98765)", lambda: acc.iadd(98765))):
+            bench(label, fn, 20000)
+            print(f"  {'  transient allocation':<44} {transient_bytes(fn):12.1f} bytes/op")
+
+def bench_batch():
+    print("\n== Summing many values: fold of add() vs carry-save batch_add ==")
+    rng = random.Random(8)
+
+    def fold(numbers):
+        result = numbers[0]
+        for num in numbers[1:]:
+            result = add(result, num)
+        return result
+
+    for count, digits in ((10000, 20), (1000, 300), (100, 3000)):
+        values = [string_to_number(("-" if rng.random() < 0.3 else "") + random_digits(rng, rng.randint(1, digits)))
+                  for _ in range(count)]
+        print(f" {count} values of up to {digits} digits, mixed signs")
+        plain = bench("fold of add()", lambda: fold(values), 1, 3)
+        batched = bench("batch_add", lambda: batch_add(values), 1, 3)
+        print(f"  {'':<44} {plain / batched:12.2f}x")
+
+    print("\n== Multiplying many values: fold of multiply() vs product-tree batch_multiply ==")
+
+    def fold_product(numbers):
+        result = numbers[0]
+        for num in numbers[1:]:
+            result = multiply(result, num)
+        return result
+
+    for count, digits in ((1000, 3), (500, 6), (60, 50), (8, 375)):
+        values = [string_to_number(random_digits(rng, digits)) for _ in range(count)]
+        print(f" {count} factors of {digits} digits")
+        plain = bench("fold of multiply()", lambda: fold_product(values), 1, 3)
+        batched = bench("batch_multiply", lambda: batch_multiply(values), 1, 3)
+        print(f"  {'':<44} {plain / batched:12.2f}x")
+
+def bench_pow_mod():
+    print("\n== Modular power: square-and-multiply with modulo() vs pow_mod ==")
+    rng = random.Random(9)
+
+    def naive(b, e, m):
+        result = string_to_number("1")
+        for bit in bin(e)[2:]:
+            result = modulo(multiply(result, result), m)
+            if bit == '1':
+                result = modulo(multiply(result, b), m)
+        return result
+
+    for digits in (30, 100, 300):
+        m = string_to_number(random_digits(rng, digits))
+        b = string_to_number(random_digits(rng, digits - 1))
+        e = int(random_digits(rng, digits))
+        print(f" {digits}-digit modulus and exponent")
+        plain = bench("multiply + modulo per step", lambda: naive(b, e, m), 1, 3)
+        fast = bench("pow_mod", lambda: pow_mod(b, e, m), 1, 3)
+        print(f"  {'':<44} {plain / fast:12.2f}x")
+
+def bench_dot():
+    print("\n== Income tick: balance + Σ rate * count, multiply/add per producer vs dot ==")
+    rng = random.Random(10)
+    for producers, digits in ((1, 30), (20, 30), (200, 30), (20, 300), (20, 1500)):
+        balance = string_to_number(random_digits(rng, digits))
+        rates = [string_to_number(random_digits(rng, rng.randint(1, digits))) for _ in range(producers)]
+        counts = [rng.randint(1, 10 ** 6) for _ in range(producers)]
+
+        def fold():
+            result = balance
+            for rate, count in zip(rates, counts):
+                result = add(result, multiply(rate, count))
+            return result
+
+        print(f" {producers} producers, rates and balance of up to {digits} digits")
+        plain = bench("add(balance, multiply(rate, count)) each", fold, max(1, 20000 // (producers * digits)), 3)
+        if producers == 1:
+            fused = bench("fma(rate, count, balance)", lambda: fma(rates[0], counts[0], balance), 20000 // digits, 3)
+        else:
+            fused = bench("dot(rates, counts, balance)", lambda: dot(rates, counts, balance), max(1, 20000 // (producers * digits)), 3)
+        print(f"  {'':<44} {plain / fused:12.2f}x")
+
+def bench_offline():
+    print("\n== Offline progress: replaying n ticks of x = x * r + c vs offline_progress ==")
+    rng = random.Random(11)
+    balance = string_to_number(random_digits(rng, 30))
+    income = string_to_number(random_digits(rng, 12))
+    for rate, ticks in ((1, 1000), (1, 100000), (2, 1000), (2, 9000), (-3, 6000), (1000003, 400)):
+        print(f" rate {rate}, {ticks} ticks")
+
+        def replay():
+            result = balance
+            for _ in range(ticks):
+                result = add(multiply(result, rate), income)
+            return result
+
+        plain = bench("multiply + add per tick", replay, 1, 3)
+        closed = bench("offline_progress", lambda: offline_progress(balance, rate, income, ticks), 10, 3)
+        print(f"  {'':<44} {plain / closed:12.2f}x")
+    for rate, ticks in ((1, 10 ** 12), (2, 10 ** 12)):
+        bench(f"offline_progress rate {rate}, {ticks:.0e} ticks", lambda: offline_progress(balance, rate, income, ticks), 1000, 3)
+
+def bench_buy_max():
+    print("\n== Buy max: add/multiply/is_greater per purchase vs buy_max ==")
+    rng = random.Random(12)
+    for balance_digits, base_price, rate, owned in ((30, 10, 2, 0), (300, 10, 2, 50), (3000, 10, 2, 0), (3000, 7, 17, 10), (6, 3, 1, 0)):
+        balance = string_to_number(random_digits(rng, balance_digits))
+        price = string_to_number(str(base_price))
+
+        def by_steps():
+            count, total = 0, string_to_number("0")
+            cost = multiply(price, power(rate, owned)) if owned else price
+            while True:
+                next_total = add(total, cost)
+                if is_greater(next_total, balance):
+                    return count, total
+                count, total, cost = count + 1, next_total, multiply(cost, rate)
+
+        print(f" {balance_digits}-digit balance, price {base_price} * {rate}^i, {owned} owned ({to_decimal_string(buy_max(balance, price, rate, owned)[0])} affordable)")
+        plain = bench("one purchase at a time", by_steps, 1, 3)
+        solved = bench("buy_max", lambda: buy_max(balance, price, rate, owned), 10, 3)
+        print(f"  {'':<44} {plain / solved:12.2f}x")
+    print(" fractional rates (exact fractions in Python ints)")
+    for balance_digits, rate in ((300, 1.15), (300, 1.07), (3000, 1.15), (3000, 1.07)):
+        balance = string_to_number(random_digits(rng, balance_digits))
+        bench(f"buy_max {balance_digits} digits, price 10 * {rate}^i", lambda: buy_max(balance, 10, rate), 5, 3)
+
+def bench_sparse():
+    print("\n== Round numbers: sparse (significand + shift) vs the same values stored densely ==")
+
+    def dense(num):
+        return BigNum(num.sign, num.limbs, num.magnitude)
+
+    bench("string_to_number('1e3000')", lambda: string_to_number("1e3000"), 2000)
+    bench("string_to_number('1' + '0' * 3000)", lambda: string_to_number("1" + "0" * 3000), 2000)
+    pairs = (("1e3000", "2e2999", "add"), ("1.5e1500", "2.25e1500", "multiply"),
+             ("3e2000", "3e2000", "compare"), ("7e2500", "12345", "multiply"), ("1e3000", "1", "add"))
+    for a_str, b_str, op in pairs:
+        a, b = string_to_number(a_str), string_to_number(b_str)
+        fn = {'add': add, 'multiply': multiply, 'compare': compare}[op]
+        da, db = dense(a), dense(b)
+        print(f" {op}({a_str}, {b_str})")
+        plain = bench("dense", lambda: fn(da, db), 2000)
+        sparse = bench("sparse", lambda: fn(a, b), 2000)
+        print(f"  {'':<44} {plain / sparse:12.2f}x")
+
+def bench_approx():
+    print("\n== ApproxNum (float mantissa, int exponent) vs exact BigNum ==")
+    rng = random.Random(20)
+    for digits in (30, 300, 2000):
+        a = string_to_number(str(rng.randint(10 ** (digits - 1), 10 ** digits - 1)))
+        b = string_to_number(str(rng.randint(10 ** (digits // 2 - 1), 10 ** (digits // 2) - 1)))
+        xa, xb = to_approx(a), to_approx(b)
+        for op, exact, approx in (("add", add, ApproxNum.add), ("multiply", multiply, ApproxNum.mul),
+                                  ("divide", divide, ApproxNum.div), ("compare", compare, ApproxNum.compare)):
+            print(f" {op}, {digits} x {digits // 2} digits")
+            slow = bench("BigNum", lambda: exact(a, b), 200)
+            fast = bench("ApproxNum", lambda: approx(xa, xb), 20000)
+            print(f"  {'':<44} {slow / fast:12.2f}x")
+    huge = ApproxNum(1.5, 10 ** 6)
+    print(" past 10^3003 (BigNum would saturate to infinity)")
+    bench("ApproxNum mul at 1e1000000", lambda: huge * huge, 20000)
+    bench("ApproxNum ** 1000", lambda: huge ** 1000, 20000)
+    bench("format_number(ApproxNum)", lambda: format_number(huge, 2), 20000)
+    sample = string_to_number("7" * 3000)
+    bench("to_approx(3000-digit BigNum)", lambda: to_approx(sample), 20000)
+
+def bench_backend():
+    print("\n== Backend: limb kernels vs native Python ints (BACKEND = 'int') ==")
+    rng = random.Random(21)
+    saved = BNHaNa.BACKEND
+    try:
+        for digits in (30, 300, 1500):
+            a = string_to_number(str(rng.randint(10 ** (digits - 1), 10 ** digits - 1)))
+            b = string_to_number(str(rng.randint(10 ** (digits // 2 - 1), 10 ** (digits // 2) - 1)))
+            square = multiply(a, a)
+            for label, fn in (("multiply", lambda: multiply(a, b)),
+                              ("divide", lambda: divide(square, b)), ("power(a, 2)", lambda: power(a, 2)),
+                              ("sqrt", lambda: sqrt(square)), ("gcd", lambda: gcd(a, b))):
+                print(f" {label}, {digits} digits")
+                timings = []
+                for backend in ('limbs', 'int'):
+                    BNHaNa.BACKEND = backend
+                    timings.append(bench(backend, fn, 20))
+                print(f"  {'':<44} {timings[0] / timings[1]:12.2f}x")
+        print(" factorial(1000)")
+        timings = []
+        for backend in ('limbs', 'int'):
+            BNHaNa.BACKEND = backend
+            timings.append(bench(backend, lambda: factorial(1000), 20))
+        print(f"  {'':<44} {timings[0] / timings[1]:12.2f}x")
+    finally:
+        BNHaNa.BACKEND = saved
+
+def bench_array():
+    print("\n== BigNumArray: one vectorized call vs a Python loop over 100,000 balances ==")
+    if ArrayModule.np is None:
+        print(" skipped: NumPy is not installed")
+        return
+    rng = random.Random(22)
+    count = 100000
+    xs = [string_to_number(str(rng.randint(1, 10 ** rng.randint(20, 60)))) for _ in range(count)]
+    ys = [string_to_number(str(rng.randint(1, 10 ** rng.randint(20, 60)))) for _ in range(count)]
+    bench("BigNumArray(list) x2", lambda: (ArrayModule.BigNumArray(xs), ArrayModule.BigNumArray(ys)), 1, 3)
+    a, b = ArrayModule.BigNumArray(xs), ArrayModule.BigNumArray(ys)
+    factor = 12345678901234567890
+    for label, vectorized, loop in (
+            ("add", lambda: a.add(b), lambda: [add(x, y) for x, y in zip(xs, ys)]),
+            ("subtract", lambda: a.subtract(b), lambda: [subtract(x, y) for x, y in zip(xs, ys)]),
+            ("multiply by a 20-digit scalar", lambda: a.multiply(factor), lambda: [multiply(x, factor) for x in xs]),
+            ("compare", lambda: a.compare(b), lambda: [compare(x, y) for x, y in zip(xs, ys)]),
+            ("get_short", lambda: a.get_short(), lambda: [get_short(x) for x in xs])):
+        print(f" {label}")
+        slow = bench("loop", loop, 1, 3)
+        fast = bench("BigNumArray", vectorized, 1, 3)
+        print(f"  {'':<44} {slow / fast:12.2f}x")
+    bench("to_list()", lambda: a.to_list(), 1, 3)
+
+def bench_sort():
+    print("\n== Sorting a leaderboard: cmp_to_key(compare) vs sort_numbers vs BigNumArray.argsort ==")
+    rng = random.Random(23)
+    for count in (10000, 100000):
+        values = [string_to_number(str(rng.randint(1, 10 ** rng.randint(20, 60)))) for _ in range(count)]
+        print(f" {count} balances of 20-60 digits")
+        slow = bench("sorted(key=cmp_to_key(compare))", lambda: sorted(values, key=functools.cmp_to_key(compare)), 1, 3)
+        fast = bench("sort_numbers", lambda: sort_numbers(values), 1, 3)
+        print(f"  {'':<44} {slow / fast:12.2f}x")
+        bench("argsort_numbers", lambda: argsort_numbers(values), 1, 3)
+        if ArrayModule.np is not None:
+            table = ArrayModule.BigNumArray(values)
+            fast = bench("BigNumArray.argsort", lambda: table.argsort(), 1, 3)
+            print(f"  {'':<44} {slow / fast:12.2f}x")
+    if ArrayModule.np is not None:
+        count = 1000000
+        table = ArrayModule.BigNumArray([string_to_number(str(rng.randint(1, 10 ** rng.randint(20, 60)))) for _ in range(count)])
+        bench(f"BigNumArray.argsort, {count} rows", lambda: table.argsort(), 1, 3)
+        tied = ArrayModule.BigNumArray([string_to_number(f"{rng.randint(0, 9999)}e40") for _ in range(count)])
+        bench("  same, only 10^4 distinct values", lambda: tied.argsort(), 1, 3)
+
+def bench_sort_key():
+    print("\n== Order-preserving byte keys ==")
+    rng = random.Random(24)
+    for label, value in (("40 digits", string_to_number(str(rng.randint(10 ** 39, 10 ** 40)))),
+                         ("-40 digits", string_to_number(str(-rng.randint(10 ** 39, 10 ** 40)))),
+                         ("3000 digits", string_to_number(str(rng.randint(10 ** 2999, 10 ** 3000)))),
+                         ("1.5e3000 (sparse)", string_to_number("1.5e3000"))):
+        key = to_sort_key(value)
+        print(f" {label}: {len(key)} bytes")
+        bench("to_sort_key", lambda: to_sort_key(value), 20000)
+        bench("from_sort_key", lambda: from_sort_key(key), 20000)
+    count = 100000
+    values = [string_to_number(str(rng.choice((1, -1)) * rng.randint(1, 10 ** rng.randint(20, 60)))) for _ in range(count)]
+    print(f" sorting {count} signed balances of 20-60 digits")
+    slow = bench("sorted(key=cmp_to_key(compare))", lambda: sorted(values, key=functools.cmp_to_key(compare)), 1, 3)
+    bench("sort_numbers", lambda: sort_numbers(values), 1, 3)
+    fast = bench("sorted(key=to_sort_key)", lambda: sorted(values, key=to_sort_key), 1, 3)
+    print(f"  {'':<44} {slow / fast:12.2f}x")
+    keys = sorted(map(to_sort_key, values))
+    probe = to_sort_key(string_to_number("1e40"))
+    bench("bisect for the count above 1e40", lambda: count - bisect.bisect_right(keys, probe), 20000)
+
+def bench_leaderboard():
+    print("\n== Leaderboard: incremental index vs re-sorting for the top 100 ==")
+    rng = random.Random(25)
+    for count in (100000, 1000000):
+        scores = [(i, string_to_number(str(rng.randint(1, 10 ** rng.randint(20, 60))))) for i in range(count)]
+        print(f" {count} players")
+        bench("bulk load", lambda: Leaderboard(scores), 1, 3)
+        board = Leaderboard(scores)
+        values = [score for _, score in scores]
+        # A fresh batch per timed run: repeating a batch would only set scores already held
+        batches = iter([[(rng.randrange(count), string_to_number(str(rng.randint(1, 10 ** rng.randint(20, 60)))))
+                         for _ in range(1000)] for _ in range(REPEAT)])
+        resort = bench("re-sort + top 100 (sort_numbers)", lambda: sort_numbers(values, reverse=True)[:100], 1, 3)
+        step = bench("update (x1000)", lambda: [board.update(player, score) for player, score in next(batches)], 1) / 1000
+        print(f"  {'per update':<44} {step * 1e6:12.2f} µs/op   {resort / step:10.0f}x")
+        bench("top(100)", lambda: board.top(100), 1000)
+        bench("rank(player)", lambda: board.rank(count // 2), 20000)
+
+SECTIONS = {
+    'representation': bench_representation,
+    'limbs': bench_limbs,
+    'karatsuba': bench_karatsuba,
+    'gcd': bench_gcd,
+    'divisor': bench_divisor,
+    'scalar': bench_scalar,
+    'accumulator': bench_accumulator,
+    'batch': bench_batch,
+    'pow_mod': bench_pow_mod,
+    'dot': bench_dot,
+    'offline': bench_offline,
+    'buy_max': bench_buy_max,
+    'sparse': bench_sparse,
+    'approx': bench_approx,
+    'backend': bench_backend,
+    'array': bench_array,
+    'sort': bench_sort,
+    'sort_key': bench_sort_key,
+    'leaderboard': bench_leaderboard,
+}
+
+if __name__ == '__main__':
+    for name in sys.argv[1:] or list(SECTIONS):
+        SECTIONS[name]()
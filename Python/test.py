@@ -1,3 +1,12 @@
+import bisect
+import functools
+import math
+from fractions import Fraction
+import random
+
+import ArrayModule
+import BNHaNa
+from LeaderboardModule import Leaderboard
 from BNHaNa import (
     string_to_number,
     to_decimal_string,
@@ -10,6 +19,12 @@ from BNHaNa import (
     get_scientific,
     notation_to_string,
     encode_number,
+    format_number,
+    sort_numbers,
+    normalize_number,
+    argsort_numbers,
+    to_sort_key,
+    from_sort_key,
     decode_number,
     is_greater,
     is_lesser,
@@ -18,9 +33,33 @@ from BNHaNa import (
     power,
     modulo,
     sqrt,
+    isqrt_rem,
+    iroot,
     factorial,
+    binomial,
     gcd,
+    xgcd,
     lcm,
+    divmod_,
+    compare,
+    batch_add,
+    batch_multiply,
+    product_tree,
+    dot,
+    fma,
+    offline_progress,
+    buy_max,
+    ApproxNum,
+    to_approx,
+    from_approx,
+    Divisor,
+    ModContext,
+    pow_mod,
+    add_small,
+    mul_small,
+    divmod_small,
+    Accumulator,
+    BigNum,
     POS_INF,
     NEG_INF
 )
@@ -249,6 +288,629 @@ def run_extended_tests():
     print(f"\nExtended Tests: {passed} Passed, {failed} Failed")
     return failed == 0
 
+def run_bignum_tests():
+    print("\n===== Starting BigNum Tests =====\n")
+    passed = 0
+    failed = 0
+
+    def check(name, condition):
+        nonlocal passed, failed
+        if condition:
+            passed += 1
+            print(f"✅ PASS: {name}")
+        else:
+            failed += 1
+            print(f"❌ FAIL: {name}")
+
+    def check_str(name, num, expected):
+        nonlocal passed, failed
+        actual = to_decimal_string(num)
+        if actual == expected:
+            passed += 1
+            print(f"✅ PASS: {name}")
+        else:
+            failed += 1
+            print(f"❌ FAIL: {name} (Exp: {expected}, Got: {actual})")
+
+    a = string_to_number("123456789012")
+    b = string_to_number("-987654")
+    check("Results are BigNum instances", isinstance(add(a, b), BigNum))
+
+    # --- Operator overloads ---
+    check_str("Operator +", a + b, "123455801358")
+    check_str("Operator -", a - b, "123457776666")
+    check_str("Operator *", a * b, "-121932591494857848")
+    check_str("Operator // (floor)", a // b, "-125001")
+    check_str("Operator %", a % b, "-948642")
+    check_str("Operator **", string_to_number("12") ** string_to_number("5"), "248832")
+    check_str("Operator with int", a + 1, "123456789013")
+    check_str("Reflected operator with int", 1000 - a, "-123456788012")
+    check_str("Unary minus", -b, "987654")
+    check("Operator <", b < a)
+    check("Operator == with int", string_to_number("1000") == 1000)
+    check("Operator != ", a != b)
+    check("Infinity ordering", NEG_INF < b < a < POS_INF)
+
+    # --- Hashing ---
+    check("Equal values hash equally", hash(string_to_number("5000")) == hash(add(string_to_number("4999"), string_to_number("1"))))
+    check("Hash matches int", hash(string_to_number("123456789012")) == hash(123456789012))
+    check("Negative zero equals zero", string_to_number("-0") == string_to_number("0"))
+    check("Usable as dict key", {a: "x"}.get(string_to_number("123456789012")) == "x")
+
+    # --- Immutability and legacy access ---
+    check("Legacy dict-style read", a['magnitude'] == 12 and a['sign'] == 1 and a['isInf'] is False)
+    try:
+        a['sign'] = -1
+        check("Item assignment rejected", False)
+    except TypeError:
+        check("Item assignment rejected", True)
+    legacy = {'sign': 1, 'blocks': [456, 123], 'magnitude': 6, 'isInf': False}
+    check_str("Legacy dict accepted by add", add(legacy, string_to_number("1")), "123457")
+    check("Legacy dict accepted by compare", compare(legacy, string_to_number("123456")) == 0)
+    check("Legacy infinity dict", add({'sign': -1, 'blocks': [], 'magnitude': float('inf'), 'isInf': True}, a) is NEG_INF)
+    check_str("Subtraction leaves operands untouched", subtract(b, a), "-123457776666")
+    check_str("Operand after subtraction", b, "-987654")
+
+    check_str("Negative + zero", add(b, string_to_number("0")), "-987654")
+    check_str("Zero - negative", subtract(string_to_number("0"), b), "987654")
+
+    # --- Limb storage (base 10^9) ---
+    check("Legacy base-1000 blocks view", a['blocks'] == [12, 789, 456, 123])
+    check_str("Carry across a limb boundary", add(string_to_number("999999999999999999"), string_to_number("1")), "1000000000000000000")
+    check_str("Borrow across limb boundaries", subtract(string_to_number("1000000000000000000"), string_to_number("1")), "999999999999999999")
+    check_str("Multiply spanning limbs", multiply(string_to_number("999999999999"), string_to_number("999999999999")), "999999999998000000000001")
+    check_str("Divide spanning limbs", divide(string_to_number("999999999998000000000001"), string_to_number("999999999999")), "999999999999")
+    check("Leading digits read across limbs", get_detailed(string_to_number("1234567890123")) == "1.235T")
+    check("Scientific reads across limbs", get_scientific(string_to_number("9876543210")) == "9.876e+9")
+    check("int subclasses convert by value", normalize_number(True) == 1 and normalize_number(True).magnitude == 1)
+
+    print(f"\nBigNum Tests: {passed} Passed, {failed} Failed")
+    return failed == 0
+
+def run_kernel_tests():
+    print("\n===== Starting Kernel Tests =====\n")
+    passed = 0
+    failed = 0
+
+    def check(name, condition):
+        nonlocal passed, failed
+        if condition:
+            passed += 1
+            print(f"✅ PASS: {name}")
+        else:
+            failed += 1
+            print(f"❌ FAIL: {name}")
+
+    def check_str(name, num, expected):
+        nonlocal passed, failed
+        actual = to_decimal_string(num)
+        if actual == expected:
+            passed += 1
+            print(f"✅ PASS: {name}")
+        else:
+            failed += 1
+            print(f"❌ FAIL: {name} (Exp: {expected}, Got: {actual})")
+
+    # Deterministic pseudo-random operands spanning many limbs
+    digits_a = ''.join(str((i * 7919 + 3) % 10) for i in range(1400))
+    digits_b = ''.join(str((i * 104729 + 1) % 10) for i in range(900))
+    big_a = string_to_number("9" + digits_a)
+    big_b = string_to_number("7" + digits_b)
+    expected_product = str(int("9" + digits_a) * int("7" + digits_b))
+    expected_square = str(int("7" + digits_b) ** 2)
+
+    # --- Karatsuba multiplication and squaring ---
+    saved_threshold = BNHaNa.KARATSUBA_THRESHOLD
+    try:
+        for threshold in (10 ** 9, 2, 5, saved_threshold):
+            BNHaNa.KARATSUBA_THRESHOLD = threshold
+            check_str(f"Multiply (threshold {threshold})", multiply(big_a, big_b), expected_product)
+            check_str(f"Square (threshold {threshold})", multiply(big_b, big_b), expected_square)
+    finally:
+        BNHaNa.KARATSUBA_THRESHOLD = saved_threshold
+    check_str("Power uses squaring", power(string_to_number("123456789"), string_to_number("97")), str(123456789 ** 97))
+    check_str("Power with no squaring past the last bit", power(string_to_number("1" + "0" * 1000 + "7"), 2), str((10 ** 1001 + 7) ** 2))
+    check_str("Power of a negative base, odd exponent", power(string_to_number("-7"), string_to_number("3001")), str((-7) ** 3001))
+    check_str("Power just below the limit", power(string_to_number("2"), string_to_number("9975")), str(2 ** 9975))
+    check("Power just above the limit", power(string_to_number("2"), string_to_number("9976")) is POS_INF)
+    check("Power overflow keeps the sign", power(string_to_number("-3"), string_to_number("99999")) is NEG_INF)
+    check_str("Power of one with a huge exponent", power(string_to_number("1"), string_to_number("1e40")), "1")
+    check_str("Power of minus one with a huge odd exponent", power(string_to_number("-1"), string_to_number("1e40") + 1), "-1")
+    check_str("Power of ten as a shift", power(string_to_number("-1000"), string_to_number("1000")), "1" + "0" * 3000)
+    check("Power of ten past the limit", power(string_to_number("1e9"), string_to_number("334")) is POS_INF)
+
+    # --- Long division (Knuth Algorithm D) ---
+    check_str("Divide multi-limb", divide(big_a, big_b), str(int("9" + digits_a) // int("7" + digits_b)))
+    check_str("Modulo multi-limb", modulo(big_a, big_b), str(int("9" + digits_a) % int("7" + digits_b)))
+    check_str("Divide exact product", divide(multiply(big_a, big_b), big_b), "9" + digits_a)
+    check_str("Divide needing add-back step", divide(string_to_number("499999999499999999499999999"), string_to_number("1499999999999999999")), "333333332")
+    check_str("Remainder after add-back step", modulo(string_to_number("499999999499999999499999999"), string_to_number("1499999999999999999")), "1499999999833333331")
+    check_str("Divide negative multi-limb (floor)", divide(string_to_number("-" + "9" + digits_a), big_b), str(-int("9" + digits_a) // int("7" + digits_b)))
+
+    # --- divmod_ ---
+    for x, y in ((100, 7), (-100, 7), (100, -7), (-100, -7), (98, 7), (-98, 7), (0, -7)):
+        q, r = divmod_(string_to_number(str(x)), string_to_number(str(y)))
+        check(f"divmod_({x}, {y}) matches floor semantics", (to_decimal_string(q), to_decimal_string(r)) == tuple(map(str, divmod(x, y))))
+    q, r = divmod(big_a, big_b)
+    check("divmod() operator on BigNums", (to_decimal_string(q), to_decimal_string(r)) == tuple(map(str, divmod(int("9" + digits_a), int("7" + digits_b)))))
+    q, r = divmod_(string_to_number("12345"), POS_INF)
+    check("divmod_ by infinity", to_decimal_string(q) == "0" and to_decimal_string(r) == "12345")
+    try:
+        divmod_(string_to_number("5"), string_to_number("0"))
+        check("divmod_ by zero raises", False)
+    except ValueError:
+        check("divmod_ by zero raises", True)
+    check_str("GCD multi-limb", gcd(multiply(big_a, string_to_number("123456789")), multiply(big_b, string_to_number("987654321"))), str(math.gcd(int("9" + digits_a) * 123456789, int("7" + digits_b) * 987654321)))
+    check_str("LCM", lcm(string_to_number("-12"), string_to_number("18")), "36")
+    coprime_a, coprime_b = int("9" + digits_a), int("7" + digits_b)
+    check_str("GCD of a large coprime pair (Lehmer)", gcd(big_a, big_b), str(math.gcd(coprime_a, coprime_b)))
+    for x, y in ((coprime_a, coprime_b), (-coprime_b, coprime_a * 6), (240, -46), (0, -5), (7, 0), (0, 0)):
+        g, s, t = xgcd(string_to_number(str(x)), string_to_number(str(y)))
+        g, s, t = int(to_decimal_string(g)), int(to_decimal_string(s)), int(to_decimal_string(t))
+        check(f"xgcd({str(x)[:12]}, {str(y)[:12]}) satisfies s a + t b = gcd", g == math.gcd(x, y) and s * x + t * y == g)
+    try:
+        xgcd(POS_INF, string_to_number("5"))
+        check("xgcd with infinity raises", False)
+    except ValueError:
+        check("xgcd with infinity raises", True)
+    check("Encode/decode multi-limb round trip", decode_number(encode_number("9" + digits_a)) == "9" + digits_a)
+
+    # --- Precomputed Divisor (short division, Algorithm D and Barrett paths) ---
+    dividends = [big_a, string_to_number("-" + "9" + digits_a), string_to_number("123456789"), string_to_number("0")]
+    for divisor_str in ("7", "-1000000000", "98765432109876543210", digits_b[:200], "-" + "7" + digits_b):
+        d = Divisor(string_to_number(divisor_str))
+        b_num = string_to_number(divisor_str)
+        check(f"Divisor({divisor_str[:12]}...) matches divide/modulo",
+              all(is_equal(d.div(x), divide(x, b_num)) and is_equal(d.mod(x), modulo(x, b_num)) for x in dividends))
+    check("Divisor by infinity", is_equal(Divisor(POS_INF).div(big_a), string_to_number("0")) and is_equal(Divisor(POS_INF).mod(big_a), big_a))
+    try:
+        Divisor(string_to_number("0"))
+        check("Divisor of zero raises", False)
+    except ValueError:
+        check("Divisor of zero raises", True)
+
+    # --- Modular arithmetic ---
+    modulus = int("7" + digits_b[:250])
+    check_str("pow_mod with a Barrett modulus", pow_mod(big_a, 2 ** 521 - 1, string_to_number(str(modulus))), str(pow(int("9" + digits_a), 2 ** 521 - 1, modulus)))
+    check_str("pow_mod with a one-limb modulus", pow_mod(string_to_number("-12345"), string_to_number("1e30"), 1000000007), str(pow(-12345, 10 ** 30, 1000000007)))
+    check_str("pow_mod with a negative modulus", pow_mod(3, 200, -1000), str(pow(3, 200, -1000)))
+    check_str("pow_mod zero exponent", pow_mod(5, 0, 7), "1")
+    ctx = ModContext(string_to_number(str(modulus)))
+    x, y = int("9" + digits_a), -int("7" + digits_b)
+    check_str("ModContext.mul", ctx.mul(big_a, string_to_number(str(y))), str(x * y % modulus))
+    check_str("ModContext.add", ctx.add(big_a, string_to_number(str(y))), str((x + y) % modulus))
+    check_str("ModContext.pow", ctx.pow(string_to_number(str(y)), 65537), str(pow(y, 65537, modulus)))
+    prime_ctx = ModContext(string_to_number(str(2 ** 521 - 1)))
+    check_str("ModContext.inverse", prime_ctx.inverse(string_to_number(str(y))), str(pow(y, -1, 2 ** 521 - 1)))
+    check_str("pow_mod with a negative exponent", pow_mod(3, -5, -1000), str(pow(3, -5, -1000)))
+    try:
+        pow_mod(6, -1, 9)
+        check("Inverse of a non-unit raises", False)
+    except ValueError:
+        check("Inverse of a non-unit raises", True)
+    try:
+        ModContext(POS_INF)
+        check("ModContext of infinity raises", False)
+    except ValueError:
+        check("ModContext of infinity raises", True)
+
+    # --- Scalar kernels and plain int operands ---
+    check_str("add_small carry chain", add_small(string_to_number("999999999999999999999"), 1), "1000000000000000000000")
+    check_str("add_small crossing zero", add_small(string_to_number("5"), -12), "-7")
+    check_str("add_small negative borrow chain", add_small(string_to_number("-1000000000000000000"), 1), "-999999999999999999")
+    check_str("add_small large int", add_small(string_to_number("1"), 10 ** 30), "1" + "0" * 29 + "1")
+    check_str("mul_small", mul_small(big_b, -987654321), str(int("7" + digits_b) * -987654321))
+    check_str("mul_small by machine word", mul_small(string_to_number("123456789123456789"), 2 ** 63 - 1), str(123456789123456789 * (2 ** 63 - 1)))
+    check("mul_small overflow", mul_small(string_to_number("9" * 3000), 10 ** 5) is POS_INF)
+    for x, y in ((100, 7), (-100, 7), (100, -7), (-100, -7), (-98, 7)):
+        q, r = divmod_small(string_to_number(str(x)), y)
+        check(f"divmod_small({x}, {y})", (to_decimal_string(q), r) == (str(x // y), x % y))
+    q, r = divmod_small(big_a, 10 ** 12)
+    check("divmod_small by a multi-limb int", (to_decimal_string(q), r) == (str(int("9" + digits_a) // 10 ** 12), int("9" + digits_a) % 10 ** 12))
+    check_str("add() with int operand", add(big_b, 3), str(int("7" + digits_b) + 3))
+    check_str("subtract() with int minuend", subtract(3, string_to_number("10")), "-7")
+    check_str("multiply() with int operand", multiply(4, string_to_number("-25")), "-100")
+    check_str("divide() with int divisor (floor)", divide(string_to_number("-7"), 2), "-4")
+    check_str("modulo() with int divisor", modulo(string_to_number("-7"), 2), "1")
+    check("divide() infinity by int", divide(POS_INF, -3) is NEG_INF)
+    check_str("Factorial (25!)", factorial(string_to_number("25")), str(math.factorial(25)))
+    # --- Square and k-th roots ---
+    huge = int("9" + digits_a) * int("7" + digits_b[:600])
+    check_str("Sqrt of a 2000-digit number", sqrt(string_to_number(str(huge))), str(math.isqrt(huge)))
+    check_str("Sqrt just below a perfect square", sqrt(string_to_number(str(10 ** 1400 - 1))), "9" * 700)
+    root, remainder = isqrt_rem(string_to_number(str(huge)))
+    check("isqrt_rem", (to_decimal_string(root), to_decimal_string(remainder)) == (str(math.isqrt(huge)), str(huge - math.isqrt(huge) ** 2)))
+    for k in (3, 7, 100):
+        r = int(to_decimal_string(iroot(string_to_number(str(huge)), k)))
+        check(f"iroot(k={k}) brackets the root", r ** k <= huge < (r + 1) ** k)
+    check_str("iroot of an exact power", iroot(string_to_number(str(123456789 ** 5)), 5), "123456789")
+    check_str("iroot of a negative number (floor)", iroot(-9, 3), "-3")
+    check_str("iroot with a degree beyond the size", iroot(string_to_number("123456"), 1000), "1")
+    try:
+        iroot(-16, 4)
+        check("Even root of a negative number raises", False)
+    except ValueError:
+        check("Even root of a negative number raises", True)
+
+    check_str("Factorial (1143!, the largest that fits)", factorial(1143), str(math.factorial(1143)))
+    check("Factorial (1144!) overflows", factorial(string_to_number("1144")) is POS_INF)
+    check("Factorial of a huge argument", factorial(string_to_number("1e50")) is POS_INF)
+    for n, k in ((10, 3), (60, 30), (1000, 17), (3000, 1500), (10 ** 30, 40), (7, 9), (5, 0)):
+        check_str(f"Binomial C({n}, {k})", binomial(n, string_to_number(str(k))), str(math.comb(n, k)))
+    check("Binomial overflow", binomial(10 ** 6, 1000) is POS_INF)
+    try:
+        binomial(5, -1)
+        check("Binomial of negative k raises", False)
+    except ValueError:
+        check("Binomial of negative k raises", True)
+
+    # --- In-place Accumulator ---
+    acc = Accumulator(string_to_number("999999999999999999"))
+    acc.iadd(1)
+    check_str("Accumulator carry into a new limb", acc.value(), "1000000000000000000")
+    acc.isub(string_to_number("1000000000000000005"))
+    check_str("Accumulator crossing zero", acc.value(), "-5")
+    acc += 5
+    check("Accumulator back to canonical zero", acc.value() is BNHaNa._ZERO)
+    acc = Accumulator()
+    expected = 0
+    for i in range(1, 200):
+        income = (-1) ** i * i ** 7
+        acc.iadd(income if i % 2 else string_to_number(str(income)))
+        expected += income
+        if i % 25 == 0:
+            acc.imul_small(-(i + 1))
+            expected *= -(i + 1)
+    check_str("Accumulator matches a fold of add/mul_small", acc.value(), str(expected))
+    acc = Accumulator(string_to_number("9" * 3003))
+    acc.iadd(1)
+    check("Accumulator saturates to infinity", acc.value() is POS_INF)
+    acc.isub(string_to_number("9" * 3000))
+    check("Accumulator stays infinite", acc.value() is POS_INF)
+    try:
+        acc.iadd(NEG_INF)
+        check("Accumulator ∞ + -∞ raises", False)
+    except ValueError:
+        check("Accumulator ∞ + -∞ raises", True)
+    acc = Accumulator(string_to_number("12"))
+    acc.isub(POS_INF)
+    check("Accumulator minus infinity", acc.value() is NEG_INF)
+
+    # --- Carry-save batch_add ---
+    values = [(-1) ** i * (i * 7919) ** (i % 40) for i in range(500)]
+    check_str("batch_add mixed signs", batch_add([string_to_number(str(v)) for v in values]), str(sum(values)))
+    check_str("batch_add from a generator of ints", batch_add(v for v in values), str(sum(values)))
+    check_str("batch_add empty", batch_add([]), "0")
+    falsy = type("Falsy", (list,), {"__bool__": lambda self: False})
+    check_str("batch_add of a falsy container", batch_add(falsy([1, 2, 3])), "6")
+    single = {'sign': 1, 'blocks': [5], 'magnitude': 1, 'isInf': False}
+    check("batch_add single element as-is", batch_add([single]) is single)
+    check("batch_add infinity short-circuits", batch_add([string_to_number("1"), POS_INF, NEG_INF]) is POS_INF)
+    try:
+        batch_add([POS_INF, NEG_INF])
+        check("batch_add ∞ + -∞ raises", False)
+    except ValueError:
+        check("batch_add ∞ + -∞ raises", True)
+    nines = string_to_number("9" * 3003)
+    check("batch_add overflowing partial sum", batch_add([nines, nines, -nines, -nines]) is POS_INF)
+    check_str("batch_add cancelling near the limit", batch_add([nines, -nines, nines]), "9" * 3003)
+
+    # --- Product-tree batch_multiply ---
+    factors = [(-1) ** i * (i * 7919 + 13) for i in range(300)]
+    expected = math.prod(factors)
+    check_str("batch_multiply", batch_multiply([string_to_number(str(f)) for f in factors]), str(expected))
+    check_str("batch_multiply from a generator of ints", batch_multiply(f for f in factors), str(expected))
+    check_str("batch_multiply empty", batch_multiply([]), "1")
+    check_str("batch_multiply of a falsy container", batch_multiply(falsy([2, 3, 7])), "42")
+    check("batch_multiply single element as-is", batch_multiply([single]) is single)
+    check("batch_multiply overflow short-circuits", batch_multiply([nines, nines, string_to_number("0"), NEG_INF]) is POS_INF)
+    check("batch_multiply exact product at the limit", batch_multiply([10 ** 1501, 10 ** 1501, 10]) is POS_INF)
+    check_str("batch_multiply just below the limit", batch_multiply([10 ** 1501, 10 ** 1501, 9]), "9" + "0" * 3002)
+    check("batch_multiply sign of the first overflowing prefix", batch_multiply([-2] * 9976 + [-1]) is POS_INF)
+    try:
+        batch_multiply([string_to_number("7"), string_to_number("0"), POS_INF])
+        check("batch_multiply 0 * ∞ raises", False)
+    except ValueError:
+        check("batch_multiply 0 * ∞ raises", True)
+    check("batch_multiply infinity with no zero before it", batch_multiply([string_to_number("-7"), POS_INF, string_to_number("0")]) is NEG_INF)
+    check("product_tree with another operation", product_tree([string_to_number(str(i)) for i in range(1, 11)], add) == 55)
+
+    # --- Fused multiply-add and dot ---
+    rates = [(-1) ** i * (i * 7919) ** (i % 30) for i in range(60)]
+    counts = [i * 1000003 + 1 for i in range(60)]
+    balance = -int("9" + digits_a)
+    expected = balance + sum(r * c for r, c in zip(rates, counts))
+    check_str("dot of BigNums with an accumulator", dot([string_to_number(str(r)) for r in rates], counts, string_to_number(str(balance))), str(expected))
+    check_str("dot from generators", dot((r for r in rates), iter(counts)), str(expected - balance))
+    check_str("dot of empty sequences", dot([], []), "0")
+    check_str("fma", fma(big_a, big_b, string_to_number("-1")), str(int("9" + digits_a) * int("7" + digits_b) - 1))
+    check_str("fma with a negative result", fma(string_to_number("-1000000000"), 1, string_to_number("1")), "-999999999")
+    check_str("fma cancelling an overflowing product", fma(10 ** 2000, 10 ** 1500, -(10 ** 3500 - 5)), "5")
+    check("fma overflow keeps the sign", fma(-nines, nines, nines) is NEG_INF)
+    check("dot infinite term", dot([POS_INF, 3], [-2, 4], 5) is NEG_INF)
+    for xs, ys, acc, label in (([POS_INF], [0], None, "0 * ∞"), ([POS_INF, 1], [1, NEG_INF], None, "∞ + -∞"),
+                               ([2], [NEG_INF], POS_INF, "∞ + -∞ with the accumulator"), ([1, 2], [3], None, "different lengths")):
+        try:
+            dot(xs, ys, acc)
+            check(f"dot {label} raises", False)
+        except ValueError:
+            check(f"dot {label} raises", True)
+
+    # --- Closed-form offline progress ---
+    def replay(x, rate, income, ticks):
+        for _ in range(ticks):
+            x = x * rate + income
+        return x
+    for x0, rate, income, ticks in ((12345, 3, 678, 1000), (-(10 ** 40), -7, 10 ** 30, 501), (5, 1, -3, 10 ** 6),
+                                    (99, 0, 4, 9), (7, -1, 2, 1001), (10 ** 20, 2, -(10 ** 20), 50)):
+        check_str(f"offline_progress({x0}, {rate}, {income}, {ticks}) matches replay",
+                  offline_progress(string_to_number(str(x0)), rate, income, ticks), str(replay(x0, rate, income, ticks)))
+    check_str("offline_progress zero ticks", offline_progress(big_a, 2, 1, 0), "9" + digits_a)
+    check_str("offline_progress at the fixed point", offline_progress(-10, 11, 100, 10 ** 50), "-10")
+    check_str("offline_progress with a huge tick count and no growth", offline_progress(1, 1, 7, 10 ** 40), "7" + "0" * 39 + "1")
+    check("offline_progress overflow", offline_progress(1, 2, 1, 10 ** 30) is POS_INF)
+    check("offline_progress overflow with an alternating sign", offline_progress(1, -3, 0, 10 ** 9 + 1) is NEG_INF)
+    check_str("offline_progress just below the limit", offline_progress(1, 10, 0, 3002), "1" + "0" * 3002)
+    check("offline_progress just past the limit", offline_progress(1, 10, 0, 3003) is POS_INF)
+    check("offline_progress from infinity", offline_progress(POS_INF, -2, 5, 11) is NEG_INF)
+    for args, label in (((1, 1, 1, -1), "negative ticks"), ((POS_INF, 0, 1, 5), "0 * ∞"), ((1, -2, POS_INF, 5), "∞ + -∞")):
+        try:
+            offline_progress(*args)
+            check(f"offline_progress {label} raises", False)
+        except ValueError:
+            check(f"offline_progress {label} raises", True)
+
+    # --- Buy-max solver ---
+    def buy_by_steps(balance, base_price, rate, owned):
+        count, total, cost = 0, 0, base_price * rate ** owned
+        while total + cost <= balance:
+            total, cost, count = total + cost, cost * rate, count + 1
+        return count, total
+    for balance, base_price, rate, owned in ((10 ** 50, 15, 2, 0), (10 ** 50, 15, 2, 100), (123456789, 7, 1000, 1),
+                                             (int("9" + digits_a), 10 ** 9, 3, 40), (10 ** 40 - 1, 1, 10, 0), (5, 10, 2, 0)):
+        count, total = buy_max(string_to_number(str(balance)), base_price, rate, owned)
+        check(f"buy_max({str(balance)[:12]}, {base_price}, {rate}, {owned}) matches buying one at a time",
+              (int(to_decimal_string(count)), int(to_decimal_string(total))) == buy_by_steps(balance, base_price, rate, owned))
+    for balance, base_price, rate, owned in ((10 ** 6, 10, 1.07, 0), (10 ** 30, 15, Fraction(23, 20), 5), (10 ** 4, 3, 1.5, 2),
+                                             (10 ** 12, 1, 1.01, 300), (2, 3, 1.15, 0)):
+        count, total = buy_max(string_to_number(str(balance)), base_price, rate, owned)
+        steps, exact_total = buy_by_steps(balance, base_price, Fraction(repr(rate)) if isinstance(rate, float) else rate, owned)
+        check(f"buy_max({str(balance)[:12]}, {base_price}, {rate}, {owned}) with a fractional rate matches buying one at a time",
+              (int(to_decimal_string(count)), int(to_decimal_string(total))) == (steps, math.floor(exact_total)))
+    check("buy_max with a float rate that is an integer", buy_max(10 ** 6, 10, 2.0) == buy_max(10 ** 6, 10, 2))
+    count, total = buy_max(string_to_number("1e3000"), 7, 1)
+    check("buy_max with a constant price", to_decimal_string(count) == str(10 ** 3000 // 7) and to_decimal_string(total) == str(10 ** 3000 // 7 * 7))
+    check("buy_max with a next price far past the balance", buy_max(string_to_number("1e3002"), 1, 2, 10 ** 20) == (0, 0))
+    check("buy_max with no balance", buy_max(string_to_number("-5"), 1, 2) == (0, 0))
+    check("buy_max with an infinite balance", buy_max(POS_INF, 1, 2) == (POS_INF, POS_INF))
+    for args, label in (((10, 0, 2), "zero price"), ((10, 1, 0), "zero rate"), ((10, 1, 2, -1), "negative owned count"),
+                        ((10, 1, 0.5), "rate below 1"), ((10, 1, math.nan), "NaN rate"), ((10, 1, math.inf), "infinite float rate")):
+        try:
+            buy_max(*args)
+            check(f"buy_max {label} raises", False)
+        except ValueError:
+            check(f"buy_max {label} raises", True)
+
+    # --- Sparse round numbers (significand + shift) ---
+    round_a = string_to_number("1.5e2000")
+    check("Round number stores only its significant limbs", round_a.shift == 222 and list(round_a.significand) == [150])
+    check("Full limbs of a round number", len(round_a.limbs) == 223 and round_a.limbs[-1] == 150 and not any(round_a.limbs[:-1]))
+    check_str("Round number round trip", round_a, "15" + "0" * 1999)
+    check("Round number from an int is sparse", string_to_number(str(7 * 10 ** 40)).shift == 4)
+    check_str("Sparse product", multiply(round_a, string_to_number("-4e999")), "-6" + "0" * 2999)
+    check_str("Sparse sum with different shifts", add(round_a, string_to_number("3e1000")), "15" + "0" * 998 + "3" + "0" * 1000)
+    check_str("Sparse plus dense", add(round_a, big_b), str(15 * 10 ** 1999 + int("7" + digits_b)))
+    check_str("Sparse minus itself", subtract(round_a, string_to_number("15" + "0" * 1999)), "0")
+    check("Sparse compare", compare(round_a, string_to_number("15" + "0" * 1998 + "1")) == -1 and round_a == string_to_number("1.50e2000"))
+    check_str("Sparse power", power(string_to_number("2e100"), 7), str((2 * 10 ** 100) ** 7))
+    check("Sparse power past the limit", power(string_to_number("1e1000"), 4) is POS_INF)
+    check_str("Sparse divide", divide(round_a, string_to_number("7e10")), str(15 * 10 ** 1999 // (7 * 10 ** 10)))
+    check("Sparse formatting", get_scientific(round_a) == "1.5e+2000" and round_a.blocks[-1] == 150 and hash(round_a) == hash(15 * 10 ** 1999))
+    check("Sparse value past the limit", string_to_number("1e3003") is POS_INF and multiply(string_to_number("1e1500"), string_to_number("1e1503")) is POS_INF)
+
+    # --- ApproxNum (float mantissa, int exponent) ---
+    def close(approx, mantissa, exponent):
+        return approx.exponent == exponent and abs(approx.mantissa - mantissa) < 1e-12
+    huge = ApproxNum(1.5, 5000)
+    check("ApproxNum normalizes its mantissa", close(ApproxNum(1234.5, 10), 1.2345, 13) and close(ApproxNum(-0.05), -5, -2))
+    check("ApproxNum zero", ApproxNum(0, 99).exponent == 0 and not ApproxNum(0))
+    check("ApproxNum add and sub", close(ApproxNum(1, 5) + ApproxNum(9, 4), 1.9, 5) and close(huge - huge, 0, 0))
+    check("ApproxNum add of a negligible term", (huge + 1) is huge)
+    check("ApproxNum mul and div past the BigNum range", close(huge * huge, 2.25, 10000) and close(huge / ApproxNum(3, 4000), 5, 999))
+    check("ApproxNum integer power keeps the exponent exact", ApproxNum(2).pow(10 ** 6).exponent == 301029 and abs(ApproxNum(2).pow(10 ** 6).mantissa - 9.900656229295898) < 1e-9)
+    check("ApproxNum fractional and negative powers", close(ApproxNum(1, 4) ** 0.5, 1, 2) and close(ApproxNum(-2) ** 3, -8, 0))
+    check("ApproxNum log", abs(huge.log10() - (5000 + math.log10(1.5))) < 1e-9 and abs(ApproxNum(math.e).log() - 1) < 1e-12)
+    check("ApproxNum compare", ApproxNum(5) < ApproxNum(5, 1) and ApproxNum(-5, 3) < ApproxNum(-5, 2) and ApproxNum(1, 2) == 100 and huge > ApproxNum(9, 4999))
+    check("ApproxNum from a BigNum", close(to_approx(big_a), float(("9" + digits_a)[:17]) / 1e16, len(digits_a)))
+    check("ApproxNum from a huge int and a string", close(to_approx(-3 * 10 ** 5000), -3, 5000) and close(to_approx("1.25e123456789"), 1.25, 123456789))
+    big_p = 10 ** 5 + 3
+    for p, exact in ((big_p, Fraction(3, 2) ** big_p), (-big_p, Fraction(2, 3) ** big_p)):
+        result = ApproxNum(1.5).pow(p)
+        scale = math.floor(p * math.log10(1.5))
+        while exact >= Fraction(10) ** (scale + 1):
+            scale += 1
+        while exact < Fraction(10) ** scale:
+            scale -= 1
+        check(f"ApproxNum power {p} within the documented error of the exact value",
+              result.exponent == scale and abs(result.mantissa / float(exact / Fraction(10) ** scale) - 1) < abs(p) * 5e-16)
+    check("ApproxNum equals and orders like the float it came from", all(
+        ApproxNum(f) == f and not ApproxNum(f) < f and ApproxNum(f) >= f and hash(ApproxNum(f)) == hash(f)
+        for f in (3.7, 0.1, 1e-7, -2.5e-300, 4.256e24, 1.7976931348623157e308)))
+    shared = 9.844000000000001e23
+    check("ApproxNum against a float that only rounds to it", ApproxNum(shared) >= shared and ApproxNum(shared) <= shared
+          and ApproxNum(shared) != shared and ApproxNum(shared) == 9.844e23)
+    check_str("ApproxNum back to an exact BigNum", from_approx(ApproxNum(1.5, 20)), "150000000000000000000")
+    check_str("ApproxNum below one truncates", from_approx(ApproxNum(-2.5, -1)), "0")
+    check("ApproxNum past the limit becomes infinity", from_approx(huge) is POS_INF and to_approx(NEG_INF).mantissa == -math.inf)
+    check("ApproxNum short notation", get_short(ApproxNum(1.234, 6)) == "1.2M" and get_short(ApproxNum(999.5)) == "999.5")
+    check("ApproxNum past the last suffix uses scientific notation", get_short(huge) == "1.5e+5000")
+    check("ApproxNum formats like the BigNum it approximates", all(
+        fn(to_approx(string_to_number(v))) == fn(string_to_number(v))
+        for v in ("999", "1000", "99999", "-999999", "999500", "999950", "999999999999", "123456789", "1" + "0" * 45)
+        for fn in (get_short, get_detailed, get_scientific)))
+    check("ApproxNum equality with other types", ApproxNum(1) != None and ApproxNum(1) in [None, 1] and ApproxNum(5) == 5.0
+          and ApproxNum(1.5, 20) == 15 * 10 ** 19 and to_approx(10 ** 20 + 1) != 10 ** 20 + 1 and ApproxNum(7) == string_to_number("7"))
+    check("ApproxNum hashes like equal numbers", {5: "x"}.get(ApproxNum(5)) == "x" and hash(ApproxNum(2.5)) == hash(2.5)
+          and hash(huge) == hash(15 * 10 ** 4999) and hash(ApproxNum(-7, 2)) == hash(string_to_number("-700")))
+    check("ApproxNum power by a huge int", 30102999 * 10 ** 392 < ApproxNum(2).pow(10 ** 400).exponent < 30103 * 10 ** 395
+          and ApproxNum(2).pow(-10 ** 400).exponent < -30102999 * 10 ** 392)
+    check("ApproxNum integral float exponent", str(ApproxNum(1, 2.0)) == "1e+2" and type(ApproxNum(1, 2.0).exponent) is int)
+    for fn, label in ((lambda: ApproxNum(math.inf) + ApproxNum(-math.inf), "∞ + -∞"), (lambda: ApproxNum(1) / 0, "division by zero"),
+                      (lambda: ApproxNum(-2) ** 0.5, "fractional power of a negative"), (lambda: ApproxNum(-1).log10(), "log of a negative"),
+                      (lambda: ApproxNum(1, 2.5), "fractional exponent")):
+        try:
+            fn()
+            check(f"ApproxNum {label} raises", False)
+        except ValueError:
+            check(f"ApproxNum {label} raises", True)
+    try:
+        ApproxNum(1) < None
+        check("ApproxNum ordering against None raises TypeError", False)
+    except TypeError:
+        check("ApproxNum ordering against None raises TypeError", True)
+
+    # --- Native int backend against the limb kernels ---
+    rng = random.Random(21)
+    operands = [0, 1, -1, 7, -10 ** 9, 10 ** 3002, -(10 ** 3003 - 1), "1.5e2000", "-3e27"]
+    operands += [rng.choice((1, -1)) * rng.randint(1, 10 ** rng.randint(1, 3003)) for _ in range(24)]
+    operands = [string_to_number(x) if isinstance(x, str) else BNHaNa._from_int(x) for x in operands]
+    operands += [POS_INF, NEG_INF]
+    small = [string_to_number(str(n)) for n in (0, 1, 2, 3, 5, 17, 100, 170, 449, 450, 451)]
+
+    def outcome(fn, *args):
+        # The digits and the suffix notation, or the error; encode_number works from the digits
+        try:
+            result = fn(*args)
+        except ValueError as e:
+            return "ValueError: " + str(e)
+        return to_decimal_string(result), format_number(result, 2)
+
+    cases = [(op, x, y) for op in (multiply, divide, gcd) for x in operands for y in rng.sample(operands, 6)]
+    cases += [(power, x, e) for x in operands for e in small] + [(power, x, x) for x in small]
+    cases += [(sqrt, x) for x in operands] + [(factorial, x) for x in small + operands[:6]]
+    saved_backend = BNHaNa.BACKEND
+    try:
+        mismatches = []
+        for fn, *args in cases:
+            BNHaNa.BACKEND = 'limbs'
+            expected = outcome(fn, *args)
+            BNHaNa.BACKEND = 'int'
+            if outcome(fn, *args) != expected:
+                mismatches.append((fn.__name__, *map(to_decimal_string, args)))
+    finally:
+        BNHaNa.BACKEND = saved_backend
+    check(f"Int backend matches the limb kernels ({len(cases)} cases)", not mismatches)
+
+    # --- Sorting ---
+    ranked = [big_a, 5, -5, POS_INF, 0, -big_b, string_to_number("1.5e2000"), NEG_INF, 5,
+              string_to_number("1500000000000000000001e1979"), -(10 ** 18), -(10 ** 18 + 1), 999999999, 10 ** 9, big_a]
+    by_compare = sorted(map(normalize_number, ranked), key=functools.cmp_to_key(compare))
+    check("sort_numbers matches compare", [to_decimal_string(n) for n in sort_numbers(ranked)] == [to_decimal_string(n) for n in by_compare])
+    check("sort_numbers reverse", [to_decimal_string(n) for n in sort_numbers(ranked, reverse=True)] == [to_decimal_string(n) for n in by_compare[::-1]])
+    check("argsort_numbers keeps ties in input order", argsort_numbers(ranked)[:4] == [7, 5, 11, 10] and argsort_numbers(ranked)[6:9] == [1, 8, 12])
+    check("argsort_numbers reverse keeps ties in input order", argsort_numbers(ranked, reverse=True)[:5] == [3, 9, 6, 0, 14])
+
+    # --- Order-preserving sort keys ---
+    keyed = ranked + [-5 * 10 ** 9, -(5 * 10 ** 9 + 3), -(5 * 10 ** 18 + 3), 5 * 10 ** 18, 5 * 10 ** 18 + 3, -big_a]
+    check("to_sort_key orders like compare", all((to_sort_key(x) > to_sort_key(y)) - (to_sort_key(x) < to_sort_key(y)) == compare(x, y)
+                                                  for x in keyed for y in keyed))
+    check("sorted by to_sort_key", [to_decimal_string(n) for n in sorted(map(normalize_number, ranked), key=to_sort_key)]
+          == [to_decimal_string(n) for n in by_compare])
+    check("from_sort_key round trip", all(to_decimal_string(from_sort_key(to_sort_key(x))) == to_decimal_string(normalize_number(x)) for x in keyed))
+    check("Sort key of a round number leaves out its zero limbs", len(to_sort_key(string_to_number("1.5e2000"))) == 1 + 2 + 4)
+    check("Sort keys of the special values", (to_sort_key(NEG_INF), to_sort_key(0), to_sort_key(POS_INF)) == (b'\x00', b'\x02', b'\x04'))
+    board = sorted(to_sort_key(x) for x in keyed)
+    check("bisect over sort keys", len(board) - bisect.bisect_right(board, to_sort_key(string_to_number("1e300"))) == 5)
+    for bad in (b"", b"\x05", b"\x03\x00\x01", b"\x01\xff\xf4\xfe\xff\xff\xfa", b"\x02\x00"):
+        try:
+            from_sort_key(bad)
+            check(f"from_sort_key rejects {bad!r}", False)
+        except ValueError:
+            check(f"from_sort_key rejects {bad!r}", True)
+
+    # --- Leaderboard ---
+    board = Leaderboard([("ann", big_a), ("bob", 5), ("cy", NEG_INF), ("dee", 5), ("eve", string_to_number("1.5e2000")), ("bob", 7)])
+    check("Leaderboard bulk load keeps the later duplicate", len(board) == 5 and board.score("bob") == 7)
+    check("Leaderboard top-k", [player for player, _ in board.top(3)] == ["eve", "ann", "bob"] and len(board.top(10)) == 5)
+    check("Leaderboard rank", [board.rank(p) for p in ("eve", "ann", "bob", "dee", "cy")] == [1, 2, 3, 4, 5])
+    board.update("dee", POS_INF)
+    board.update("bob", 5)
+    board.insert("fay", 5)
+    check("Leaderboard update moves a player", board.rank("dee") == 1 and board.rank("cy") == 6)
+    check("Leaderboard ties rank by who got there first", [board.rank(p) for p in ("bob", "fay")] == [4, 5])
+    board.update("bob", 5)
+    check("Leaderboard update to the same score keeps the place", board.rank("bob") == 4)
+    board.remove("eve")
+    check("Leaderboard remove", "eve" not in board and [p for p, _ in board] == ["dee", "ann", "bob", "fay", "cy"])
+    for label, fn, error in (("insert of a present player", lambda: board.insert("ann", 1), ValueError),
+                             ("remove of a missing player", lambda: board.remove("eve"), KeyError)):
+        try:
+            fn()
+            check(f"Leaderboard {label} raises", False)
+        except error:
+            check(f"Leaderboard {label} raises", True)
+    # Small buckets exercise splits and merges against a plain sort over many updates
+    rng = random.Random(25)
+    board, scores = Leaderboard(load=4), {}
+    for step in range(600):
+        player = rng.randrange(40)
+        if player in scores and rng.random() < 0.3:
+            board.remove(player)
+            del scores[player]
+        else:
+            score = rng.choice((rng.randint(-3, 3), rng.randint(-10 ** 30, 10 ** 30), POS_INF, NEG_INF))
+            board.update(player, score)
+            scores[player] = normalize_number(score)
+    expected = sorted(scores.values(), key=to_sort_key, reverse=True)
+    check("Leaderboard after random updates", [to_decimal_string(s) for _, s in board] == [to_decimal_string(s) for s in expected]
+          and all(board.rank(player) == rank for rank, (player, _) in enumerate(board, 1)))
+
+    # --- BigNumArray (needs NumPy) ---
+    if ArrayModule.np is None:
+        print("Skipping BigNumArray tests: NumPy is not installed")
+    else:
+        BigNumArray = ArrayModule.BigNumArray
+        rows = [0, 5, -5, 999999999, -(10 ** 18), big_a, -big_b, POS_INF, NEG_INF,
+                string_to_number("1.5e2000"), string_to_number("-9" * 3003), 10 ** 9 - 1]
+        others = [0, -7, 5, 1, 10 ** 18, -big_a, big_b, 1, -(10 ** 50),
+                  string_to_number("-1.5e2000"), -1, 1]
+        xs, ys = BigNumArray(rows), BigNumArray(others)
+        check("BigNumArray round trip", [to_decimal_string(n) for n in xs] == [to_decimal_string(n) for n in rows])
+        check("BigNumArray magnitudes", xs.magnitude.tolist()[:5] == [1, 1, 1, 9, 19] and bool(xs.isInf[7]))
+        for label, vectorized, scalar in (("add", xs.add(ys), add), ("subtract", xs.subtract(ys), subtract),
+                                          ("add a scalar", xs + big_b, lambda x, y: add(x, big_b)),
+                                          ("scalar multiply", xs * -(10 ** 20 + 3), lambda x, y: multiply(x, -(10 ** 20 + 3)))):
+            expected = [to_decimal_string(scalar(x, y)) for x, y in zip(rows, others)]
+            check(f"BigNumArray {label}", [to_decimal_string(n) for n in vectorized] == expected)
+        check("BigNumArray carry through every limb", to_decimal_string(BigNumArray([10 ** 45 - 1]).add(1)[0]) == str(10 ** 45))
+        check("BigNumArray overflow to infinity", BigNumArray([string_to_number("9" * 3003)]).add(1)[0] is POS_INF)
+        check("BigNumArray compare", xs.compare(ys).tolist() == [compare(x, y) for x, y in zip(rows, others)])
+        check("BigNumArray compare with a scalar", xs.compare(5).tolist() == [compare(x, 5) for x in rows])
+        check("BigNumArray argsort", xs.argsort().tolist() == argsort_numbers(rows) and
+              BigNumArray(ranked).argsort(reverse=True).tolist() == argsort_numbers(ranked, reverse=True))
+        check("BigNumArray sort", [to_decimal_string(n) for n in BigNumArray(ranked).sort()] == [to_decimal_string(n) for n in by_compare])
+        check("BigNumArray scalar minus array", [to_decimal_string(n) for n in 5 - xs[:7]] == [to_decimal_string(subtract(5, x)) for x in rows[:7]])
+        check("BigNumArray slices and index arrays", [to_decimal_string(n) for n in xs[1:4]] == ["5", "-5", "999999999"]
+              and xs[[7, 0]].to_list() == [POS_INF, 0] and len(xs[xs.sign < 0]) == 4 and len(xs[3:3]) == 0)
+        check("BigNumArray get_short", xs.get_short() == [get_short(x) for x in rows])
+        check("BigNumArray get_scientific", xs.get_scientific() == [get_scientific(x) for x in rows])
+        for label, fn, message in (("∞ + -∞", lambda: xs.add(BigNumArray([NEG_INF] * len(rows))), "Undefined: ∞ + -∞"),
+                                   ("0 * ∞", lambda: xs.multiply(POS_INF), "Undefined: 0 * ∞"),
+                                   ("length mismatch", lambda: xs.add(BigNumArray([1])), "BigNumArray operands have different lengths")):
+            try:
+                fn()
+                check(f"BigNumArray {label} raises", False)
+            except ValueError as e:
+                check(f"BigNumArray {label} raises", str(e) == message)
+        try:
+            xs[1.5]
+            check("BigNumArray float index raises TypeError", False)
+        except TypeError:
+            check("BigNumArray float index raises TypeError", True)
+
+    print(f"\nKernel Tests: {passed} Passed, {failed} Failed")
+    return failed == 0
+
 # Run the tests
 success = run_tests()
 if success:
@@ -257,5 +919,11 @@ if success:
     ext_success = run_extended_tests()
     if ext_success:
         print("All extended tests passed successfully!")
+        for suite in (run_bignum_tests, run_kernel_tests):
+            if not suite():
+                print("Some tests failed. Please review the output.")
+                break
+        else:
+            print("All additional tests passed successfully!")
 else:
     print("Some tests failed. Please review the output.")
\ No newline at end of file